@@ -1,6 +1,7 @@
 from flask import Flask, render_template, request
 from controllers.contato_controller import contato_bp
 from controllers.categoria_controller import categoria_bp
+from controllers.busca_controller import busca_bp
 from logger_singleton import Logger
 import os
 
@@ -10,6 +11,7 @@ app.secret_key = os.environ.get('SECRET_KEY', os.urandom(24))
 # Registra os blueprints
 app.register_blueprint(contato_bp)
 app.register_blueprint(categoria_bp)
+app.register_blueprint(busca_bp)
 
 # Configura o logger
 logger = Logger.get_instance()
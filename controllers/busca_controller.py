@@ -0,0 +1,29 @@
+from flask import Blueprint, request, jsonify
+from services.busca_service import BuscaService
+from logger_singleton import Logger
+
+busca_bp = Blueprint('busca', __name__, url_prefix='/api')
+busca_service = BuscaService()
+logger = Logger.get_instance()
+
+# Quantidade padrão e máxima de resultados por busca
+TAMANHO_RESULTADOS = 20
+TAMANHO_MAXIMO_RESULTADOS = 100
+
+@busca_bp.route('/search', methods=['GET'])
+def api_pesquisar():
+    """API - Busca textual em contatos e categorias, ordenada por relevância"""
+    consulta = request.args.get('q', '')
+    if not consulta.strip():
+        return jsonify({'error': 'Parâmetro q é obrigatório'}), 400
+    
+    try:
+        limite = min(max(int(request.args.get('limit', TAMANHO_RESULTADOS)), 1), TAMANHO_MAXIMO_RESULTADOS)
+    except ValueError:
+        return jsonify({'error': 'Parâmetro limit inválido'}), 400
+    
+    resultados = busca_service.pesquisar(consulta, limite)
+    return jsonify([
+        dict(contato.to_dict(), pontuacao=round(pontuacao, 4))
+        for contato, pontuacao in resultados
+    ])
\ No newline at end of file
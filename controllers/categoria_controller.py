@@ -10,7 +10,7 @@ logger = Logger.get_instance()
 @categoria_bp.route('/api', methods=['GET'])
 def api_listar_categorias():
     """API - Lista todas as categorias"""
-    categorias = categoria_service.listar_todas()
+    categorias = categoria_service.listar_visoes()
     return jsonify([cat.to_dict() for cat in categorias])
 
 @categoria_bp.route('/api/<int:id>', methods=['GET'])
@@ -53,12 +53,66 @@ def api_excluir_categoria(id):
         return jsonify({'message': 'Categoria excluída com sucesso'})
     return jsonify({'error': 'Falha ao excluir categoria'}), 404
 
+def _validar_operacao_lote(item):
+    """
+    Valida um item do lote de categorias.
+    
+    Returns:
+        tuple: (operação normalizada, None) ou (None, mensagem de erro)
+    """
+    if not isinstance(item, dict) or item.get('op') not in ('criar', 'atualizar', 'excluir'):
+        return None, 'Operação inválida'
+    
+    op = item['op']
+    if op != 'criar' and (not isinstance(item.get('id'), int) or isinstance(item.get('id'), bool)):
+        return None, 'ID da categoria é obrigatório'
+    if op == 'excluir':
+        return {'op': op, 'id': item['id']}, None
+    
+    dados = item.get('dados')
+    if not isinstance(dados, dict) or not isinstance(dados.get('nome'), str) or not dados['nome'].strip():
+        return None, 'Nome da categoria é obrigatório'
+    
+    return {'op': op, 'id': item.get('id'), 'dados': dados}, None
+
+@categoria_bp.route('/api/batch', methods=['POST'])
+def api_lote_categorias():
+    """API - Aplica um lote de criações, atualizações e exclusões com uma única gravação"""
+    dados = request.json
+    operacoes = dados.get('operacoes') if isinstance(dados, dict) else dados
+    if not isinstance(operacoes, list) or not operacoes:
+        return jsonify({'error': 'Lista de operações é obrigatória'}), 400
+    
+    # Todos os itens são validados antes de aplicar qualquer operação; o
+    # primeiro inválido rejeita o lote inteiro
+    validas = []
+    for indice, item in enumerate(operacoes):
+        operacao, erro = _validar_operacao_lote(item)
+        if erro:
+            return jsonify({'error': erro, 'indice': indice}), 400
+        validas.append(operacao)
+    
+    resultados = []
+    for operacao, resultado in zip(validas, categoria_service.executar_lote(validas)):
+        if operacao['op'] == 'criar':
+            if resultado:
+                resultados.append({'op': 'criar', 'status': 201, 'categoria': resultado.to_dict()})
+            else:
+                resultados.append({'op': 'criar', 'status': 500, 'error': 'Falha ao criar categoria'})
+        elif resultado:
+            resultados.append({'op': operacao['op'], 'id': operacao['id'], 'status': 200})
+        else:
+            resultados.append({'op': operacao['op'], 'id': operacao['id'], 'status': 404,
+                               'error': 'Categoria não encontrada'})
+    
+    return jsonify({'resultados': resultados})
+
 # Rotas para interface web
 @categoria_bp.route('/', methods=['GET'])
 def listar_categorias():
     """Página web - Lista todas as categorias"""
     logger.info("Acessando página de listagem de categorias")
-    categorias = categoria_service.listar_todas()
+    categorias = categoria_service.listar_visoes()
     return render_template('categorias/listar.html', categorias=categorias)
 
 @categoria_bp.route('/nova', methods=['GET', 'POST'])
@@ -1,4 +1,5 @@
-from flask import Blueprint, request, jsonify, render_template, redirect, url_for, flash
+import json
+from flask import Blueprint, Response, request, jsonify, render_template, redirect, url_for, flash, stream_with_context
 from services.contato_service import ContatoService
 from services.categoria_service import CategoriaService
 from logger_singleton import Logger
@@ -8,24 +9,142 @@ contato_service = ContatoService()
 categoria_service = CategoriaService()
 logger = Logger.get_instance()
 
+# Tamanhos padrão e máximo das páginas de listagem e quantidade de sugestões
+TAMANHO_PAGINA = 50
+TAMANHO_MAXIMO_PAGINA = 500
+TAMANHO_AUTOCOMPLETAR = 10
+
+def _ler_paginacao(tamanho_padrao=None):
+    """
+    Lê os parâmetros de paginação por cursor (limit e after_id) da requisição.
+    
+    Args:
+        tamanho_padrao (int, optional): Limite usado quando nenhum é informado
+        
+    Returns:
+        tuple: (limite, after_id) ou (None, None) sem paginação
+        
+    Raises:
+        ValueError: Se algum parâmetro for inválido
+    """
+    limite = request.args.get('limit')
+    apos_id = request.args.get('after_id')
+    
+    apos_id = int(apos_id) if apos_id else None
+    if limite:
+        limite = int(limite)
+        if limite < 1:
+            raise ValueError(limite)
+        limite = min(limite, TAMANHO_MAXIMO_PAGINA)
+    elif apos_id is not None or tamanho_padrao:
+        limite = tamanho_padrao or TAMANHO_PAGINA
+    else:
+        return None, None
+    return limite, apos_id
+
+def _ler_filtros():
+    """
+    Lê os filtros de busca (nome, categoria_id, telefone e email) da
+    requisição. Todos os filtros informados são combinados.
+    
+    Returns:
+        dict: Filtros informados, com categoria_id convertido para int
+        
+    Raises:
+        ValueError: Se o ID de categoria for inválido
+    """
+    filtros = {
+        campo: request.args.get(campo)
+        for campo in ('nome', 'categoria_id', 'telefone', 'email')
+        if request.args.get(campo)
+    }
+    if 'categoria_id' in filtros:
+        filtros['categoria_id'] = int(filtros['categoria_id'])
+    return filtros
+
+def _email_rejeitado(email, id=None):
+    """
+    Indica se uma gravação falhou por repetir o email de outro contato.
+    
+    Returns:
+        bool: True se a política rejeita emails duplicados e o email está em uso
+    """
+    return contato_service.politica_email == 'rejeitar' and contato_service.email_duplicado(email, id)
+
 # Rotas para API REST
 @contato_bp.route('/api', methods=['GET'])
 def api_listar_contatos():
-    """API - Lista todos os contatos"""
-    # Verifica se há filtro por nome ou categoria
-    nome = request.args.get('nome')
-    categoria_id = request.args.get('categoria_id')
-    
-    if nome:
-        contatos = contato_service.buscar_por_nome(nome)
-    elif categoria_id:
-        try:
-            contatos = contato_service.buscar_por_categoria(int(categoria_id))
-        except ValueError:
-            return jsonify({'error': 'ID de categoria inválido'}), 400
-    else:
-        contatos = contato_service.listar_todos()
+    """API - Lista os contatos, com filtros combináveis e paginação por cursor"""
+    try:
+        filtros = _ler_filtros()
+    except ValueError:
+        return jsonify({'error': 'ID de categoria inválido'}), 400
+    
+    try:
+        limite, apos_id = _ler_paginacao()
+    except ValueError:
+        return jsonify({'error': 'Parâmetros de paginação inválidos'}), 400
+    
+    if filtros.get('nome') and request.args.get('fuzzy') in ('1', 'true'):
+        # Resultados aproximados são ordenados por semelhança, não por ID;
+        # os demais filtros restringem os candidatos antes da seleção
+        contatos = contato_service.buscar_aproximado(filtros.pop('nome'), limite or TAMANHO_PAGINA, **filtros)
+        return jsonify([contato.to_dict() for contato in contatos])
+    
+    if limite is None:
+        # Sem filtros, os registros são serializados direto das visões, sem
+        # criar um Contato por linha
+        contatos = contato_service.filtrar(**filtros) if filtros else contato_service.listar_visoes()
+        return jsonify([contato.to_dict() for contato in contatos])
+    
+    contatos, proximo = contato_service.filtrar_pagina(limite, apos_id, **filtros)
+    response = jsonify([contato.to_dict() for contato in contatos])
+    if proximo is not None:
+        link = url_for('contatos.api_listar_contatos', limit=limite, after_id=proximo, **filtros)
+        response.headers['Link'] = f'<{link}>; rel="next"'
+    return response
+
+@contato_bp.route('/api/contagem', methods=['GET'])
+def api_contar_contatos():
+    """API - Conta os contatos por categoria, com filtros opcionais (nome, telefone e email)"""
+    contagens = contato_service.contar_por_categoria(
+        nome=request.args.get('nome'),
+        telefone=request.args.get('telefone'),
+        email=request.args.get('email')
+    )
+    return jsonify({
+        'total': sum(contagens.values()),
+        'por_categoria': [
+            {'categoria_id': categoria_id, 'total': total}
+            for categoria_id, total in contagens.items()
+        ]
+    })
+
+@contato_bp.route('/api/export', methods=['GET'])
+def api_exportar_contatos():
+    """API - Exporta os contatos em JSON delimitado por linhas, com os mesmos filtros da listagem"""
+    try:
+        filtros = _ler_filtros()
+    except ValueError:
+        return jsonify({'error': 'ID de categoria inválido'}), 400
     
+    # Cada contato é serializado conforme é lido, sem montar a resposta inteira
+    linhas = (
+        json.dumps(contato, ensure_ascii=False) + '\n'
+        for contato in contato_service.exportar(**filtros)
+    )
+    return Response(stream_with_context(linhas), mimetype='application/x-ndjson')
+
+@contato_bp.route('/api/autocomplete', methods=['GET'])
+def api_autocompletar_contatos():
+    """API - Sugere contatos cujo nome começa com o prefixo informado"""
+    prefixo = request.args.get('prefix', '')
+    try:
+        limite = min(max(int(request.args.get('limit', TAMANHO_AUTOCOMPLETAR)), 1), TAMANHO_MAXIMO_PAGINA)
+    except ValueError:
+        return jsonify({'error': 'Parâmetro limit inválido'}), 400
+    
+    contatos = contato_service.autocompletar(prefixo, limite)
     return jsonify([contato.to_dict() for contato in contatos])
 
 @contato_bp.route('/api/<int:id>', methods=['GET'])
@@ -59,6 +178,8 @@ def api_criar_contato():
     
     if contato:
         return jsonify(contato.to_dict()), 201
+    if _email_rejeitado(dados.get('email')):
+        return jsonify({'error': 'Email já cadastrado'}), 409
     return jsonify({'error': 'Falha ao criar contato'}), 500
 
 @contato_bp.route('/api/<int:id>', methods=['PUT'])
@@ -85,6 +206,8 @@ def api_atualizar_contato(id):
     
     if sucesso:
         return jsonify({'message': 'Contato atualizado com sucesso'})
+    if _email_rejeitado(dados.get('email'), id):
+        return jsonify({'error': 'Email já cadastrado'}), 409
     return jsonify({'error': 'Falha ao atualizar contato'}), 404
 
 @contato_bp.route('/api/<int:id>', methods=['DELETE'])
@@ -95,39 +218,114 @@ def api_excluir_contato(id):
         return jsonify({'message': 'Contato excluído com sucesso'})
     return jsonify({'error': 'Falha ao excluir contato'}), 404
 
+def _validar_operacao_lote(item):
+    """
+    Valida um item do lote de contatos e normaliza o categoria_id.
+    
+    Returns:
+        tuple: (operação normalizada, None) ou (None, mensagem de erro)
+    """
+    if not isinstance(item, dict) or item.get('op') not in ('criar', 'atualizar', 'excluir'):
+        return None, 'Operação inválida'
+    
+    op = item['op']
+    if op != 'criar' and (not isinstance(item.get('id'), int) or isinstance(item.get('id'), bool)):
+        return None, 'ID do contato é obrigatório'
+    if op == 'excluir':
+        return {'op': op, 'id': item['id']}, None
+    
+    dados = item.get('dados')
+    if not isinstance(dados, dict) or not dados.get('nome') or not dados.get('telefone'):
+        return None, 'Nome e telefone são obrigatórios'
+    
+    categoria_id = dados.get('categoria_id')
+    if categoria_id is not None:
+        try:
+            categoria_id = int(categoria_id)
+        except (TypeError, ValueError):
+            return None, 'ID de categoria inválido'
+    
+    return {'op': op, 'id': item.get('id'), 'dados': dict(dados, categoria_id=categoria_id)}, None
+
+@contato_bp.route('/api/batch', methods=['POST'])
+def api_lote_contatos():
+    """API - Aplica um lote de criações, atualizações e exclusões com uma única gravação"""
+    dados = request.json
+    operacoes = dados.get('operacoes') if isinstance(dados, dict) else dados
+    if not isinstance(operacoes, list) or not operacoes:
+        return jsonify({'error': 'Lista de operações é obrigatória'}), 400
+    
+    # Todos os itens são validados antes de aplicar qualquer operação; o
+    # primeiro inválido rejeita o lote inteiro
+    validas = []
+    for indice, item in enumerate(operacoes):
+        operacao, erro = _validar_operacao_lote(item)
+        if erro:
+            return jsonify({'error': erro, 'indice': indice}), 400
+        validas.append(operacao)
+    
+    resultados = []
+    for operacao, resultado in zip(validas, contato_service.executar_lote(validas)):
+        if not resultado and operacao['op'] != 'excluir' and \
+                _email_rejeitado(operacao['dados'].get('email'), operacao['id']):
+            resultados.append({'op': operacao['op'], 'status': 409, 'error': 'Email já cadastrado'})
+        elif operacao['op'] == 'criar':
+            if resultado:
+                resultados.append({'op': 'criar', 'status': 201, 'contato': resultado.to_dict()})
+            else:
+                resultados.append({'op': 'criar', 'status': 500, 'error': 'Falha ao criar contato'})
+        elif resultado:
+            resultados.append({'op': operacao['op'], 'id': operacao['id'], 'status': 200})
+        else:
+            resultados.append({'op': operacao['op'], 'id': operacao['id'], 'status': 404,
+                               'error': 'Contato não encontrado'})
+    
+    return jsonify({'resultados': resultados})
+
 # Rotas para interface web
 @contato_bp.route('/', methods=['GET'])
 def listar_contatos():
     """Página web - Lista todos os contatos"""
     logger.info("Acessando página de listagem de contatos")
     
-    # Verifica se há filtro por nome ou categoria
-    nome = request.args.get('nome')
-    categoria_id = request.args.get('categoria_id')
+    try:
+        limite, apos_id = _ler_paginacao(TAMANHO_PAGINA)
+    except ValueError:
+        limite, apos_id = TAMANHO_PAGINA, None
     
-    if nome:
-        contatos = contato_service.buscar_por_nome(nome)
-        titulo = f'Resultados para "{nome}"'
-    elif categoria_id:
-        try:
-            categoria_id = int(categoria_id)
-            contatos = contato_service.buscar_por_categoria(categoria_id)
-            categoria = categoria_service.buscar_por_id(categoria_id)
-            titulo = f'Contatos na categoria: {categoria.nome if categoria else "Desconhecida"}'
-        except ValueError:
-            contatos = []
-            titulo = 'Contatos (filtro inválido)'
+    proximo = None
+    try:
+        filtros = _ler_filtros()
+    except ValueError:
+        contatos = []
+        titulo = 'Contatos (filtro inválido)'
     else:
-        contatos = contato_service.listar_todos()
+        contatos, proximo = contato_service.filtrar_pagina(limite, apos_id, **filtros)
         titulo = 'Todos os Contatos'
+        if 'categoria_id' in filtros:
+            categoria = categoria_service.buscar_por_id(filtros['categoria_id'])
+            titulo = f'Contatos na categoria: {categoria.nome if categoria else "Desconhecida"}'
+        if 'nome' in filtros:
+            titulo = f'Resultados para "{filtros["nome"]}"'
+            if 'categoria_id' in filtros:
+                titulo += f' na categoria: {categoria.nome if categoria else "Desconhecida"}'
     
-    categorias = categoria_service.listar_todas()
+    categorias = categoria_service.listar_visoes()
     return render_template('contatos/listar.html', 
                           contatos=contatos, 
                           categorias=categorias,
+                          categorias_por_id=categoria_service.registro_por_id(),
                           titulo=titulo,
-                          nome_busca=nome,
-                          categoria_id_busca=categoria_id)
+                          nome_busca=request.args.get('nome'),
+                          proximo_cursor=proximo,
+                          pagina_inicial=apos_id is None,
+                          limite=limite,
+                          filtros_busca={
+                              campo: request.args.get(campo)
+                              for campo in ('nome', 'categoria_id', 'telefone', 'email')
+                              if request.args.get(campo)
+                          },
+                          categoria_id_busca=request.args.get('categoria_id'))
 
 @contato_bp.route('/novo', methods=['GET', 'POST'])
 def criar_contato():
@@ -140,7 +338,7 @@ def criar_contato():
         
         if not nome or not telefone:
             flash('Nome e telefone são obrigatórios', 'danger')
-            categorias = categoria_service.listar_todas()
+            categorias = categoria_service.listar_visoes()
             return render_template('contatos/criar.html', categorias=categorias)
         
         # Converte categoria_id para int ou None
@@ -155,9 +353,12 @@ def criar_contato():
             flash('Contato criado com sucesso!', 'success')
             return redirect(url_for('contatos.listar_contatos'))
         
-        flash('Erro ao criar contato', 'danger')
+        if _email_rejeitado(email):
+            flash('Email já cadastrado em outro contato', 'danger')
+        else:
+            flash('Erro ao criar contato', 'danger')
     
-    categorias = categoria_service.listar_todas()
+    categorias = categoria_service.listar_visoes()
     return render_template('contatos/criar.html', categorias=categorias)
 
 @contato_bp.route('/editar/<int:id>', methods=['GET', 'POST'])
@@ -176,7 +377,7 @@ def editar_contato(id):
         
         if not nome or not telefone:
             flash('Nome e telefone são obrigatórios', 'danger')
-            categorias = categoria_service.listar_todas()
+            categorias = categoria_service.listar_visoes()
             return render_template('contatos/editar.html', contato=contato, categorias=categorias)
         
         # Converte categoria_id para int ou None
@@ -191,9 +392,12 @@ def editar_contato(id):
             flash('Contato atualizado com sucesso!', 'success')
             return redirect(url_for('contatos.listar_contatos'))
         
-        flash('Erro ao atualizar contato', 'danger')
+        if _email_rejeitado(email, id):
+            flash('Email já cadastrado em outro contato', 'danger')
+        else:
+            flash('Erro ao atualizar contato', 'danger')
     
-    categorias = categoria_service.listar_todas()
+    categorias = categoria_service.listar_visoes()
     return render_template('contatos/editar.html', contato=contato, categorias=categorias)
 
 @contato_bp.route('/excluir/<int:id>', methods=['POST'])
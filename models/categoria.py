@@ -1,7 +1,23 @@
+from operator import itemgetter
+
+CAMPOS = ('id', 'nome', 'descricao')
+_ler_campos = itemgetter(*CAMPOS)
+_CONJUNTO_CAMPOS = frozenset(CAMPOS)
+
+def _campo(nome):
+    """Cria uma propriedade somente leitura que consulta o registro da visão."""
+    return property(lambda self: self._registro.get(nome))
+
 class Categoria:
     """
     Modelo que representa uma categoria de contatos.
+    
+    Usa __slots__ para evitar um __dict__ por instância. Duas categorias são
+    iguais quando têm o mesmo ID; categorias ainda sem ID só são iguais a si
+    mesmas.
     """
+    __slots__ = CAMPOS
+    
     def __init__(self, id=None, nome=None, descricao=None):
         """
         Inicializa uma nova categoria.
@@ -28,6 +44,28 @@ class Categoria:
             'descricao': self.descricao
         }
     
+    def to_tuple(self):
+        """
+        Converte o objeto categoria para uma tupla, na ordem de CAMPOS.
+        
+        Returns:
+            tuple: (id, nome, descricao)
+        """
+        return (self.id, self.nome, self.descricao)
+    
+    @classmethod
+    def from_tuple(cls, valores):
+        """
+        Cria um objeto Categoria a partir de uma tupla na ordem de CAMPOS.
+        
+        Args:
+            valores (tuple): (id, nome, descricao)
+            
+        Returns:
+            Categoria: Uma nova instância de Categoria
+        """
+        return cls(*valores)
+    
     @classmethod
     def from_dict(cls, data):
         """
@@ -39,8 +77,78 @@ class Categoria:
         Returns:
             Categoria: Uma nova instância de Categoria
         """
-        return cls(
-            id=data.get('id'),
-            nome=data.get('nome'),
-            descricao=data.get('descricao')
-        )
\ No newline at end of file
+        try:
+            # Caminho rápido: registros gravados pela aplicação têm todos os campos
+            return cls(*_ler_campos(data))
+        except KeyError:
+            return cls(
+                id=data.get('id'),
+                nome=data.get('nome'),
+                descricao=data.get('descricao')
+            )
+    
+    def __eq__(self, other):
+        if not isinstance(other, Categoria):
+            return NotImplemented
+        if self.id is None or other.id is None:
+            return self is other
+        return self.id == other.id
+    
+    def __hash__(self):
+        return hash(self.id) if self.id is not None else object.__hash__(self)
+
+class VisaoCategoria:
+    """
+    Visão somente leitura de uma categoria armazenada, usada nas listagens.
+    
+    Envolve o registro (dicionário) guardado pelo repositório sem copiá-lo e
+    expõe os mesmos atributos de Categoria, de modo que templates e controladores
+    podem usá-la no lugar do modelo. Como os repositórios substituem o
+    registro a cada atualização em vez de alterá-lo, a visão reflete os dados
+    do momento em que foi obtida.
+    """
+    __slots__ = ('_registro',)
+    
+    id = _campo('id')
+    nome = _campo('nome')
+    descricao = _campo('descricao')
+    
+    def __init__(self, registro):
+        """
+        Inicializa a visão sobre um registro.
+        
+        Args:
+            registro (dict): Registro da categoria, que não deve ser alterado
+        """
+        self._registro = registro
+    
+    def to_dict(self):
+        """
+        Obtém a categoria como dicionário pronto para serialização em JSON.
+        Quando o registro tem exatamente os campos do modelo, ele próprio é
+        retornado, sem cópia; o resultado não deve ser alterado.
+        
+        Returns:
+            dict: Dicionário com os dados da categoria
+        """
+        if self._registro.keys() == _CONJUNTO_CAMPOS:
+            return self._registro
+        return dict(zip(CAMPOS, self.to_tuple()))
+    
+    def to_tuple(self):
+        """
+        Converte a visão para uma tupla, na ordem de CAMPOS.
+        
+        Returns:
+            tuple: (id, nome, descricao)
+        """
+        return tuple(self._registro.get(campo) for campo in CAMPOS)
+    
+    def to_categoria(self):
+        """
+        Cria um objeto Categoria editável com os dados da visão.
+        
+        Returns:
+            Categoria: Uma nova instância de Categoria
+        """
+        return Categoria.from_dict(self._registro)
\ No newline at end of file
@@ -1,7 +1,24 @@
+from operator import itemgetter
+
+CAMPOS = ('id', 'nome', 'telefone', 'email', 'categoria_id')
+_ler_campos = itemgetter(*CAMPOS)
+_CONJUNTO_CAMPOS = frozenset(CAMPOS)
+
+def _campo(nome):
+    """Cria uma propriedade somente leitura que consulta o registro da visão."""
+    return property(lambda self: self._registro.get(nome))
+
 class Contato:
     """
     Modelo que representa um contato na agenda.
+    
+    Usa __slots__ para evitar um __dict__ por instância. Dois contatos são
+    iguais quando têm o mesmo ID; contatos ainda sem ID só são iguais a si
+    mesmos. O hash acompanha o ID, por isso um contato não deve ser guardado
+    em conjuntos ou como chave de dicionário antes de ser salvo.
     """
+    __slots__ = CAMPOS
+    
     def __init__(self, id=None, nome=None, telefone=None, email=None, categoria_id=None):
         """
         Inicializa um novo contato.
@@ -34,6 +51,41 @@ class Contato:
             'categoria_id': self.categoria_id
         }
     
+    def to_tuple(self):
+        """
+        Converte o objeto contato para uma tupla, na ordem de CAMPOS.
+        
+        Returns:
+            tuple: (id, nome, telefone, email, categoria_id)
+        """
+        return (self.id, self.nome, self.telefone, self.email, self.categoria_id)
+    
+    def categoria_em(self, categorias):
+        """
+        Resolve a categoria do contato em um registro de categorias, sem
+        copiá-la.
+        
+        Args:
+            categorias (Mapping): Categorias indexadas por ID
+            
+        Returns:
+            A categoria do registro ou None se o contato não tiver categoria
+        """
+        return categorias.get(self.categoria_id)
+    
+    @classmethod
+    def from_tuple(cls, valores):
+        """
+        Cria um objeto Contato a partir de uma tupla na ordem de CAMPOS.
+        
+        Args:
+            valores (tuple): (id, nome, telefone, email, categoria_id)
+            
+        Returns:
+            Contato: Uma nova instância de Contato
+        """
+        return cls(*valores)
+    
     @classmethod
     def from_dict(cls, data):
         """
@@ -45,10 +97,95 @@ class Contato:
         Returns:
             Contato: Uma nova instância de Contato
         """
-        return cls(
-            id=data.get('id'),
-            nome=data.get('nome'),
-            telefone=data.get('telefone'),
-            email=data.get('email'),
-            categoria_id=data.get('categoria_id')
-        )
\ No newline at end of file
+        try:
+            # Caminho rápido: registros gravados pela aplicação têm todos os campos
+            return cls(*_ler_campos(data))
+        except KeyError:
+            return cls(
+                id=data.get('id'),
+                nome=data.get('nome'),
+                telefone=data.get('telefone'),
+                email=data.get('email'),
+                categoria_id=data.get('categoria_id')
+            )
+    
+    def __eq__(self, other):
+        if not isinstance(other, Contato):
+            return NotImplemented
+        if self.id is None or other.id is None:
+            return self is other
+        return self.id == other.id
+    
+    def __hash__(self):
+        return hash(self.id) if self.id is not None else object.__hash__(self)
+
+class VisaoContato:
+    """
+    Visão somente leitura de um contato armazenado, usada nas listagens.
+    
+    Envolve o registro (dicionário) guardado pelo repositório sem copiá-lo e
+    expõe os mesmos atributos de Contato, de modo que templates e controladores
+    podem usá-la no lugar do modelo. Como os repositórios substituem o
+    registro a cada atualização em vez de alterá-lo, a visão reflete os dados
+    do momento em que foi obtida.
+    """
+    __slots__ = ('_registro',)
+    
+    id = _campo('id')
+    nome = _campo('nome')
+    telefone = _campo('telefone')
+    email = _campo('email')
+    categoria_id = _campo('categoria_id')
+    
+    def __init__(self, registro):
+        """
+        Inicializa a visão sobre um registro.
+        
+        Args:
+            registro (dict): Registro do contato, que não deve ser alterado
+        """
+        self._registro = registro
+    
+    def to_dict(self):
+        """
+        Obtém o contato como dicionário pronto para serialização em JSON.
+        Quando o registro tem exatamente os campos do modelo, ele próprio é
+        retornado, sem cópia; o resultado não deve ser alterado.
+        
+        Returns:
+            dict: Dicionário com os dados do contato
+        """
+        if self._registro.keys() == _CONJUNTO_CAMPOS:
+            return self._registro
+        return dict(zip(CAMPOS, self.to_tuple()))
+    
+    def to_tuple(self):
+        """
+        Converte a visão para uma tupla, na ordem de CAMPOS.
+        
+        Returns:
+            tuple: (id, nome, telefone, email, categoria_id)
+        """
+        return tuple(self._registro.get(campo) for campo in CAMPOS)
+    
+    def categoria_em(self, categorias):
+        """
+        Resolve a categoria do contato em um registro de categorias, sem
+        copiá-la.
+        
+        Args:
+            categorias (Mapping): Categorias indexadas por ID
+            
+        Returns:
+            A categoria do registro ou None se o contato não tiver categoria
+        """
+        return categorias.get(self.categoria_id)
+    
+    def to_contato(self):
+        """
+        Cria um objeto Contato editável com os dados da visão.
+        
+        Returns:
+            Contato: Uma nova instância de Contato
+        """
+        return Contato.from_dict(self._registro)
\ No newline at end of file
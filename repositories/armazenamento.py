@@ -0,0 +1,472 @@
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from repositories.formatos import CODEC_PADRAO
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos
+    fcntl = None
+
+
+@contextmanager
+def trava_arquivo(caminho):
+    """
+    Trava exclusiva entre processos baseada em flock.
+
+    Em plataformas sem fcntl a trava não tem efeito; nesse caso apenas o
+    lock do repositório (entre threads) protege as escritas.
+
+    Args:
+        caminho (str): Caminho do arquivo usado como trava
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(caminho, 'a') as arquivo:
+        fcntl.flock(arquivo, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(arquivo, fcntl.LOCK_UN)
+
+
+def gravar_atomico(caminho, registros, codec=CODEC_PADRAO):
+    """
+    Grava uma lista de registros de forma atômica.
+
+    O conteúdo é escrito em um arquivo temporário que depois substitui o
+    original, para que leitores concorrentes nunca vejam um arquivo pela metade.
+
+    Args:
+        caminho (str): Caminho do arquivo de destino
+        registros (list): Registros como dicionários
+        codec (Codec): Formato do arquivo
+    """
+    temp_path = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with codec.abrir(temp_path, 'w') as file:
+            codec.escrever(file, registros)
+        os.replace(temp_path, caminho)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def internar(registro, campos):
+    """
+    Interna as chaves de um registro e os valores de texto dos campos
+    informados, para que registros com o mesmo valor compartilhem uma única
+    string em memória.
+
+    Args:
+        registro (dict): Registro carregado
+        campos (iterable): Campos cujos valores de texto são internados
+
+    Returns:
+        dict: Registro com as strings internadas
+    """
+    return {
+        sys.intern(chave): sys.intern(valor) if chave in campos and isinstance(valor, str) else valor
+        for chave, valor in registro.items()
+    }
+
+
+class ArmazenamentoJson:
+    """
+    Armazenamento em um único arquivo, regravado por completo a cada escrita.
+    """
+    def __init__(self, file_path, nome, logger, internar=(), codec=None):
+        """
+        Inicializa o armazenamento.
+
+        Args:
+            file_path (str): Caminho do arquivo JSON; com outro codec, a
+                             extensão é trocada pela do formato configurado
+            nome (str): Nome da coleção, usado nas mensagens de log
+            logger (Logger): Logger da aplicação
+            internar (tuple): Campos de texto internados na carga
+            codec (Codec, optional): Formato do arquivo (padrão: JSON indentado)
+        """
+        self.codec = codec or CODEC_PADRAO
+        self.json_path = file_path
+        self.file_path = self.codec.caminho(file_path)
+        self.nome = nome
+        self.logger = logger
+        self.internar = internar
+
+    def arquivos(self):
+        """
+        Lista os arquivos cujo conteúdo compõe a coleção.
+
+        Returns:
+            list: Caminhos dos arquivos
+        """
+        return [self.file_path]
+
+    def inicializar(self):
+        """
+        Cria o arquivo de dados. Se o formato configurado usa outro arquivo e
+        o arquivo JSON já existe, os registros dele são convertidos; o arquivo
+        JSON é mantido.
+        """
+        registros = []
+        if self.file_path != self.json_path and os.path.exists(self.json_path):
+            registros = type(self)(self.json_path, self.nome, self.logger).carregar()
+            self.logger.info(f"{self.nome} migrados de {self.json_path}: {len(registros)} registros")
+        gravar_atomico(self.file_path, registros, self.codec)
+
+    def carregar(self):
+        """
+        Carrega os registros do arquivo.
+
+        Returns:
+            list: Lista de registros como dicionários
+        """
+        try:
+            with self.codec.abrir(self.file_path, 'r') as file:
+                return [internar(registro, self.internar) for registro in self.codec.ler(file)]
+        except Exception as e:
+            self.logger.error(f"Erro ao carregar {self.nome}: {str(e)}")
+            return []
+
+    def iterar(self):
+        """
+        Percorre os registros do arquivo sem carregá-lo por inteiro.
+
+        Yields:
+            dict: Cada registro, na ordem do arquivo
+        """
+        try:
+            with self.codec.abrir(self.file_path, 'r') as file:
+                for registro in self.codec.iterar(file):
+                    yield internar(registro, self.internar)
+        except Exception as e:
+            self.logger.error(f"Erro ao carregar {self.nome}: {str(e)}")
+
+    def gravar(self, colecao, operacoes):
+        """
+        Persiste a coleção regravando o arquivo inteiro.
+
+        Args:
+            colecao (Colecao): Estado atual da coleção
+            operacoes (list): Operações aplicadas (ignoradas neste formato)
+
+        Returns:
+            bool: True se salvo com sucesso, False caso contrário
+        """
+        try:
+            gravar_atomico(self.file_path, colecao.registros(), self.codec)
+            return True
+        except Exception as e:
+            self.logger.error(f"Erro ao salvar {self.nome}: {str(e)}")
+            return False
+
+
+class ArmazenamentoLog(ArmazenamentoJson):
+    """
+    Armazenamento em log de operações com compactação em segundo plano.
+
+    Cada escrita acrescenta uma linha JSON por operação ao arquivo de log,
+    custando O(registro) em vez de O(coleção). Na carga, o snapshot JSON é lido
+    e o log é reaplicado sobre ele. Quando o log passa do limite configurado, ele
+    é renomeado e uma thread grava um novo snapshot a partir do snapshot anterior
+    mais o log renomeado; escritas novas seguem para um log vazio.
+
+    Reaplicar uma operação é idempotente, então uma compactação interrompida
+    nunca corrompe os dados: o log renomeado é reaplicado a cada carga e
+    incorporado ao snapshot quando o limite for atingido outra vez. Uma trava
+    mantida durante a compactação distingue essa sobra de uma compactação em
+    andamento em outro processo.
+    """
+    LIMITE_COMPACTACAO = 1024 * 1024  # 1MB
+
+    def __init__(self, file_path, nome, logger, limite_compactacao=None, internar=(), codec=None):
+        """
+        Inicializa o armazenamento.
+
+        Args:
+            file_path (str): Caminho do snapshot JSON (ver ArmazenamentoJson)
+            nome (str): Nome da coleção, usado nas mensagens de log
+            logger (Logger): Logger da aplicação
+            limite_compactacao (int, optional): Tamanho do log, em bytes,
+                                                que dispara a compactação
+            internar (tuple): Campos de texto internados na carga
+            codec (Codec, optional): Formato do snapshot; o log é sempre
+                                     gravado com uma operação JSON por linha
+        """
+        super().__init__(file_path, nome, logger, internar=internar, codec=codec)
+        self.log_path = f"{self.file_path}.log"
+        self.compactando_path = f"{self.file_path}.log.compactando"
+        self.lock_path = f"{self.file_path}.lock"
+        self.compactacao_lock_path = f"{self.file_path}.compactacao.lock"
+        self.limite_compactacao = limite_compactacao or self.LIMITE_COMPACTACAO
+        self._thread = None
+
+    def arquivos(self):
+        """
+        Lista os arquivos cujo conteúdo compõe a coleção.
+
+        Returns:
+            list: Caminhos do snapshot e dos logs
+        """
+        return [self.file_path, self.compactando_path, self.log_path]
+
+    def carregar(self):
+        """
+        Carrega o snapshot e reaplica as operações registradas no log.
+
+        Returns:
+            list: Lista de registros como dicionários
+        """
+        # A trava impede que a compactação troque o snapshot entre a leitura
+        # dele e a leitura do log rotacionado
+        with trava_arquivo(self.lock_path):
+            registros = {registro.get('id'): registro for registro in super().carregar()}
+            for caminho in (self.compactando_path, self.log_path):
+                self._reaplicar(caminho, registros)
+        return list(registros.values())
+
+    def iterar(self):
+        """
+        Percorre os registros do snapshot sem carregá-lo por inteiro,
+        aplicando as operações do log durante a leitura.
+
+        Apenas as operações pendentes no log ficam em memória: registros
+        alterados substituem os do snapshot na mesma posição, excluídos são
+        omitidos e os novos vêm ao final, na mesma ordem de carregar().
+
+        Yields:
+            dict: Cada registro da coleção
+        """
+        pendentes = {}
+        excluidos = set()
+        # O snapshot é aberto sob a trava: mesmo que a compactação o substitua
+        # depois, a leitura continua no arquivo que corresponde aos logs lidos
+        with trava_arquivo(self.lock_path):
+            for caminho in (self.compactando_path, self.log_path):
+                self._reaplicar(caminho, pendentes, excluidos)
+            try:
+                file = self.codec.abrir(self.file_path, 'r')
+            except OSError as e:
+                self.logger.error(f"Erro ao carregar {self.nome}: {str(e)}")
+                file = None
+
+        if file is not None:
+            with file:
+                try:
+                    for registro in self.codec.iterar(file):
+                        id = registro.get('id')
+                        if id in pendentes:
+                            yield pendentes.pop(id)
+                        elif id not in excluidos:
+                            yield internar(registro, self.internar)
+                except Exception as e:
+                    self.logger.error(f"Erro ao carregar {self.nome}: {str(e)}")
+        yield from pendentes.values()
+
+    def _reaplicar(self, caminho, registros, excluidos=None):
+        """
+        Reaplica as operações de um arquivo de log.
+
+        Args:
+            caminho (str): Caminho do arquivo de log
+            registros (dict): Registros indexados por ID, alterados no lugar
+            excluidos (set, optional): Recebe os IDs excluídos pelo log
+        """
+        if not os.path.exists(caminho):
+            return
+        with open(caminho, 'r', encoding='utf-8') as file:
+            for numero, linha in enumerate(file, 1):
+                try:
+                    entrada = json.loads(linha)
+                except ValueError:
+                    # Linha truncada por uma escrita interrompida
+                    self.logger.warning(f"Entrada inválida no log de {self.nome}: {caminho}:{numero}")
+                    continue
+                if entrada['op'] == 'excluir':
+                    registros.pop(entrada['id'], None)
+                    if excluidos is not None:
+                        excluidos.add(entrada['id'])
+                else:
+                    # Cada linha do log é decodificada à parte, então as chaves
+                    # não são compartilhadas entre registros sem internar
+                    registro = internar(entrada['registro'], self.internar)
+                    registros[registro.get('id')] = registro
+
+    def gravar(self, colecao, operacoes):
+        """
+        Acrescenta as operações ao log.
+
+        Args:
+            colecao (Colecao): Estado atual da coleção (não utilizado)
+            operacoes (list): Tuplas (operação, registro) a registrar
+
+        Returns:
+            bool: True se salvo com sucesso, False caso contrário
+        """
+        linhas = []
+        for op, registro in operacoes:
+            if op == 'excluir':
+                entrada = {'op': op, 'id': registro.get('id')}
+            else:
+                entrada = {'op': op, 'registro': registro}
+            linhas.append(json.dumps(entrada, ensure_ascii=False) + '\n')
+
+        try:
+            with trava_arquivo(self.lock_path):
+                with open(self.log_path, 'a', encoding='utf-8') as file:
+                    file.write(''.join(linhas))
+                    tamanho = file.tell()
+                if tamanho >= self.limite_compactacao:
+                    self._iniciar_compactacao()
+            return True
+        except Exception as e:
+            self.logger.error(f"Erro ao salvar {self.nome}: {str(e)}")
+            return False
+
+    def _travar_compactacao(self):
+        """
+        Tenta obter, sem esperar, a trava mantida durante uma compactação.
+
+        Returns:
+            file: Arquivo da trava, liberada quando ele é fechado, ou None se
+                  houver uma compactação em andamento (nesta ou em outra instância)
+        """
+        if fcntl is None:
+            if self._thread is not None and self._thread.is_alive():
+                return None
+            return open(self.compactacao_lock_path, 'a')
+        arquivo = open(self.compactacao_lock_path, 'a')
+        try:
+            fcntl.flock(arquivo, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            arquivo.close()
+            return None
+        return arquivo
+
+    def _iniciar_compactacao(self):
+        """
+        Rotaciona o log e dispara a compactação em segundo plano.
+        Deve ser chamado com a trava de arquivo adquirida.
+        """
+        trava = self._travar_compactacao()
+        if trava is None:
+            return
+        try:
+            if os.path.exists(self.compactando_path):
+                # Sobra de uma compactação interrompida (processo encerrado no
+                # meio dela): o log rotacionado é incorporado ao snapshot agora,
+                # antes da nova rotação
+                self.logger.warning(f"Retomando compactação interrompida do log de {self.nome}")
+                self._incorporar(self._mesclar())
+            os.replace(self.log_path, self.compactando_path)
+        except Exception:
+            trava.close()
+            raise
+        self._thread = threading.Thread(target=self.compactar, args=(trava,), daemon=True)
+        self._thread.start()
+
+    def _mesclar(self):
+        """
+        Aplica o log rotacionado sobre o snapshot.
+
+        Returns:
+            dict: Registros resultantes indexados por ID
+        """
+        registros = {registro.get('id'): registro for registro in super().carregar()}
+        self._reaplicar(self.compactando_path, registros)
+        return registros
+
+    def _incorporar(self, registros):
+        """
+        Grava o novo snapshot e remove o log rotacionado.
+        Deve ser chamado com a trava de arquivo adquirida.
+
+        Args:
+            registros (dict): Registros do snapshot indexados por ID
+        """
+        gravar_atomico(self.file_path, list(registros.values()), self.codec)
+        os.remove(self.compactando_path)
+
+    def compactar(self, trava=None):
+        """
+        Grava um novo snapshot com o conteúdo do log rotacionado e o remove.
+
+        Args:
+            trava (file, optional): Trava de compactação, liberada ao final
+        """
+        try:
+            registros = self._mesclar()
+            with trava_arquivo(self.lock_path):
+                self._incorporar(registros)
+            self.logger.info(f"Log de {self.nome} compactado: {len(registros)} registros")
+        except Exception as e:
+            self.logger.error(f"Erro ao compactar log de {self.nome}: {str(e)}")
+        finally:
+            if trava is not None:
+                trava.close()
+
+    def aguardar_compactacao(self):
+        """Aguarda o término da compactação em andamento, se houver."""
+        if self._thread is not None:
+            self._thread.join()
+
+
+ARMAZENAMENTOS = {
+    'json': ArmazenamentoJson,
+    'log': ArmazenamentoLog
+}
+
+
+def criar_armazenamento(tipo, file_path, nome, logger, internar=(), codec=None):
+    """
+    Cria o mecanismo de armazenamento pelo nome.
+
+    Args:
+        tipo (str): 'json' ou 'log'
+        file_path (str): Caminho do arquivo de dados
+        nome (str): Nome da coleção, usado nas mensagens de log
+        logger (Logger): Logger da aplicação
+        internar (tuple): Campos de texto internados na carga
+        codec (Codec, optional): Formato do arquivo de dados
+
+    Returns:
+        O mecanismo de armazenamento
+
+    Raises:
+        ValueError: Se o tipo não for conhecido
+    """
+    if tipo not in ARMAZENAMENTOS:
+        raise ValueError(f"Armazenamento desconhecido: {tipo}")
+    return ARMAZENAMENTOS[tipo](file_path, nome, logger, internar=internar, codec=codec)
+
+
+def carregar_existente(tipo, file_path, nome, logger, codec=None):
+    """
+    Carrega os registros de uma coleção do backend JSON, para migrá-los a
+    outro backend.
+
+    Os registros são lidos pelo armazenamento configurado, de modo que o
+    formato e a compressão do arquivo são respeitados e as operações pendentes
+    no log são reaplicadas. Se não houver arquivo no formato do codec, é usado
+    o arquivo JSON padrão, como na conversão feita por inicializar().
+
+    Args:
+        tipo (str): Mecanismo do backend JSON ('json' ou 'log')
+        file_path (str): Caminho do arquivo JSON da coleção
+        nome (str): Nome da coleção, usado nas mensagens de log
+        logger (Logger): Logger da aplicação
+        codec (Codec, optional): Formato configurado do arquivo
+
+    Returns:
+        list: Registros como dicionários (vazia se a coleção não existir)
+    """
+    for codec_origem in (codec, None):
+        origem = criar_armazenamento(tipo, file_path, nome, logger, codec=codec_origem)
+        if any(os.path.exists(caminho) for caminho in origem.arquivos()):
+            return origem.carregar()
+    return []
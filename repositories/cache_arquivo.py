@@ -0,0 +1,119 @@
+import os
+from functools import wraps
+
+
+def sincronizado(metodo):
+    """
+    Decorador que executa o método sob o lock do repositório.
+
+    O cache em memória é compartilhado entre as threads do worker, por isso
+    leituras e escritas no repositório são serializadas. Se o método falhar,
+    o cache do repositório é descartado: uma escrita interrompida pode ter
+    alterado os dados em memória sem gravá-los.
+    """
+    @wraps(metodo)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            try:
+                return metodo(self, *args, **kwargs)
+            except Exception:
+                self._cache.invalidar()
+                raise
+    return wrapper
+
+
+class CacheArquivo:
+    """
+    Cache em memória do conteúdo desserializado de arquivos de dados.
+
+    Os dados ficam associados à assinatura dos arquivos (mtime, tamanho e inode).
+    Enquanto a assinatura em disco não mudar os dados em memória são reutilizados;
+    alterações feitas por outros workers ou por ferramentas externas mudam a
+    assinatura e forçam a recarga.
+    """
+    def __init__(self, *caminhos):
+        """
+        Inicializa o cache.
+
+        Args:
+            caminhos (str): Caminhos dos arquivos monitorados
+        """
+        self.caminhos = caminhos
+        self._dados = None
+        self._assinatura = None
+
+    def _assinatura_atual(self):
+        """
+        Obtém a assinatura atual dos arquivos em disco.
+
+        Returns:
+            tuple: (mtime_ns, tamanho, inode) de cada arquivo, com None para
+                   arquivos inexistentes, ou None se o principal não existir
+        """
+        assinatura = []
+        for caminho in self.caminhos:
+            try:
+                stat = os.stat(caminho)
+            except OSError:
+                assinatura.append(None)
+                continue
+            assinatura.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+        if assinatura[0] is None:
+            return None
+        return tuple(assinatura)
+
+    def versao(self):
+        """
+        Obtém a assinatura atual dos arquivos, que muda a cada gravação.
+
+        Returns:
+            tuple: Assinatura dos arquivos ou None se o principal não existir
+        """
+        return self._assinatura_atual()
+
+    def obter(self, carregar):
+        """
+        Retorna os dados em cache, recarregando-os se o arquivo mudou.
+
+        Args:
+            carregar (callable): Função que lê e desserializa o arquivo
+
+        Returns:
+            Os dados em memória
+        """
+        assinatura = self._assinatura_atual()
+        if self._dados is not None and assinatura is not None and assinatura == self._assinatura:
+            return self._dados
+
+        # A assinatura é lida antes do arquivo: se ele mudar durante a leitura,
+        # a próxima chamada detecta a diferença e recarrega novamente.
+        self._dados = carregar()
+        self._assinatura = assinatura
+        return self._dados
+
+    def atual(self):
+        """
+        Retorna os dados em cache apenas se ainda correspondem ao arquivo,
+        sem carregá-lo.
+
+        Returns:
+            Os dados em memória ou None se o cache estiver vazio ou desatualizado
+        """
+        if self._dados is not None and self._assinatura is not None and self._assinatura == self._assinatura_atual():
+            return self._dados
+        return None
+
+    def atualizar(self, dados):
+        """
+        Registra os dados que acabaram de ser gravados no arquivo.
+
+        Args:
+            dados: Dados em memória equivalentes ao conteúdo gravado
+        """
+        self._dados = dados
+        self._assinatura = self._assinatura_atual()
+
+    def invalidar(self):
+        """Descarta os dados em memória, forçando a recarga na próxima leitura."""
+        self._dados = None
+        self._assinatura = None
@@ -1,19 +1,41 @@
-import json
 import os
-from models.categoria import Categoria
+import threading
+from models.categoria import Categoria, VisaoCategoria
 from logger_singleton import Logger
+from repositories.armazenamento import criar_armazenamento, trava_arquivo
+from repositories.cache_arquivo import CacheArquivo, sincronizado
+from repositories.formatos import Codec
+from repositories.colecao import Colecao
+from repositories.sequencia import Sequencia
+from repositories.indices import IndiceInstancias, IndiceTextual
+from repositories.normalizacao import termos
 
 class CategoriaRepository:
-    def __init__(self, data_path='data'):
+    def __init__(self, data_path='data', armazenamento='json', formato='json', compressao=None):
         """
         Inicializa o repositório de categorias.
         
         Args:
             data_path (str): Caminho para o diretório de dados
+            armazenamento (str): Mecanismo de persistência: 'json' regrava o
+                                 arquivo a cada escrita, 'log' acrescenta as
+                                 operações a um log compactado em segundo plano
+            formato (str): Formato do arquivo de dados: 'json' (indentado),
+                           'compacto' ou 'ndjson'
+            compressao (str, optional): Compressão do arquivo: 'zlib' ou 'lzma'
         """
         self.logger = Logger.get_instance()
         self.data_path = data_path
-        self.file_path = os.path.join(data_path, 'categorias.json')
+        self._armazenamento = criar_armazenamento(
+            armazenamento, os.path.join(data_path, 'categorias.json'), 'categorias', self.logger,
+            internar=('nome', 'descricao'), codec=Codec(formato, compressao)
+        )
+        self.file_path = self._armazenamento.file_path
+        # Trava entre processos mantida da leitura à gravação de cada escrita
+        self.lock_path = f"{self.file_path}.escrita.lock"
+        self._cache = CacheArquivo(*self._armazenamento.arquivos())
+        self._sequencia = Sequencia(os.path.join(data_path, 'categorias.seq'))
+        self._lock = threading.RLock()
         
         # Cria o diretório de dados se não existir
         if not os.path.exists(data_path):
@@ -22,55 +44,88 @@ class CategoriaRepository:
         
         # Cria o arquivo de categorias se não existir
         if not os.path.exists(self.file_path):
-            self._save_to_file([])
+            self._armazenamento.inicializar()
             self.logger.info(f"Arquivo de categorias criado: {self.file_path}")
     
     def _load_from_file(self):
         """
-        Carrega categorias do arquivo JSON.
+        Carrega categorias do armazenamento, reaproveitando o cache em memória
+        enquanto os arquivos não forem alterados.
         
         Returns:
-            list: Lista de categorias como dicionários
+            Colecao: Coleção de categorias indexada por ID
         """
-        try:
-            with open(self.file_path, 'r', encoding='utf-8') as file:
-                return json.load(file)
-        except Exception as e:
-            self.logger.error(f"Erro ao carregar categorias: {str(e)}")
-            return []
+        return self._cache.obter(lambda: self._nova_colecao(self._armazenamento.carregar()))
     
-    def _save_to_file(self, categorias):
+    def _nova_colecao(self, registros):
         """
-        Salva categorias no arquivo JSON.
+        Cria a coleção de categorias com seu índice textual e o registro de
+        instâncias compartilhadas.
         
         Args:
-            categorias (list): Lista de categorias como dicionários
+            registros (list): Lista de categorias como dicionários
+            
+        Returns:
+            Colecao: Coleção indexada de categorias
+        """
+        return Colecao(registros, indices={
+            'texto': IndiceTextual({'nome': termos, 'descricao': termos}),
+            'instancias': IndiceInstancias(VisaoCategoria)
+        })
+    
+    def _save_to_file(self, categorias, operacoes):
+        """
+        Persiste as alterações feitas na coleção de categorias.
+        
+        Args:
+            categorias (Colecao): Coleção de categorias já alterada
+            operacoes (list): Tuplas (operação, registro) aplicadas à coleção
             
         Returns:
             bool: True se salvo com sucesso, False caso contrário
         """
-        try:
-            with open(self.file_path, 'w', encoding='utf-8') as file:
-                json.dump(categorias, file, indent=4, ensure_ascii=False)
+        if self._armazenamento.gravar(categorias, operacoes):
+            self._cache.atualizar(categorias)
             return True
-        except Exception as e:
-            self.logger.error(f"Erro ao salvar categorias: {str(e)}")
-            return False
+        
+        self._cache.invalidar()
+        return False
     
     def _get_next_id(self, categorias):
         """
-        Obtém o próximo ID disponível para uma nova categoria.
+        Obtém o próximo ID para uma nova categoria, a partir da sequência persistida.
         
         Args:
-            categorias (list): Lista de categorias atuais
+            categorias (iterable): Categorias atuais como dicionários
             
         Returns:
             int: Próximo ID disponível
         """
-        if not categorias:
-            return 1
-        return max(cat.get('id', 0) for cat in categorias) + 1
+        return self._reservar_ids(categorias, 1)[0]
     
+    def _reservar_ids(self, categorias, quantidade):
+        """
+        Reserva IDs para novas categorias com um único acesso à sequência.
+        Na primeira alocação a sequência parte do maior ID existente, e IDs já
+        ocupados por registros inseridos por fora da aplicação são pulados.
+        
+        Args:
+            categorias (iterable): Categorias atuais como dicionários
+            quantidade (int): Quantidade de IDs a reservar
+            
+        Returns:
+            list: IDs reservados, em ordem crescente
+        """
+        ids = []
+        while len(ids) < quantidade:
+            reservados = self._sequencia.reservar(
+                lambda: max((cat.get('id') or 0 for cat in categorias), default=0),
+                quantidade - len(ids)
+            )
+            ids.extend(id for id in reservados if id not in categorias)
+        return ids
+    
+    @sincronizado
     def listar_todas(self):
         """
         Lista todas as categorias.
@@ -81,6 +136,34 @@ class CategoriaRepository:
         categorias_dict = self._load_from_file()
         return [Categoria.from_dict(cat) for cat in categorias_dict]
     
+    @sincronizado
+    def listar_visoes(self):
+        """
+        Lista todas as categorias como visões somente leitura sobre os
+        registros em cache, sem copiá-los. As visões são as instâncias
+        compartilhadas de registro_por_id.
+        
+        Returns:
+            list: Lista de objetos VisaoCategoria
+        """
+        categorias = self._load_from_file()
+        instancias = categorias.indices['instancias']
+        return [instancias.obter(cat.get('id')) for cat in categorias]
+    
+    @sincronizado
+    def registro_por_id(self):
+        """
+        Obtém o registro de categorias: uma instância compartilhada
+        (VisaoCategoria) por categoria, indexada pelo ID. A mesma instância é
+        devolvida enquanto a categoria não for alterada, de modo que os
+        contatos resolvem sua categoria sem criar objetos.
+        
+        Returns:
+            MappingProxyType: Categorias indexadas por ID, somente leitura
+        """
+        return self._load_from_file().indices['instancias'].mapa()
+    
+    @sincronizado
     def buscar_por_id(self, id):
         """
         Busca uma categoria pelo ID.
@@ -91,12 +174,26 @@ class CategoriaRepository:
         Returns:
             Categoria: Objeto categoria encontrado ou None
         """
-        categorias_dict = self._load_from_file()
-        for cat in categorias_dict:
-            if cat.get('id') == id:
-                return Categoria.from_dict(cat)
-        return None
+        registro = self._load_from_file().obter(id)
+        if registro is None:
+            return None
+        return Categoria.from_dict(registro)
+    
+    @sincronizado
+    def pontuar_texto(self, termos):
+        """
+        Calcula a relevância de cada categoria (nome e descrição) para uma
+        busca textual.
+        
+        Args:
+            termos (list): Termos da consulta, já normalizados
+            
+        Returns:
+            dict: Pontuação indexada pelo ID da categoria
+        """
+        return self._load_from_file().indices['texto'].pontuar(termos)
     
+    @sincronizado
     def criar(self, categoria):
         """
         Cria uma nova categoria.
@@ -107,21 +204,24 @@ class CategoriaRepository:
         Returns:
             Categoria: Categoria criada com ID atribuído
         """
-        categorias_dict = self._load_from_file()
-        
-        # Atribui um novo ID
-        novo_id = self._get_next_id(categorias_dict)
-        categoria.id = novo_id
-        
-        # Adiciona à lista e salva
-        categorias_dict.append(categoria.to_dict())
-        if self._save_to_file(categorias_dict):
-            self.logger.info(f"Categoria criada: {categoria.nome} (ID: {categoria.id})")
-            return categoria
+        with trava_arquivo(self.lock_path):
+            categorias_dict = self._load_from_file()
+            
+            # Atribui um novo ID
+            novo_id = self._get_next_id(categorias_dict)
+            categoria.id = novo_id
+            
+            # Adiciona à lista e salva
+            registro = categoria.to_dict()
+            categorias_dict.inserir(registro)
+            if self._save_to_file(categorias_dict, [('criar', registro)]):
+                self.logger.info(f"Categoria criada: {categoria.nome} (ID: {categoria.id})")
+                return categoria
         
         self.logger.error(f"Falha ao criar categoria: {categoria.nome}")
         return None
     
+    @sincronizado
     def atualizar(self, categoria):
         """
         Atualiza uma categoria existente.
@@ -136,20 +236,21 @@ class CategoriaRepository:
             self.logger.error("Tentativa de atualizar categoria sem ID")
             return False
         
-        categorias_dict = self._load_from_file()
-        for i, cat in enumerate(categorias_dict):
-            if cat.get('id') == categoria.id:
-                categorias_dict[i] = categoria.to_dict()
-                if self._save_to_file(categorias_dict):
-                    self.logger.info(f"Categoria atualizada: {categoria.nome} (ID: {categoria.id})")
-                    return True
-                
-                self.logger.error(f"Falha ao salvar atualização da categoria: {categoria.nome}")
+        with trava_arquivo(self.lock_path):
+            categorias_dict = self._load_from_file()
+            registro = categoria.to_dict()
+            if categorias_dict.substituir(registro) is None:
+                self.logger.warning(f"Categoria não encontrada para atualização: ID {categoria.id}")
                 return False
+            
+            if self._save_to_file(categorias_dict, [('atualizar', registro)]):
+                self.logger.info(f"Categoria atualizada: {categoria.nome} (ID: {categoria.id})")
+                return True
         
-        self.logger.warning(f"Categoria não encontrada para atualização: ID {categoria.id}")
+        self.logger.error(f"Falha ao salvar atualização da categoria: {categoria.nome}")
         return False
     
+    @sincronizado
     def excluir(self, id):
         """
         Exclui uma categoria pelo ID.
@@ -160,16 +261,113 @@ class CategoriaRepository:
         Returns:
             bool: True se excluída com sucesso, False caso contrário
         """
-        categorias_dict = self._load_from_file()
-        for i, cat in enumerate(categorias_dict):
-            if cat.get('id') == id:
-                del categorias_dict[i]
-                if self._save_to_file(categorias_dict):
-                    self.logger.info(f"Categoria excluída: ID {id}")
-                    return True
-                
-                self.logger.error(f"Falha ao salvar após exclusão da categoria: ID {id}")
+        with trava_arquivo(self.lock_path):
+            categorias_dict = self._load_from_file()
+            removido = categorias_dict.remover(id)
+            if removido is None:
+                self.logger.warning(f"Categoria não encontrada para exclusão: ID {id}")
                 return False
+            
+            if self._save_to_file(categorias_dict, [('excluir', removido)]):
+                self.logger.info(f"Categoria excluída: ID {id}")
+                return True
+        
+        self.logger.error(f"Falha ao salvar após exclusão da categoria: ID {id}")
+        return False
+    
+    @sincronizado
+    def executar_lote(self, operacoes):
+        """
+        Aplica várias operações à coleção de categorias e persiste uma única vez.
+        
+        Args:
+            operacoes (list): Tuplas ('criar', Categoria), ('atualizar', Categoria)
+                              ou ('excluir', id)
+            
+        Returns:
+            list: Resultado de cada operação, na ordem recebida: a categoria
+                  criada (ou None) para 'criar' e True/False para as demais
+            
+        Raises:
+            ValueError: Se alguma operação não for conhecida
+        """
+        for op, _ in operacoes:
+            if op not in ('criar', 'atualizar', 'excluir'):
+                raise ValueError(f"Operação desconhecida: {op}")
         
-        self.logger.warning(f"Categoria não encontrada para exclusão: ID {id}")
-        return False
\ No newline at end of file
+        with trava_arquivo(self.lock_path):
+            categorias_dict = self._load_from_file()
+            quantidade = sum(1 for op, _ in operacoes if op == 'criar')
+            novos_ids = iter(self._reservar_ids(categorias_dict, quantidade))
+            
+            resultados = []
+            alteracoes = []
+            for op, valor in operacoes:
+                if op == 'criar':
+                    valor.id = next(novos_ids)
+                    registro = valor.to_dict()
+                    categorias_dict.inserir(registro)
+                    alteracoes.append(('criar', registro))
+                    resultados.append(valor)
+                elif op == 'atualizar':
+                    registro = valor.to_dict()
+                    if not valor.id or categorias_dict.substituir(registro) is None:
+                        self.logger.warning(f"Categoria não encontrada para atualização: ID {valor.id}")
+                        resultados.append(False)
+                        continue
+                    alteracoes.append(('atualizar', registro))
+                    resultados.append(True)
+                else:
+                    removido = categorias_dict.remover(valor)
+                    if removido is None:
+                        self.logger.warning(f"Categoria não encontrada para exclusão: ID {valor}")
+                        resultados.append(False)
+                        continue
+                    alteracoes.append(('excluir', removido))
+                    resultados.append(True)
+            
+            if alteracoes and not self._save_to_file(categorias_dict, alteracoes):
+                self.logger.error(f"Falha ao salvar lote de categorias: {len(alteracoes)} operações")
+                return [None if op == 'criar' else False for op, _ in operacoes]
+        
+        self.logger.info(f"Lote de categorias aplicado: {len(alteracoes)} de {len(operacoes)} operações")
+        return resultados
+    
+    @sincronizado
+    def criar_em_lote(self, categorias):
+        """
+        Cria várias categorias com uma única gravação.
+        
+        Args:
+            categorias (list): Objetos Categoria a serem criados
+            
+        Returns:
+            list: Categorias criadas com ID atribuído (None onde a gravação falhou)
+        """
+        return self.executar_lote([('criar', categoria) for categoria in categorias])
+    
+    @sincronizado
+    def atualizar_em_lote(self, categorias):
+        """
+        Atualiza várias categorias existentes com uma única gravação.
+        
+        Args:
+            categorias (list): Objetos Categoria a serem atualizados
+            
+        Returns:
+            list: True/False para cada categoria, na ordem recebida
+        """
+        return self.executar_lote([('atualizar', categoria) for categoria in categorias])
+    
+    @sincronizado
+    def excluir_em_lote(self, ids):
+        """
+        Exclui várias categorias com uma única gravação.
+        
+        Args:
+            ids (list): IDs das categorias a serem excluídas
+            
+        Returns:
+            list: True/False para cada ID, na ordem recebida
+        """
+        return self.executar_lote([('excluir', id) for id in ids])
\ No newline at end of file
@@ -0,0 +1,180 @@
+class Colecao:
+    """
+    Conjunto de registros (dicionários) mantido em memória com índice por ID.
+
+    Cada ID aponta para a posição do registro na lista, o que torna busca,
+    atualização e exclusão O(1). Exclusões deixam uma lacuna na posição do
+    registro em vez de deslocar a lista; as lacunas são compactadas quando
+    passam a ocupar metade da lista, preservando a ordem de inserção.
+
+    Índices secundários (objetos com os métodos adicionar(registro) e
+    remover(registro)) são mantidos atualizados a cada escrita. Um índice que
+    também tenha construir(registros) recebe os registros iniciais de uma vez,
+    o que permite montar estruturas ordenadas sem inserções uma a uma.
+    """
+    def __init__(self, registros=(), indices=None):
+        """
+        Inicializa a coleção.
+
+        Args:
+            registros (iterable): Registros iniciais como dicionários
+            indices (dict, optional): Índices secundários por nome
+        """
+        self._registros = []
+        self._posicoes = {}
+        self._lacunas = 0
+        self.indices = indices or {}
+        for registro in registros:
+            id = registro.get('id')
+            if id in self._posicoes:
+                # ID repetido: o último registro prevalece, na posição do primeiro
+                self._registros[self._posicoes[id]] = registro
+            else:
+                self._posicoes[id] = len(self._registros)
+                self._registros.append(registro)
+        for indice in self.indices.values():
+            construir = getattr(indice, 'construir', None)
+            if construir is not None:
+                construir(self._registros)
+            else:
+                for registro in self._registros:
+                    indice.adicionar(registro)
+
+    def __len__(self):
+        return len(self._posicoes)
+
+    def __iter__(self):
+        return (registro for registro in self._registros if registro is not None)
+
+    def __contains__(self, id):
+        return id in self._posicoes
+
+    def registros(self):
+        """
+        Retorna os registros na ordem de inserção.
+
+        Returns:
+            list: Lista de registros como dicionários
+        """
+        return [registro for registro in self._registros if registro is not None]
+
+    def obter(self, id):
+        """
+        Obtém um registro pelo ID.
+
+        Args:
+            id (int): ID do registro
+
+        Returns:
+            dict: Registro encontrado ou None
+        """
+        posicao = self._posicoes.get(id)
+        if posicao is None:
+            return None
+        return self._registros[posicao]
+
+    def obter_varios(self, ids):
+        """
+        Obtém os registros de um conjunto de IDs, na ordem da coleção.
+
+        Args:
+            ids (iterable): IDs dos registros
+
+        Returns:
+            list: Registros encontrados como dicionários
+        """
+        posicoes = sorted(self._posicoes[id] for id in ids if id in self._posicoes)
+        return [self._registros[posicao] for posicao in posicoes]
+
+    def inserir(self, registro):
+        """
+        Insere um registro no fim da coleção. Um registro com ID repetido
+        substitui o anterior.
+
+        Args:
+            registro (dict): Registro a ser inserido
+        """
+        id = registro.get('id')
+        if id in self._posicoes:
+            self.substituir(registro)
+            return
+        self._posicoes[id] = len(self._registros)
+        self._registros.append(registro)
+        try:
+            self._indexar(registro)
+        except Exception:
+            # Um registro que não pôde ser indexado não fica na coleção
+            self._registros.pop()
+            del self._posicoes[id]
+            raise
+
+    def substituir(self, registro):
+        """
+        Substitui um registro existente, mantendo sua posição.
+
+        Args:
+            registro (dict): Novo conteúdo do registro
+
+        Returns:
+            dict: Registro anterior ou None se o ID não existir
+        """
+        posicao = self._posicoes.get(registro.get('id'))
+        if posicao is None:
+            return None
+        anterior = self._registros[posicao]
+        self._registros[posicao] = registro
+        self._desindexar(anterior)
+        try:
+            self._indexar(registro)
+        except Exception:
+            self._registros[posicao] = anterior
+            self._indexar(anterior)
+            raise
+        return anterior
+
+    def remover(self, id):
+        """
+        Remove um registro pelo ID.
+
+        Args:
+            id (int): ID do registro
+
+        Returns:
+            dict: Registro removido ou None se o ID não existir
+        """
+        posicao = self._posicoes.pop(id, None)
+        if posicao is None:
+            return None
+        registro = self._registros[posicao]
+        self._registros[posicao] = None
+        self._lacunas += 1
+        self._desindexar(registro)
+        if self._lacunas > len(self._posicoes):
+            self._compactar()
+        return registro
+
+    def _indexar(self, registro):
+        """
+        Adiciona um registro a todos os índices secundários. Se algum índice
+        falhar, o registro é retirado dos que já o receberam.
+        """
+        indexados = []
+        try:
+            for indice in self.indices.values():
+                indice.adicionar(registro)
+                indexados.append(indice)
+        except Exception:
+            for indice in indexados:
+                indice.remover(registro)
+            raise
+
+    def _desindexar(self, registro):
+        """Remove um registro de todos os índices secundários."""
+        for indice in self.indices.values():
+            indice.remover(registro)
+
+    def _compactar(self):
+        """Remove as lacunas deixadas por exclusões e recalcula as posições."""
+        self._registros = self.registros()
+        self._posicoes = {registro.get('id'): i for i, registro in enumerate(self._registros)}
+        self._lacunas = 0
@@ -1,19 +1,52 @@
-import json
+import heapq
 import os
-from models.contato import Contato
+import threading
+from collections import Counter
+from models.contato import Contato, VisaoContato
 from logger_singleton import Logger
+from repositories.armazenamento import criar_armazenamento, trava_arquivo
+from repositories.cache_arquivo import CacheArquivo, sincronizado
+from repositories.formatos import Codec
+from repositories.colecao import Colecao
+from repositories.sequencia import Sequencia
+from repositories.tabela_colunar import TabelaColunar
+from repositories.normalizacao import (
+    chave_busca, chave_email, chave_telefone, condicao_filtros, termos, termos_telefone, tolerancia
+)
+from repositories.indices import (
+    IndiceCategoria, IndiceExato, IndiceIds, IndiceNomesOrdenados, IndiceTextual, IndiceTrigramas
+)
 
 class ContatoRepository:
-    def __init__(self, data_path='data'):
+    def __init__(self, data_path='data', armazenamento='json', colunar=False, formato='json', compressao=None):
         """
         Inicializa o repositório de contatos.
         
         Args:
             data_path (str): Caminho para o diretório de dados
+            armazenamento (str): Mecanismo de persistência: 'json' regrava o
+                                 arquivo a cada escrita, 'log' acrescenta as
+                                 operações a um log compactado em segundo plano
+            colunar (bool): Mantém também uma TabelaColunar dos contatos, usada
+                            nos filtros e nas contagens filtradas
+            formato (str): Formato do arquivo de dados: 'json' (indentado),
+                           'compacto' ou 'ndjson'
+            compressao (str, optional): Compressão do arquivo: 'zlib' ou 'lzma'
         """
         self.logger = Logger.get_instance()
         self.data_path = data_path
-        self.file_path = os.path.join(data_path, 'contatos.json')
+        self.colunar = colunar
+        self._armazenamento = criar_armazenamento(
+            armazenamento, os.path.join(data_path, 'contatos.json'), 'contatos', self.logger,
+            internar=('nome',), codec=Codec(formato, compressao)
+        )
+        self.file_path = self._armazenamento.file_path
+        # Trava entre processos mantida da leitura à gravação de cada escrita
+        self.lock_path = f"{self.file_path}.escrita.lock"
+        self._cache = CacheArquivo(*self._armazenamento.arquivos())
+        self._sequencia = Sequencia(os.path.join(data_path, 'contatos.seq'))
+        self._lock = threading.RLock()
+        self._escrita = threading.local()
         
         # Cria o diretório de dados se não existir
         if not os.path.exists(data_path):
@@ -22,55 +55,154 @@ class ContatoRepository:
         
         # Cria o arquivo de contatos se não existir
         if not os.path.exists(self.file_path):
-            self._save_to_file([])
+            self._armazenamento.inicializar()
             self.logger.info(f"Arquivo de contatos criado: {self.file_path}")
     
     def _load_from_file(self):
         """
-        Carrega contatos do arquivo JSON.
+        Carrega contatos do armazenamento, reaproveitando o cache em memória
+        enquanto os arquivos não forem alterados.
         
         Returns:
-            list: Lista de contatos como dicionários
+            Colecao: Coleção de contatos indexada por ID
         """
-        try:
-            with open(self.file_path, 'r', encoding='utf-8') as file:
-                return json.load(file)
-        except Exception as e:
-            self.logger.error(f"Erro ao carregar contatos: {str(e)}")
-            return []
+        return self._cache.obter(lambda: self._nova_colecao(self._armazenamento.carregar()))
     
-    def _save_to_file(self, contatos):
+    def _percorrer(self, filtros):
         """
-        Salva contatos no arquivo JSON.
+        Percorre os registros direto do arquivo, sem montar a coleção nem os
+        índices; usado nas exportações quando o cache não está carregado, para
+        que a memória ocupada não dependa do tamanho do arquivo.
         
         Args:
-            contatos (list): Lista de contatos como dicionários
+            filtros (dict): Filtros a aplicar (ver filtrar)
+            
+        Yields:
+            dict: Registros que atendem aos filtros, na ordem da coleção
+        """
+        condicao = condicao_filtros(filtros)
+        return (registro for registro in self._armazenamento.iterar() if condicao(registro))
+    
+    def _nova_colecao(self, registros):
+        """
+        Cria a coleção de contatos com seus índices secundários.
+        
+        Args:
+            registros (list): Lista de contatos como dicionários
+            
+        Returns:
+            Colecao: Coleção indexada de contatos
+        """
+        indices = {
+            'categoria': IndiceCategoria(),
+            'nome': IndiceTrigramas('nome'),
+            'ids': IndiceIds(),
+            'nomes_ordenados': IndiceNomesOrdenados('nome'),
+            'telefone': IndiceExato('telefone', chave_telefone),
+            'email': IndiceExato('email', chave_email),
+            'texto': IndiceTextual({'nome': termos, 'email': termos, 'telefone': termos_telefone})
+        }
+        if self.colunar:
+            indices['colunas'] = TabelaColunar()
+        colecao = Colecao(registros, indices=indices)
+        if self.colunar and not indices['colunas'].completa:
+            self.logger.warning(
+                f"{indices['colunas'].fora} contatos com ID ou categoria não inteiros ficaram fora "
+                "da tabela colunar; os filtros usam os demais índices"
+            )
+        return colecao
+    
+    def _tabela(self, contatos):
+        """
+        Obtém a tabela colunar da coleção, se habilitada e com todos os contatos.
+        
+        Args:
+            contatos (Colecao): Coleção carregada
+            
+        Returns:
+            TabelaColunar: Tabela ou None se não puder ser usada
+        """
+        tabela = contatos.indices.get('colunas')
+        return tabela if tabela is not None and tabela.completa else None
+    
+    def _save_to_file(self, contatos, operacoes):
+        """
+        Persiste as alterações feitas na coleção de contatos.
+        
+        Args:
+            contatos (Colecao): Coleção de contatos já alterada
+            operacoes (list): Tuplas (operação, registro) aplicadas à coleção
             
         Returns:
             bool: True se salvo com sucesso, False caso contrário
         """
-        try:
-            with open(self.file_path, 'w', encoding='utf-8') as file:
-                json.dump(contatos, file, indent=4, ensure_ascii=False)
+        # Chamado com a trava de escrita adquirida: nenhum outro processo
+        # grava entre as duas leituras da versão
+        antes = self._cache.versao()
+        if self._armazenamento.gravar(contatos, operacoes):
+            self._cache.atualizar(contatos)
+            self._escrita.versoes = (antes, self._cache.versao())
             return True
-        except Exception as e:
-            self.logger.error(f"Erro ao salvar contatos: {str(e)}")
-            return False
+        
+        self._cache.invalidar()
+        return False
     
     def _get_next_id(self, contatos):
         """
-        Obtém o próximo ID disponível para um novo contato.
+        Obtém o próximo ID para um novo contato, a partir da sequência persistida.
         
         Args:
-            contatos (list): Lista de contatos atuais
+            contatos (iterable): Contatos atuais como dicionários
             
         Returns:
             int: Próximo ID disponível
         """
-        if not contatos:
-            return 1
-        return max(contato.get('id', 0) for contato in contatos) + 1
+        return self._reservar_ids(contatos, 1)[0]
     
+    def _reservar_ids(self, contatos, quantidade):
+        """
+        Reserva IDs para novos contatos com um único acesso à sequência.
+        Na primeira alocação a sequência parte do maior ID existente, e IDs já
+        ocupados por registros inseridos por fora da aplicação são pulados.
+        
+        Args:
+            contatos (iterable): Contatos atuais como dicionários
+            quantidade (int): Quantidade de IDs a reservar
+            
+        Returns:
+            list: IDs reservados, em ordem crescente
+        """
+        ids = []
+        while len(ids) < quantidade:
+            reservados = self._sequencia.reservar(
+                lambda: max((contato.get('id') or 0 for contato in contatos), default=0),
+                quantidade - len(ids)
+            )
+            ids.extend(id for id in reservados if id not in contatos)
+        return ids
+    
+    def versao(self):
+        """
+        Obtém a versão dos dados de contatos, que muda a cada gravação feita
+        por qualquer processo.
+        
+        Returns:
+            tuple: Assinatura dos arquivos de dados
+        """
+        return self._cache.versao()
+    
+    def versoes_escrita(self):
+        """
+        Obtém as versões dos dados imediatamente antes e depois da última
+        escrita feita pela thread atual, lidas sob a trava da escrita.
+        
+        Returns:
+            tuple: (versão anterior, versão posterior) ou None se a thread
+                   ainda não gravou
+        """
+        return getattr(self._escrita, 'versoes', None)
+    
+    @sincronizado
     def listar_todos(self):
         """
         Lista todos os contatos.
@@ -81,6 +213,38 @@ class ContatoRepository:
         contatos_dict = self._load_from_file()
         return [Contato.from_dict(contato) for contato in contatos_dict]
     
+    @sincronizado
+    def listar_visoes(self):
+        """
+        Lista todos os contatos como visões somente leitura sobre os registros
+        em cache, sem copiá-los; usado pelas listagens que apenas exibem ou
+        serializam os contatos.
+        
+        Returns:
+            list: Lista de objetos VisaoContato
+        """
+        return [VisaoContato(contato) for contato in self._load_from_file()]
+    
+    @sincronizado
+    def listar_pagina(self, limite, apos_id=None):
+        """
+        Lista uma página de contatos em ordem de ID (paginação por cursor).
+        Apenas os contatos da página são convertidos em objetos Contato.
+        
+        Args:
+            limite (int): Quantidade máxima de contatos na página
+            apos_id (int, optional): Cursor; a página começa após este ID
+            
+        Returns:
+            tuple: (lista de objetos Contato, cursor da próxima página ou None)
+        """
+        contatos = self._load_from_file()
+        ids = contatos.indices['ids'].pagina(limite + 1, apos_id)
+        pagina = [Contato.from_dict(contatos.obter(id)) for id in ids[:limite]]
+        proximo = ids[limite - 1] if len(ids) > limite else None
+        return pagina, proximo
+    
+    @sincronizado
     def buscar_por_id(self, id):
         """
         Busca um contato pelo ID.
@@ -91,12 +255,12 @@ class ContatoRepository:
         Returns:
             Contato: Objeto contato encontrado ou None
         """
-        contatos_dict = self._load_from_file()
-        for contato in contatos_dict:
-            if contato.get('id') == id:
-                return Contato.from_dict(contato)
-        return None
+        registro = self._load_from_file().obter(id)
+        if registro is None:
+            return None
+        return Contato.from_dict(registro)
     
+    @sincronizado
     def buscar_por_nome(self, nome):
         """
         Busca contatos pelo nome (parcial).
@@ -108,16 +272,241 @@ class ContatoRepository:
             list: Lista de objetos Contato que correspondem à busca
         """
         contatos_dict = self._load_from_file()
-        resultados = []
         
-        # Busca case-insensitive
-        nome_lower = nome.lower()
-        for contato in contatos_dict:
-            if nome_lower in contato.get('nome', '').lower():
-                resultados.append(Contato.from_dict(contato))
+        # Busca case-insensitive pelo índice de trigramas
+        ids = contatos_dict.indices['nome'].buscar(nome)
+        return [Contato.from_dict(contato) for contato in contatos_dict.obter_varios(ids)]
+    
+    @sincronizado
+    def filtrar(self, filtros):
+        """
+        Busca contatos que atendem a todos os filtros informados.
+        
+        Cada filtro é resolvido pelo seu índice. Os conjuntos de IDs são
+        intersectados do mais seletivo para o menos seletivo; o filtro por
+        nome, quando não é o mais seletivo, é apenas verificado contra os
+        candidatos restantes.
         
-        return resultados
+        Args:
+            filtros (dict): Filtros a aplicar, entre 'nome', 'categoria_id',
+                            'telefone' e 'email' (categoria_id None seleciona
+                            os contatos sem categoria)
+            
+        Returns:
+            list: Lista de objetos Contato, na ordem da coleção
+        """
+        contatos = self._load_from_file()
+        return [Contato.from_dict(contato) for contato in self._selecionar(contatos, filtros)]
+    
+    @sincronizado
+    def filtrar_pagina(self, filtros, limite, apos_id=None):
+        """
+        Lista uma página, em ordem de ID, dos contatos que atendem aos
+        filtros (paginação por cursor). Os filtros são resolvidos como em
+        filtrar, mas apenas os contatos da página são convertidos em objetos
+        Contato.
+        
+        Args:
+            filtros (dict): Filtros aceitos por filtrar
+            limite (int): Quantidade máxima de contatos na página
+            apos_id (int, optional): Cursor; a página começa após este ID
+            
+        Returns:
+            tuple: (lista de objetos Contato, cursor da próxima página ou None)
+        """
+        contatos = self._load_from_file()
+        ids = self._ids_selecionados(contatos, filtros)
+        if ids is None:
+            ids = contatos.indices['ids'].pagina(limite + 1, apos_id)
+        else:
+            ids = heapq.nsmallest(limite + 1, (id for id in ids if apos_id is None or id > apos_id))
+        pagina = [Contato.from_dict(contatos.obter(id)) for id in ids[:limite]]
+        proximo = ids[limite - 1] if len(ids) > limite else None
+        return pagina, proximo
+    
+    def _selecionar(self, contatos, filtros):
+        """
+        Resolve os filtros pelos índices da coleção (ver filtrar).
+        
+        Args:
+            contatos (Colecao): Coleção carregada
+            filtros (dict): Filtros a aplicar
+            
+        Returns:
+            list: Registros que atendem aos filtros, na ordem da coleção
+        """
+        ids = self._ids_selecionados(contatos, filtros)
+        if ids is None:
+            return contatos.registros()
+        return contatos.obter_varios(ids)
+    
+    def _ids_selecionados(self, contatos, filtros):
+        """
+        Obtém os IDs dos contatos que atendem aos filtros. Com a tabela
+        colunar, a seleção é feita sobre as colunas inteiras; sem ela, pelos
+        índices da coleção (ver filtrar).
+        
+        Args:
+            contatos (Colecao): Coleção carregada
+            filtros (dict): Filtros a aplicar
+            
+        Returns:
+            set: IDs selecionados ou None se não houver filtros
+        """
+        if not filtros:
+            return None
+        tabela = self._tabela(contatos)
+        if tabela is not None:
+            return set(tabela.ids_selecionados(tabela.selecionar(filtros)))
+        
+        indices = contatos.indices
+        
+        # (estimativa de tamanho, IDs já calculados ou None para o nome)
+        criterios = []
+        if 'categoria_id' in filtros:
+            ids = indices['categoria'].buscar(filtros['categoria_id'])
+            criterios.append((len(ids), ids))
+        if 'telefone' in filtros:
+            ids = indices['telefone'].buscar(filtros['telefone'])
+            criterios.append((len(ids), ids))
+        if 'email' in filtros:
+            ids = indices['email'].buscar(filtros['email'])
+            criterios.append((len(ids), ids))
+        if 'nome' in filtros:
+            criterios.append((indices['nome'].estimativa(filtros['nome']), None))
+        
+        if not criterios:
+            return None
+        
+        criterios.sort(key=lambda criterio: criterio[0])
+        resultado = None
+        for _, ids in criterios:
+            if ids is None:
+                nome = filtros['nome']
+                ids = indices['nome'].buscar(nome) if resultado is None else indices['nome'].restringir(resultado, nome)
+                resultado = ids
+            else:
+                resultado = set(ids) if resultado is None else resultado & ids
+            if not resultado:
+                return set()
+        return resultado
+    
+    def iterar_registros(self, filtros=None):
+        """
+        Percorre os contatos como dicionários, um por vez, para exportações.
+        
+        Com o cache carregado, os filtros são resolvidos pelos índices e os
+        registros são lidos da memória; caso contrário o arquivo é percorrido
+        incrementalmente e a memória ocupada não depende do seu tamanho.
+        
+        Args:
+            filtros (dict, optional): Filtros a aplicar (ver filtrar)
+            
+        Yields:
+            dict: Cada contato que atende aos filtros, na ordem da coleção
+        """
+        filtros = filtros or {}
+        with self._lock:
+            contatos = self._cache.atual()
+            # A lista guarda apenas referências: os registros em cache são
+            # substituídos, nunca alterados, pelas escritas seguintes
+            registros = self._percorrer(filtros) if contatos is None else self._selecionar(contatos, filtros)
+        for registro in registros:
+            yield VisaoContato(registro).to_dict()
+    
+    @sincronizado
+    def pesquisar_texto(self, termos, pontuacoes_categorias=None, limite=20):
+        """
+        Busca textual em nome, email e telefone, ordenada por relevância.
+        
+        Args:
+            termos (list): Termos da consulta, já normalizados
+            pontuacoes_categorias (dict, optional): Relevância de cada categoria
+                                                    para a consulta, somada à
+                                                    dos seus contatos
+            limite (int): Quantidade máxima de resultados
+            
+        Returns:
+            list: Pares (Contato, pontuação) do mais para o menos relevante
+        """
+        contatos = self._load_from_file()
+        pontuacoes = contatos.indices['texto'].pontuar(termos)
+        for categoria_id, pontuacao in (pontuacoes_categorias or {}).items():
+            for id in contatos.indices['categoria'].buscar(categoria_id):
+                pontuacoes[id] = pontuacoes.get(id, 0.0) + pontuacao
+        
+        melhores = heapq.nlargest(limite, pontuacoes.items(), key=lambda item: (item[1], -item[0]))
+        return [(Contato.from_dict(contatos.obter(id)), pontuacao) for id, pontuacao in melhores]
+    
+    @sincronizado
+    def buscar_aproximado(self, termo, limite=10, filtros=None):
+        """
+        Busca contatos cujo nome se aproxima do termo, tolerando erros de
+        digitação, do mais parecido para o menos parecido. Os demais filtros
+        restringem os candidatos antes da seleção dos `limite` melhores.
+        
+        Args:
+            termo (str): Nome ou parte do nome, possivelmente com erros
+            limite (int): Quantidade máxima de contatos
+            filtros (dict, optional): Filtros aceitos por filtrar, exceto o nome
+            
+        Returns:
+            list: Lista de objetos Contato
+        """
+        contatos = self._load_from_file()
+        permitidos = self._ids_selecionados(contatos, filtros or {})
+        resultados = contatos.indices['nome'].buscar_aproximado(
+            termo, tolerancia(chave_busca(termo)), limite, permitidos
+        )
+        return [Contato.from_dict(contatos.obter(id)) for _, id in resultados[:limite]]
     
+    @sincronizado
+    def autocompletar(self, prefixo, limite=10):
+        """
+        Busca contatos cujo nome começa com o prefixo, em ordem alfabética.
+        
+        Args:
+            prefixo (str): Início do nome
+            limite (int): Quantidade máxima de contatos
+            
+        Returns:
+            list: Lista de objetos Contato
+        """
+        contatos = self._load_from_file()
+        ids = contatos.indices['nomes_ordenados'].prefixo(prefixo, limite)
+        return [Contato.from_dict(contatos.obter(id)) for id in ids]
+    
+    @sincronizado
+    def buscar_por_telefone(self, telefone):
+        """
+        Busca contatos pelo telefone, ignorando a formatação.
+        
+        Args:
+            telefone (str): Telefone em qualquer formato
+            
+        Returns:
+            list: Lista de objetos Contato com o telefone
+        """
+        contatos = self._load_from_file()
+        ids = contatos.indices['telefone'].buscar(telefone)
+        return [Contato.from_dict(contato) for contato in contatos.obter_varios(ids)]
+    
+    @sincronizado
+    def buscar_por_email(self, email):
+        """
+        Busca contatos pelo email exato, sem diferenciar maiúsculas.
+        
+        Args:
+            email (str): Email a ser buscado
+            
+        Returns:
+            list: Lista de objetos Contato com o email
+        """
+        contatos = self._load_from_file()
+        ids = contatos.indices['email'].buscar(email)
+        return [Contato.from_dict(contato) for contato in contatos.obter_varios(ids)]
+    
+    @sincronizado
     def buscar_por_categoria(self, categoria_id):
         """
         Busca contatos por categoria.
@@ -129,45 +518,93 @@ class ContatoRepository:
             list: Lista de objetos Contato que pertencem à categoria
         """
         contatos_dict = self._load_from_file()
-        resultados = []
+        ids = contatos_dict.indices['categoria'].buscar(categoria_id)
+        return [Contato.from_dict(contato) for contato in contatos_dict.obter_varios(ids)]
+    
+    @sincronizado
+    def contar_por_categoria(self, filtros=None):
+        """
+        Conta os contatos de cada categoria, opcionalmente apenas entre os
+        que atendem aos filtros.
         
-        for contato in contatos_dict:
-            if contato.get('categoria_id') == categoria_id:
-                resultados.append(Contato.from_dict(contato))
+        Sem filtros, as contagens vêm do índice de categorias, sem percorrer
+        os contatos. Com filtros, a tabela colunar (quando habilitada e
+        completa) calcula a seleção e a contagem sobre colunas inteiras; sem
+        ela, os contatos filtrados são contados um a um.
         
-        return resultados
+        Args:
+            filtros (dict, optional): Filtros aceitos por filtrar
+            
+        Returns:
+            dict: Quantidade de contatos indexada pelo ID da categoria
+                  (contatos sem categoria ficam na chave None)
+        """
+        contatos = self._load_from_file()
+        if not filtros:
+            return contatos.indices['categoria'].contagens()
+        
+        tabela = self._tabela(contatos)
+        if tabela is not None:
+            return tabela.contar_por_categoria(tabela.selecionar(filtros))
+        return dict(Counter(contato.categoria_id for contato in self.filtrar(filtros)))
     
-    def criar(self, contato):
+    def _email_em_uso(self, contatos, contato):
+        """
+        Verifica, pelo índice de emails, se outro contato já usa o email.
+        Chamado dentro da escrita, com as travas adquiridas, para que nenhuma
+        gravação aconteça entre a verificação e a escrita.
+        
+        Args:
+            contatos (Colecao): Coleção de contatos atual
+            contato (Contato): Contato a ser gravado
+            
+        Returns:
+            bool: True se o email pertence a outro contato
+        """
+        if contatos.indices['email'].buscar(contato.email) - {contato.id}:
+            self.logger.warning(f"Email já cadastrado, contato recusado: {contato.email}")
+            return True
+        return False
+    
+    @sincronizado
+    def criar(self, contato, emails_unicos=False):
         """
         Cria um novo contato.
         
         Args:
             contato (Contato): Objeto contato a ser criado
+            emails_unicos (bool): Recusa o contato se outro já usar o email
             
         Returns:
-            Contato: Contato criado com ID atribuído
+            Contato: Contato criado com ID atribuído ou None se falhar
         """
-        contatos_dict = self._load_from_file()
-        
-        # Atribui um novo ID
-        novo_id = self._get_next_id(contatos_dict)
-        contato.id = novo_id
-        
-        # Adiciona à lista e salva
-        contatos_dict.append(contato.to_dict())
-        if self._save_to_file(contatos_dict):
-            self.logger.info(f"Contato criado: {contato.nome} (ID: {contato.id})")
-            return contato
+        with trava_arquivo(self.lock_path):
+            contatos_dict = self._load_from_file()
+            if emails_unicos and self._email_em_uso(contatos_dict, contato):
+                return None
+            
+            # Atribui um novo ID
+            novo_id = self._get_next_id(contatos_dict)
+            contato.id = novo_id
+            
+            # Adiciona à lista e salva
+            registro = contato.to_dict()
+            contatos_dict.inserir(registro)
+            if self._save_to_file(contatos_dict, [('criar', registro)]):
+                self.logger.info(f"Contato criado: {contato.nome} (ID: {contato.id})")
+                return contato
         
         self.logger.error(f"Falha ao criar contato: {contato.nome}")
         return None
     
-    def atualizar(self, contato):
+    @sincronizado
+    def atualizar(self, contato, emails_unicos=False):
         """
         Atualiza um contato existente.
         
         Args:
             contato (Contato): Objeto contato a ser atualizado
+            emails_unicos (bool): Recusa a alteração se outro contato já usar o email
             
         Returns:
             bool: True se atualizado com sucesso, False caso contrário
@@ -176,20 +613,23 @@ class ContatoRepository:
             self.logger.error("Tentativa de atualizar contato sem ID")
             return False
         
-        contatos_dict = self._load_from_file()
-        for i, contact in enumerate(contatos_dict):
-            if contact.get('id') == contato.id:
-                contatos_dict[i] = contato.to_dict()
-                if self._save_to_file(contatos_dict):
-                    self.logger.info(f"Contato atualizado: {contato.nome} (ID: {contato.id})")
-                    return True
-                
-                self.logger.error(f"Falha ao salvar atualização do contato: {contato.nome}")
+        with trava_arquivo(self.lock_path):
+            contatos_dict = self._load_from_file()
+            if emails_unicos and self._email_em_uso(contatos_dict, contato):
                 return False
+            registro = contato.to_dict()
+            if contatos_dict.substituir(registro) is None:
+                self.logger.warning(f"Contato não encontrado para atualização: ID {contato.id}")
+                return False
+            
+            if self._save_to_file(contatos_dict, [('atualizar', registro)]):
+                self.logger.info(f"Contato atualizado: {contato.nome} (ID: {contato.id})")
+                return True
         
-        self.logger.warning(f"Contato não encontrado para atualização: ID {contato.id}")
+        self.logger.error(f"Falha ao salvar atualização do contato: {contato.nome}")
         return False
     
+    @sincronizado
     def excluir(self, id):
         """
         Exclui um contato pelo ID.
@@ -200,16 +640,122 @@ class ContatoRepository:
         Returns:
             bool: True se excluído com sucesso, False caso contrário
         """
-        contatos_dict = self._load_from_file()
-        for i, contato in enumerate(contatos_dict):
-            if contato.get('id') == id:
-                del contatos_dict[i]
-                if self._save_to_file(contatos_dict):
-                    self.logger.info(f"Contato excluído: ID {id}")
-                    return True
-                
-                self.logger.error(f"Falha ao salvar após exclusão do contato: ID {id}")
+        with trava_arquivo(self.lock_path):
+            contatos_dict = self._load_from_file()
+            removido = contatos_dict.remover(id)
+            if removido is None:
+                self.logger.warning(f"Contato não encontrado para exclusão: ID {id}")
                 return False
+            
+            if self._save_to_file(contatos_dict, [('excluir', removido)]):
+                self.logger.info(f"Contato excluído: ID {id}")
+                return True
+        
+        self.logger.error(f"Falha ao salvar após exclusão do contato: ID {id}")
+        return False
+    
+    @sincronizado
+    def executar_lote(self, operacoes, emails_unicos=False):
+        """
+        Aplica várias operações à coleção de contatos e persiste uma única vez.
+        
+        Args:
+            operacoes (list): Tuplas ('criar', Contato), ('atualizar', Contato)
+                              ou ('excluir', id)
+            emails_unicos (bool): Recusa criações e atualizações cujo email já
+                                  pertence a outro contato, inclusive a um
+                                  gravado antes no mesmo lote
+            
+        Returns:
+            list: Resultado de cada operação, na ordem recebida: o contato
+                  criado (ou None) para 'criar' e True/False para as demais
+            
+        Raises:
+            ValueError: Se alguma operação não for conhecida
+        """
+        for op, _ in operacoes:
+            if op not in ('criar', 'atualizar', 'excluir'):
+                raise ValueError(f"Operação desconhecida: {op}")
+        
+        # A trava entre processos cobre leitura, verificação dos emails e
+        # gravação: outro processo não pode gravar entre elas
+        with trava_arquivo(self.lock_path):
+            contatos_dict = self._load_from_file()
+            quantidade = sum(1 for op, _ in operacoes if op == 'criar')
+            novos_ids = iter(self._reservar_ids(contatos_dict, quantidade))
+            
+            resultados = []
+            alteracoes = []
+            for op, valor in operacoes:
+                if op != 'excluir' and emails_unicos and self._email_em_uso(contatos_dict, valor):
+                    resultados.append(None if op == 'criar' else False)
+                elif op == 'criar':
+                    valor.id = next(novos_ids)
+                    registro = valor.to_dict()
+                    contatos_dict.inserir(registro)
+                    alteracoes.append(('criar', registro))
+                    resultados.append(valor)
+                elif op == 'atualizar':
+                    registro = valor.to_dict()
+                    if not valor.id or contatos_dict.substituir(registro) is None:
+                        self.logger.warning(f"Contato não encontrado para atualização: ID {valor.id}")
+                        resultados.append(False)
+                        continue
+                    alteracoes.append(('atualizar', registro))
+                    resultados.append(True)
+                else:
+                    removido = contatos_dict.remover(valor)
+                    if removido is None:
+                        self.logger.warning(f"Contato não encontrado para exclusão: ID {valor}")
+                        resultados.append(False)
+                        continue
+                    alteracoes.append(('excluir', removido))
+                    resultados.append(True)
+            
+            if alteracoes and not self._save_to_file(contatos_dict, alteracoes):
+                self.logger.error(f"Falha ao salvar lote de contatos: {len(alteracoes)} operações")
+                return [None if op == 'criar' else False for op, _ in operacoes]
+        
+        self.logger.info(f"Lote de contatos aplicado: {len(alteracoes)} de {len(operacoes)} operações")
+        return resultados
+    
+    @sincronizado
+    def criar_em_lote(self, contatos, emails_unicos=False):
+        """
+        Cria vários contatos com uma única gravação.
+        
+        Args:
+            contatos (list): Objetos Contato a serem criados
+            emails_unicos (bool): Recusa contatos cujo email já esteja em uso
+            
+        Returns:
+            list: Contatos criados com ID atribuído (None onde a gravação falhou)
+        """
+        return self.executar_lote([('criar', contato) for contato in contatos], emails_unicos)
+    
+    @sincronizado
+    def atualizar_em_lote(self, contatos, emails_unicos=False):
+        """
+        Atualiza vários contatos existentes com uma única gravação.
+        
+        Args:
+            contatos (list): Objetos Contato a serem atualizados
+            emails_unicos (bool): Recusa alterações para um email já em uso
+            
+        Returns:
+            list: True/False para cada contato, na ordem recebida
+        """
+        return self.executar_lote([('atualizar', contato) for contato in contatos], emails_unicos)
+    
+    @sincronizado
+    def excluir_em_lote(self, ids):
+        """
+        Exclui vários contatos com uma única gravação.
         
-        self.logger.warning(f"Contato não encontrado para exclusão: ID {id}")
-        return False
\ No newline at end of file
+        Args:
+            ids (list): IDs dos contatos a serem excluídos
+            
+        Returns:
+            list: True/False para cada ID, na ordem recebida
+        """
+        return self.executar_lote([('excluir', id) for id in ids])
\ No newline at end of file
@@ -0,0 +1,139 @@
+import os
+import threading
+from repositories.contato_repository import ContatoRepository
+from repositories.categoria_repository import CategoriaRepository
+from repositories.mmap_contato_repository import MmapContatoRepository, TAMANHO_CACHE
+from repositories.sqlite_contato_repository import SqliteContatoRepository
+from repositories.sqlite_categoria_repository import SqliteCategoriaRepository
+
+# Repositórios compartilhados pelos serviços do processo, por configuração
+_compartilhados = {}
+_trava_compartilhados = threading.Lock()
+
+
+def _configuracao():
+    """
+    Lê a configuração de persistência das variáveis de ambiente.
+
+    AGENDA_BACKEND escolhe entre 'json' (padrão), 'sqlite' e 'mmap';
+    AGENDA_ARMAZENAMENTO escolhe o mecanismo do backend JSON ('json' ou 'log');
+    AGENDA_DATA_PATH define o diretório de dados (padrão 'data').
+
+    Returns:
+        tuple: (backend, armazenamento, data_path)
+    """
+    return (
+        os.environ.get('AGENDA_BACKEND', 'json'),
+        os.environ.get('AGENDA_ARMAZENAMENTO', 'json'),
+        os.environ.get('AGENDA_DATA_PATH', 'data')
+    )
+
+
+def _formato():
+    """
+    Lê o formato dos arquivos do backend JSON das variáveis de ambiente.
+
+    AGENDA_FORMATO escolhe entre 'json' (padrão, indentado), 'compacto' e
+    'ndjson'; AGENDA_COMPRESSAO habilita a compressão ('zlib' ou 'lzma').
+
+    Returns:
+        dict: Argumentos formato e compressao dos repositórios JSON
+    """
+    return {
+        'formato': os.environ.get('AGENDA_FORMATO', 'json'),
+        'compressao': os.environ.get('AGENDA_COMPRESSAO') or None
+    }
+
+
+def criar_contato_repository():
+    """
+    Cria o repositório de contatos conforme a configuração.
+
+    No backend JSON, AGENDA_TABELA_COLUNAR=1 habilita a tabela colunar
+    usada nos filtros e nas contagens filtradas e AGENDA_FORMATO e
+    AGENDA_COMPRESSAO definem o formato do arquivo. No backend mmap,
+    AGENDA_CACHE_CONTATOS limita os contatos desserializados em memória. Nos
+    backends sqlite e mmap, AGENDA_ARMAZENAMENTO, AGENDA_FORMATO e
+    AGENDA_COMPRESSAO indicam de onde os dados do backend JSON são importados
+    na primeira execução.
+
+    Returns:
+        ContatoRepository, SqliteContatoRepository ou MmapContatoRepository
+
+    Raises:
+        ValueError: Se o backend configurado não for conhecido
+    """
+    backend, armazenamento, data_path = _configuracao()
+    if backend == 'sqlite':
+        return SqliteContatoRepository(data_path, armazenamento=armazenamento, **_formato())
+    if backend == 'json':
+        colunar = os.environ.get('AGENDA_TABELA_COLUNAR', '0') in ('1', 'true')
+        return ContatoRepository(data_path, armazenamento=armazenamento, colunar=colunar, **_formato())
+    if backend == 'mmap':
+        tamanho_cache = int(os.environ.get('AGENDA_CACHE_CONTATOS', TAMANHO_CACHE))
+        return MmapContatoRepository(data_path, tamanho_cache=tamanho_cache, armazenamento=armazenamento, **_formato())
+    raise ValueError(f"Backend desconhecido: {backend}")
+
+
+def criar_categoria_repository():
+    """
+    Cria o repositório de categorias conforme a configuração.
+
+    O backend mmap mantém as categorias, que são poucas, no backend JSON.
+
+    Returns:
+        CategoriaRepository ou SqliteCategoriaRepository
+
+    Raises:
+        ValueError: Se o backend configurado não for conhecido
+    """
+    backend, armazenamento, data_path = _configuracao()
+    if backend == 'sqlite':
+        return SqliteCategoriaRepository(data_path, armazenamento=armazenamento, **_formato())
+    if backend in ('json', 'mmap'):
+        return CategoriaRepository(data_path, armazenamento=armazenamento, **_formato())
+    raise ValueError(f"Backend desconhecido: {backend}")
+
+
+def _compartilhado(colecao, criar):
+    """
+    Obtém o repositório compartilhado de uma coleção, criando-o na primeira
+    chamada para a configuração atual.
+
+    Args:
+        colecao (str): Nome da coleção
+        criar (callable): Função que cria o repositório
+
+    Returns:
+        O repositório compartilhado
+    """
+    chave = (colecao, _configuracao(), tuple(_formato().values()))
+    with _trava_compartilhados:
+        if chave not in _compartilhados:
+            _compartilhados[chave] = criar()
+        return _compartilhados[chave]
+
+
+def obter_contato_repository():
+    """
+    Obtém o repositório de contatos compartilhado pelos serviços do processo.
+
+    Todos os serviços usam a mesma instância, para que o cache e os índices
+    em memória existam uma única vez e sejam atualizados pelas escritas de
+    qualquer serviço, em vez de recarregados.
+
+    Returns:
+        O repositório criado por criar_contato_repository
+    """
+    return _compartilhado('contatos', criar_contato_repository)
+
+
+def obter_categoria_repository():
+    """
+    Obtém o repositório de categorias compartilhado pelos serviços do processo
+    (ver obter_contato_repository).
+
+    Returns:
+        O repositório criado por criar_categoria_repository
+    """
+    return _compartilhado('categorias', criar_categoria_repository)
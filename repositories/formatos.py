@@ -0,0 +1,164 @@
+import gzip
+import json
+import lzma
+import os
+from functools import partial
+from repositories.leitor_json import ler_registros
+
+
+class FormatoJson:
+    """
+    Registros gravados como um único array JSON.
+    """
+    extensao = '.json'
+
+    def __init__(self, indent=None):
+        """
+        Inicializa o formato.
+
+        Args:
+            indent (int, optional): Indentação da saída; None grava o JSON
+                                    compacto, sem espaços entre os elementos
+        """
+        self.indent = indent
+        self.separadores = None if indent is not None else (',', ':')
+
+    def escrever(self, arquivo, registros):
+        """Grava a lista de registros como um array JSON."""
+        json.dump(registros, arquivo, indent=self.indent, separators=self.separadores, ensure_ascii=False)
+
+    def ler(self, arquivo):
+        """Lê o array inteiro de uma vez."""
+        return json.load(arquivo)
+
+    def iterar(self, arquivo):
+        """Lê os elementos do array incrementalmente."""
+        return ler_registros(arquivo)
+
+
+class FormatoNdjson:
+    """
+    Registros gravados um por linha (JSON delimitado por linhas).
+    """
+    extensao = '.jsonl'
+
+    def escrever(self, arquivo, registros):
+        """Grava cada registro em uma linha."""
+        arquivo.writelines(
+            json.dumps(registro, separators=(',', ':'), ensure_ascii=False) + '\n'
+            for registro in registros
+        )
+
+    def ler(self, arquivo):
+        """Lê todas as linhas de uma vez."""
+        return list(self.iterar(arquivo))
+
+    def iterar(self, arquivo):
+        """Lê as linhas uma a uma, ignorando as vazias."""
+        return (json.loads(linha) for linha in arquivo if linha.strip())
+
+
+FORMATOS = {
+    'json': FormatoJson(indent=4),
+    'compacto': FormatoJson(),
+    'ndjson': FormatoNdjson()
+}
+
+# Função que abre o arquivo e sufixo acrescentado à extensão de cada compressão;
+# 'zlib' usa o contêiner gzip, que acrescenta cabeçalho e checksum ao DEFLATE
+COMPRESSOES = {
+    None: (open, ''),
+    'zlib': (partial(gzip.open, compresslevel=6), '.gz'),
+    'lzma': (lzma.open, '.xz')
+}
+
+
+class Codec:
+    """
+    Formato em disco de um arquivo de dados: a serialização dos registros e,
+    opcionalmente, a compressão do arquivo.
+
+    Os formatos 'json' (indentado) e 'compacto' gravam o mesmo arquivo .json e
+    leem um ao outro; 'ndjson' grava .jsonl. A compressão acrescenta .gz ou
+    .xz à extensão.
+    """
+    def __init__(self, formato='json', compressao=None):
+        """
+        Inicializa o codec.
+
+        Args:
+            formato (str): 'json', 'compacto' ou 'ndjson'
+            compressao (str, optional): None, 'zlib' ou 'lzma'
+
+        Raises:
+            ValueError: Se o formato ou a compressão não forem conhecidos
+        """
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato desconhecido: {formato}")
+        if compressao not in COMPRESSOES:
+            raise ValueError(f"Compressão desconhecida: {compressao}")
+        self.formato = FORMATOS[formato]
+        self._abrir, sufixo = COMPRESSOES[compressao]
+        self.extensao = self.formato.extensao + sufixo
+
+    def caminho(self, file_path):
+        """
+        Obtém o caminho do arquivo neste formato.
+
+        Args:
+            file_path (str): Caminho do arquivo com qualquer extensão
+
+        Returns:
+            str: Caminho com a extensão do codec
+        """
+        return os.path.splitext(file_path)[0] + self.extensao
+
+    def abrir(self, caminho, modo):
+        """
+        Abre o arquivo em modo texto, comprimindo ou descomprimindo conforme o codec.
+
+        Args:
+            caminho (str): Caminho do arquivo
+            modo (str): 'r' ou 'w'
+
+        Returns:
+            file: Arquivo aberto
+        """
+        return self._abrir(caminho, modo + 't', encoding='utf-8')
+
+    def escrever(self, arquivo, registros):
+        """
+        Serializa os registros no arquivo aberto.
+
+        Args:
+            arquivo (file): Arquivo aberto por abrir(caminho, 'w')
+            registros (iterable): Registros como dicionários
+        """
+        self.formato.escrever(arquivo, registros)
+
+    def ler(self, arquivo):
+        """
+        Lê todos os registros do arquivo aberto.
+
+        Args:
+            arquivo (file): Arquivo aberto por abrir(caminho, 'r')
+
+        Returns:
+            list: Registros como dicionários
+        """
+        return self.formato.ler(arquivo)
+
+    def iterar(self, arquivo):
+        """
+        Lê os registros do arquivo aberto, um por vez.
+
+        Args:
+            arquivo (file): Arquivo aberto por abrir(caminho, 'r')
+
+        Returns:
+            iterator: Registros como dicionários
+        """
+        return self.formato.iterar(arquivo)
+
+
+CODEC_PADRAO = Codec()
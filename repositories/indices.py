@@ -0,0 +1,637 @@
+import bisect
+import math
+import sys
+from types import MappingProxyType
+from repositories.normalizacao import chave_busca, distancia_trecho, partes_termo
+
+
+class IndiceCategoria:
+    """
+    Índice secundário que associa cada categoria aos IDs dos seus contatos.
+
+    Permite filtrar por categoria em O(resultados) e obter a quantidade de
+    contatos de cada categoria sem percorrer a coleção.
+    """
+    def __init__(self):
+        """Inicializa o índice vazio."""
+        self._ids = {}
+
+    def adicionar(self, registro):
+        """
+        Indexa um registro.
+
+        Args:
+            registro (dict): Registro do contato
+        """
+        self._ids.setdefault(registro.get('categoria_id'), set()).add(registro.get('id'))
+
+    def remover(self, registro):
+        """
+        Remove um registro do índice.
+
+        Args:
+            registro (dict): Registro do contato
+        """
+        categoria_id = registro.get('categoria_id')
+        ids = self._ids.get(categoria_id)
+        if ids is None:
+            return
+        ids.discard(registro.get('id'))
+        if not ids:
+            del self._ids[categoria_id]
+
+    def buscar(self, categoria_id):
+        """
+        Obtém os IDs dos contatos de uma categoria.
+
+        Args:
+            categoria_id (int): ID da categoria
+
+        Returns:
+            set: IDs dos contatos da categoria
+        """
+        return self._ids.get(categoria_id, set())
+
+    def contagens(self):
+        """
+        Obtém a quantidade de contatos por categoria.
+
+        Returns:
+            dict: Quantidade de contatos indexada pelo ID da categoria
+        """
+        return {categoria_id: len(ids) for categoria_id, ids in self._ids.items()}
+
+
+class IndiceExato:
+    """
+    Índice secundário que associa a chave normalizada de um campo aos IDs
+    dos registros, para buscas por igualdade em O(1).
+    """
+    def __init__(self, campo, normalizar):
+        """
+        Inicializa o índice vazio.
+
+        Args:
+            campo (str): Nome do campo indexado
+            normalizar (callable): Função que calcula a chave de um valor
+        """
+        self.campo = campo
+        self.normalizar = normalizar
+        self._chaves = {}
+        self._ids = {}
+
+    def adicionar(self, registro):
+        """
+        Indexa um registro. Registros cuja chave é vazia não são indexados.
+
+        Args:
+            registro (dict): Registro a ser indexado
+        """
+        chave = self.normalizar(registro.get(self.campo))
+        if not chave:
+            return
+        id = registro.get('id')
+        self._chaves[id] = chave
+        self._ids.setdefault(chave, set()).add(id)
+
+    def remover(self, registro):
+        """
+        Remove um registro do índice.
+
+        Args:
+            registro (dict): Registro a ser removido
+        """
+        id = registro.get('id')
+        chave = self._chaves.pop(id, None)
+        if chave is None:
+            return
+        ids = self._ids[chave]
+        ids.discard(id)
+        if not ids:
+            del self._ids[chave]
+
+    def buscar(self, valor):
+        """
+        Obtém os IDs dos registros cujo campo equivale ao valor.
+
+        Args:
+            valor (str): Valor buscado
+
+        Returns:
+            set: IDs dos registros encontrados
+        """
+        return self._ids.get(self.normalizar(valor), set())
+
+
+class IndiceTrigramas:
+    """
+    Índice invertido de trigramas para busca por substring sem diferenciar
+    maiúsculas de minúsculas nem acentos.
+
+    A chave de busca de cada registro é calculada uma única vez, na escrita.
+    Uma consulta intersecta as listas de IDs dos trigramas do termo, começando
+    pela menor, e só então confirma os candidatos com o teste de substring.
+    """
+    TAMANHO = 3
+
+    def __init__(self, campo):
+        """
+        Inicializa o índice vazio.
+
+        Args:
+            campo (str): Nome do campo indexado
+        """
+        self.campo = campo
+        self._chaves = {}
+        self._postings = {}
+
+    def _normalizar(self, texto):
+        """Calcula a chave de busca de um texto."""
+        return chave_busca(texto)
+
+    def _trigramas(self, chave):
+        """Retorna o conjunto de trigramas de uma chave."""
+        return {chave[i:i + self.TAMANHO] for i in range(len(chave) - self.TAMANHO + 1)}
+
+    def adicionar(self, registro):
+        """
+        Indexa um registro.
+
+        Args:
+            registro (dict): Registro a ser indexado
+        """
+        id = registro.get('id')
+        chave = self._normalizar(registro.get(self.campo))
+        self._chaves[id] = chave
+        for trigrama in self._trigramas(chave):
+            self._postings.setdefault(trigrama, set()).add(id)
+
+    def remover(self, registro):
+        """
+        Remove um registro do índice.
+
+        Args:
+            registro (dict): Registro a ser removido
+        """
+        id = registro.get('id')
+        chave = self._chaves.pop(id, None)
+        if chave is None:
+            return
+        for trigrama in self._trigramas(chave):
+            ids = self._postings.get(trigrama)
+            if ids is not None:
+                ids.discard(id)
+                if not ids:
+                    del self._postings[trigrama]
+
+    def buscar(self, termo):
+        """
+        Busca os registros cujo campo contém o termo.
+
+        Args:
+            termo (str): Texto a ser buscado
+
+        Returns:
+            set: IDs dos registros encontrados
+        """
+        return self._contendo(self._normalizar(termo))
+
+    def _contendo(self, chave):
+        """
+        Obtém os registros cuja chave contém o trecho informado.
+
+        Args:
+            chave (str): Trecho já normalizado
+
+        Returns:
+            set: IDs dos registros encontrados
+        """
+        trigramas = self._trigramas(chave)
+        if not trigramas:
+            # Trechos menores que um trigrama são verificados contra as chaves
+            # já normalizadas de todos os registros
+            return {id for id, outra in self._chaves.items() if chave in outra}
+
+        listas = sorted((self._postings.get(t, set()) for t in trigramas), key=len)
+        candidatos = set(listas[0])
+        for ids in listas[1:]:
+            if not candidatos:
+                break
+            candidatos &= ids
+        return {id for id in candidatos if chave in self._chaves[id]}
+
+    def estimativa(self, termo):
+        """
+        Estima, sem executar a busca, quantos registros contêm o termo: o
+        tamanho da menor lista de trigramas é um limite superior.
+
+        Args:
+            termo (str): Texto a ser buscado
+
+        Returns:
+            int: Quantidade máxima de registros encontrados
+        """
+        trigramas = self._trigramas(self._normalizar(termo))
+        if not trigramas:
+            return len(self._chaves)
+        return min(len(self._postings.get(t, ())) for t in trigramas)
+
+    def restringir(self, ids, termo):
+        """
+        Filtra um conjunto de IDs já reduzido por outro critério, testando o
+        termo diretamente contra as chaves normalizadas.
+
+        Args:
+            ids (iterable): IDs candidatos
+            termo (str): Texto a ser buscado
+
+        Returns:
+            set: IDs cujos registros contêm o termo
+        """
+        termo = self._normalizar(termo)
+        return {id for id in ids if termo in self._chaves.get(id, '')}
+
+    def buscar_aproximado(self, termo, maximo, limite=None, permitidos=None):
+        """
+        Busca os registros cujo campo contém um trecho a até `maximo` edições
+        do termo, tolerando erros de digitação.
+
+        Pelo lema dos q-gramas, um trecho a k edições do termo preserva ao
+        menos (posições de q-gramas do termo - q * k) q-gramas dele. Quando o
+        mínimo de trigramas é positivo, só os registros que o atingem são
+        verificados. Nos termos curtos demais para esse filtro, o termo é
+        dividido em k + 1 partes: como k edições alteram no máximo k delas, o
+        trecho contém ao menos uma parte sem alterações; os registros que
+        contêm alguma parte passam ainda pelo mínimo de bigramas, quando ele
+        é positivo, antes do cálculo da distância.
+
+        Args:
+            termo (str): Texto a ser buscado
+            maximo (int): Distância de edição máxima
+            limite (int, optional): Quantidade máxima de resultados; permite
+                                    interromper a verificação assim que os
+                                    melhores já foram encontrados
+            permitidos (set, optional): IDs aos quais a busca se restringe
+
+        Returns:
+            list: Pares (distância, ID) em ordem crescente de distância
+        """
+        termo = self._normalizar(termo)
+        exatos = self._contendo(termo)
+        if permitidos is not None:
+            exatos = exatos & permitidos
+        if limite is not None and len(exatos) >= limite:
+            return [(0, id) for id in sorted(exatos)[:limite]]
+
+        trigramas = self._trigramas(termo)
+        minimo = len(trigramas) - self.TAMANHO * maximo
+        if minimo > 0:
+            contagem = {}
+            for trigrama in trigramas:
+                for id in self._postings.get(trigrama, ()):
+                    contagem[id] = contagem.get(id, 0) + 1
+            candidatos = [id for id, total in contagem.items() if total >= minimo]
+        elif len(termo) > maximo:
+            candidatos = set()
+            for parte in partes_termo(termo, maximo + 1):
+                candidatos |= self._contendo(parte)
+            bigramas = [termo[i:i + 2] for i in range(len(termo) - 1)]
+            minimo = len(bigramas) - 2 * maximo
+            if minimo > 0:
+                candidatos = [
+                    id for id in candidatos
+                    if sum(bigrama in self._chaves[id] for bigrama in bigramas) >= minimo
+                ]
+        else:
+            # Com tantas edições quanto caracteres, qualquer registro atende
+            candidatos = self._chaves
+        if permitidos is not None:
+            candidatos = permitidos.intersection(candidatos)
+
+        resultados = sorted((0, id) for id in exatos)
+        teto = maximo
+        # Em ordem de ID, um candidato só entra entre os `limite` primeiros
+        # se tiver distância menor que a do último deles
+        for id in sorted(candidatos):
+            if id in exatos:
+                continue
+            distancia = distancia_trecho(termo, self._chaves[id], teto)
+            if distancia is None:
+                continue
+            resultados.append((distancia, id))
+            if limite is not None and len(resultados) >= limite:
+                resultados.sort()
+                del resultados[limite:]
+                teto = resultados[-1][0] - 1
+                if teto < 1:
+                    break
+        resultados.sort()
+        return resultados
+
+
+class IndiceIds:
+    """
+    Índice com os IDs dos registros em ordem crescente, mantido com bisect.
+
+    Serve à paginação por cursor: a página seguinte a um ID é localizada por
+    busca binária, sem percorrer nem hidratar os registros anteriores.
+    """
+    def __init__(self):
+        """Inicializa o índice vazio."""
+        self._ids = []
+
+    def adicionar(self, registro):
+        """
+        Indexa um registro.
+
+        Args:
+            registro (dict): Registro a ser indexado
+        """
+        id = registro.get('id')
+        if id is None:
+            return
+        # IDs novos costumam ser maiores que todos os anteriores: anexar ao fim
+        # evita o deslocamento da lista
+        if not self._ids or id > self._ids[-1]:
+            self._ids.append(id)
+        else:
+            posicao = bisect.bisect_left(self._ids, id)
+            if posicao == len(self._ids) or self._ids[posicao] != id:
+                self._ids.insert(posicao, id)
+
+    def remover(self, registro):
+        """
+        Remove um registro do índice.
+
+        Args:
+            registro (dict): Registro a ser removido
+        """
+        id = registro.get('id')
+        if id is None:
+            return
+        posicao = bisect.bisect_left(self._ids, id)
+        if posicao < len(self._ids) and self._ids[posicao] == id:
+            del self._ids[posicao]
+
+    def pagina(self, limite, apos_id=None):
+        """
+        Obtém os IDs de uma página.
+
+        Args:
+            limite (int): Quantidade máxima de IDs
+            apos_id (int, optional): Cursor; só IDs maiores que ele são retornados
+
+        Returns:
+            list: IDs da página em ordem crescente
+        """
+        inicio = 0 if apos_id is None else bisect.bisect_right(self._ids, apos_id)
+        return self._ids[inicio:inicio + limite]
+
+
+class IndiceNomesOrdenados:
+    """
+    Lista ordenada de pares (chave normalizada, ID) mantida com bisect.
+
+    Atende à busca por prefixo do autocompletar em O(log n + k): a busca
+    binária localiza o primeiro nome com o prefixo e os k seguintes são lidos
+    em sequência.
+    """
+    def __init__(self, campo):
+        """
+        Inicializa o índice vazio.
+
+        Args:
+            campo (str): Nome do campo indexado
+        """
+        self.campo = campo
+        self._chaves = {}
+        self._entradas = []
+
+    def _normalizar(self, texto):
+        """Calcula a chave de ordenação e busca de um texto."""
+        return chave_busca(texto)
+
+    def adicionar(self, registro):
+        """
+        Indexa um registro.
+
+        Args:
+            registro (dict): Registro a ser indexado
+        """
+        id = registro.get('id')
+        chave = self._normalizar(registro.get(self.campo))
+        self._chaves[id] = chave
+        bisect.insort(self._entradas, (chave, id))
+
+    def construir(self, registros):
+        """
+        Indexa os registros da carga inicial, ordenando a lista uma única vez
+        em vez de inserir cada entrada na posição.
+
+        Args:
+            registros (iterable): Registros a serem indexados
+        """
+        for registro in registros:
+            id = registro.get('id')
+            chave = self._normalizar(registro.get(self.campo))
+            self._chaves[id] = chave
+            self._entradas.append((chave, id))
+        self._entradas.sort()
+
+    def remover(self, registro):
+        """
+        Remove um registro do índice.
+
+        Args:
+            registro (dict): Registro a ser removido
+        """
+        id = registro.get('id')
+        chave = self._chaves.pop(id, None)
+        if chave is None:
+            return
+        posicao = bisect.bisect_left(self._entradas, (chave, id))
+        if posicao < len(self._entradas) and self._entradas[posicao] == (chave, id):
+            del self._entradas[posicao]
+
+    def prefixo(self, prefixo, limite):
+        """
+        Obtém os registros cujo campo começa com o prefixo, em ordem alfabética.
+
+        Args:
+            prefixo (str): Início do texto buscado
+            limite (int): Quantidade máxima de resultados
+
+        Returns:
+            list: IDs dos registros encontrados
+        """
+        prefixo = self._normalizar(prefixo)
+        # (prefixo,) é menor que qualquer par (prefixo..., id)
+        posicao = bisect.bisect_left(self._entradas, (prefixo,))
+        ids = []
+        while len(ids) < limite and posicao < len(self._entradas):
+            chave, id = self._entradas[posicao]
+            if not chave.startswith(prefixo):
+                break
+            ids.append(id)
+            posicao += 1
+        return ids
+
+
+class IndiceTextual:
+    """
+    Índice invertido para busca textual em vários campos, com ordenação por
+    relevância no estilo BM25.
+
+    Cada registro é um documento formado pelos termos de todos os campos
+    indexados. As listas de ocorrências guardam a frequência do termo em cada
+    documento, e os tamanhos dos documentos são mantidos a cada escrita para a
+    normalização por comprimento.
+    """
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, campos):
+        """
+        Inicializa o índice vazio.
+
+        Args:
+            campos (dict): Função que extrai os termos de cada campo indexado
+        """
+        self.campos = campos
+        self._postings = {}
+        self._termos = {}
+        self._tamanhos = {}
+        self._total = 0
+
+    def _extrair(self, registro):
+        """Obtém a frequência de cada termo de um registro."""
+        frequencias = {}
+        for campo, extrair in self.campos.items():
+            for termo in extrair(registro.get(campo)):
+                frequencias[termo] = frequencias.get(termo, 0) + 1
+        return frequencias
+
+    def adicionar(self, registro):
+        """
+        Indexa um registro.
+
+        Args:
+            registro (dict): Registro a ser indexado
+        """
+        frequencias = self._extrair(registro)
+        if not frequencias:
+            return
+        id = registro.get('id')
+        # Termos comuns (como domínios de email) se repetem em muitos
+        # documentos; internados, todos compartilham a mesma string
+        frequencias = {sys.intern(termo): frequencia for termo, frequencia in frequencias.items()}
+        self._termos[id] = list(frequencias)
+        tamanho = sum(frequencias.values())
+        self._tamanhos[id] = tamanho
+        self._total += tamanho
+        for termo, frequencia in frequencias.items():
+            self._postings.setdefault(termo, {})[id] = frequencia
+
+    def remover(self, registro):
+        """
+        Remove um registro do índice.
+
+        Args:
+            registro (dict): Registro a ser removido
+        """
+        id = registro.get('id')
+        termos = self._termos.pop(id, None)
+        if termos is None:
+            return
+        self._total -= self._tamanhos.pop(id)
+        for termo in termos:
+            ocorrencias = self._postings[termo]
+            del ocorrencias[id]
+            if not ocorrencias:
+                del self._postings[termo]
+
+    def pontuar(self, termos):
+        """
+        Calcula a relevância BM25 dos registros que contêm algum dos termos.
+
+        Args:
+            termos (iterable): Termos da consulta, já normalizados
+
+        Returns:
+            dict: Pontuação indexada pelo ID do registro
+        """
+        total_documentos = len(self._tamanhos)
+        if not total_documentos:
+            return {}
+        tamanho_medio = self._total / total_documentos
+
+        pontuacoes = {}
+        for termo in set(termos):
+            ocorrencias = self._postings.get(termo)
+            if not ocorrencias:
+                continue
+            idf = math.log(1 + (total_documentos - len(ocorrencias) + 0.5) / (len(ocorrencias) + 0.5))
+            for id, frequencia in ocorrencias.items():
+                normalizacao = self.K1 * (1 - self.B + self.B * self._tamanhos[id] / tamanho_medio)
+                pontuacoes[id] = pontuacoes.get(id, 0.0) + idf * frequencia * (self.K1 + 1) / (frequencia + normalizacao)
+        return pontuacoes
+
+
+
+class IndiceInstancias:
+    """
+    Índice secundário que mantém uma instância compartilhada (flyweight) de
+    cada registro, criada uma única vez por versão do registro.
+
+    Quem precisa resolver muitas referências ao mesmo registro (por exemplo,
+    a categoria de cada contato de uma listagem) consulta este índice em vez
+    de criar um objeto por referência.
+    """
+    def __init__(self, criar):
+        """
+        Inicializa o índice vazio.
+
+        Args:
+            criar (callable): Função que cria a instância a partir do registro
+        """
+        self.criar = criar
+        self._instancias = {}
+
+    def adicionar(self, registro):
+        """
+        Cria a instância de um registro.
+
+        Args:
+            registro (dict): Registro a ser indexado
+        """
+        self._instancias[registro.get('id')] = self.criar(registro)
+
+    def remover(self, registro):
+        """
+        Descarta a instância de um registro.
+
+        Args:
+            registro (dict): Registro a ser removido
+        """
+        self._instancias.pop(registro.get('id'), None)
+
+    def obter(self, id):
+        """
+        Obtém a instância de um registro.
+
+        Args:
+            id (int): ID do registro
+
+        Returns:
+            A instância compartilhada ou None
+        """
+        return self._instancias.get(id)
+
+    def mapa(self):
+        """
+        Obtém as instâncias indexadas por ID, sem cópia.
+
+        Returns:
+            MappingProxyType: Visão somente leitura das instâncias
+        """
+        return MappingProxyType(self._instancias)
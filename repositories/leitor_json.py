@@ -0,0 +1,71 @@
+import json
+import re
+
+# Quantidade de caracteres lidos do arquivo a cada vez
+TAMANHO_BLOCO = 64 * 1024
+
+_ESPACOS = re.compile(r'[ \t\n\r]*')
+_decodificador = json.JSONDecoder()
+
+
+def ler_registros(arquivo, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Lê incrementalmente um array JSON, produzindo um elemento por vez.
+
+    Apenas o bloco atual e o elemento em leitura ficam em memória, qualquer
+    que seja o tamanho do arquivo. Cada elemento é decodificado com
+    JSONDecoder.raw_decode; se o bloco termina no meio dele, mais texto é
+    lido e a decodificação é refeita a partir do início do elemento.
+
+    Args:
+        arquivo (file): Arquivo aberto em modo texto
+        tamanho_bloco (int): Quantidade de caracteres lida a cada vez
+
+    Yields:
+        Cada elemento do array, na ordem do arquivo (um arquivo vazio não
+        produz nenhum)
+
+    Raises:
+        ValueError: Se o conteúdo não for um array JSON válido
+    """
+    texto = ''
+    posicao = 0
+    dentro_do_array = False
+    while True:
+        posicao = _ESPACOS.match(texto, posicao).end()
+        if posicao == len(texto):
+            bloco = arquivo.read(tamanho_bloco)
+            if not bloco:
+                if dentro_do_array:
+                    raise ValueError("Array JSON não terminado")
+                return
+            texto, posicao = bloco, 0
+            continue
+
+        caractere = texto[posicao]
+        if not dentro_do_array:
+            if caractere != '[':
+                raise ValueError("O arquivo não contém um array JSON")
+            dentro_do_array = True
+            posicao += 1
+            continue
+        if caractere == ']':
+            return
+        if caractere == ',':
+            posicao += 1
+            continue
+
+        while True:
+            try:
+                elemento, posicao = _decodificador.raw_decode(texto, posicao)
+                break
+            except json.JSONDecodeError:
+                bloco = arquivo.read(tamanho_bloco)
+                if not bloco:
+                    raise
+                texto, posicao = texto[posicao:] + bloco, 0
+        yield elemento
+
+        # Descarta o texto já consumido para o buffer não crescer
+        if posicao >= tamanho_bloco:
+            texto, posicao = texto[posicao:], 0
@@ -0,0 +1,863 @@
+import heapq
+import json
+import math
+import mmap
+import os
+import threading
+from collections import Counter, OrderedDict
+from models.contato import Contato, VisaoContato
+from logger_singleton import Logger
+from repositories.armazenamento import carregar_existente, trava_arquivo
+from repositories.cache_arquivo import CacheArquivo, sincronizado
+from repositories.formatos import Codec
+from repositories.indices import IndiceExato, IndiceTextual
+from repositories.sequencia import Sequencia
+from repositories.normalizacao import (
+    chave_busca, chave_email, condicao_filtros, distancia_trecho, termos, termos_telefone, tolerancia
+)
+
+# Campos da busca textual e seus extratores, os mesmos de ContatoRepository
+CAMPOS_TEXTO = {'nome': termos, 'email': termos, 'telefone': termos_telefone}
+
+# Quantidade padrão de contatos desserializados mantidos em memória
+TAMANHO_CACHE = 1000
+
+# Bytes de linhas obsoletas tolerados antes de compactar o arquivo
+MINIMO_COMPACTACAO = 64 * 1024
+
+
+class IndiceDeslocamentos:
+    """
+    Índice em memória do arquivo de contatos: a posição (deslocamento e
+    tamanho, em bytes) da linha atual de cada contato, na ordem de criação.
+    """
+    def __init__(self):
+        """Inicializa o índice vazio."""
+        self.posicoes = {}
+        self.bytes_vivos = 0
+        self.bytes_mortos = 0
+
+    def registrar(self, id, deslocamento, tamanho):
+        """
+        Aponta o contato para uma nova linha, tornando obsoleta a anterior.
+
+        Args:
+            id (int): ID do contato
+            deslocamento (int): Início da linha no arquivo
+            tamanho (int): Tamanho da linha, sem a quebra de linha
+        """
+        anterior = self.posicoes.get(id)
+        if anterior is not None:
+            self.bytes_vivos -= anterior[1] + 1
+            self.bytes_mortos += anterior[1] + 1
+        self.posicoes[id] = (deslocamento, tamanho)
+        self.bytes_vivos += tamanho + 1
+
+    def remover(self, id, tamanho_marca):
+        """
+        Remove um contato do índice.
+
+        Args:
+            id (int): ID do contato
+            tamanho_marca (int): Tamanho da linha que registra a exclusão
+        """
+        deslocamento, tamanho = self.posicoes.pop(id)
+        self.bytes_vivos -= tamanho + 1
+        self.bytes_mortos += tamanho + 1 + tamanho_marca + 1
+
+
+class MmapContatoRepository:
+    """
+    Repositório de contatos para agendas maiores que a memória disponível.
+
+    Os contatos ficam em um arquivo com um JSON por linha (contatos.ndjson),
+    lido por mmap. Apenas o índice id → (deslocamento, tamanho) fica em memória,
+    junto com um cache LRU de contatos já desserializados de tamanho limitado.
+    Escritas acrescentam linhas ao fim do arquivo (uma exclusão acrescenta uma
+    marca {"excluido": id}); quando as linhas obsoletas passam a ocupar mais
+    espaço que as atuais, o arquivo é regravado só com as atuais.
+
+    Buscas percorrem o arquivo registro a registro, sem carregá-lo inteiro.
+    Como nenhum índice de nomes fica em memória, a busca aproximada também
+    calcula a distância de edição para cada contato, sem o filtro de
+    candidatos por trigramas dos backends JSON e SQLite.
+    """
+    def __init__(self, data_path='data', tamanho_cache=TAMANHO_CACHE, armazenamento='json',
+                 formato='json', compressao=None):
+        """
+        Inicializa o repositório, migrando os contatos do backend JSON na
+        primeira execução.
+
+        Args:
+            data_path (str): Caminho para o diretório de dados
+            tamanho_cache (int): Quantidade máxima de contatos desserializados
+                                 mantidos em memória
+            armazenamento (str): Mecanismo do backend JSON de onde os contatos
+                                 são migrados ('json' ou 'log')
+            formato (str): Formato do arquivo do backend JSON
+            compressao (str, optional): Compressão do arquivo do backend JSON
+        """
+        self.logger = Logger.get_instance()
+        self.data_path = data_path
+        self.file_path = os.path.join(data_path, 'contatos.ndjson')
+        self.lock_path = f"{self.file_path}.lock"
+        self.tamanho_cache = tamanho_cache
+        self._cache = CacheArquivo(self.file_path)
+        self._sequencia = Sequencia(os.path.join(data_path, 'contatos.seq'))
+        self._lock = threading.RLock()
+        self._escrita = threading.local()
+        self._contatos = OrderedDict()
+        self._mapa = None
+        self._mapa_inode = None
+
+        if not os.path.exists(data_path):
+            os.makedirs(data_path)
+            self.logger.info(f"Diretório de dados criado: {data_path}")
+
+        if not os.path.exists(self.file_path):
+            self._migrar(armazenamento, Codec(formato, compressao))
+
+    def _migrar(self, armazenamento, codec):
+        """
+        Cria o arquivo de dados com os contatos do backend JSON, se houver.
+
+        Os contatos são lidos pelo armazenamento configurado para o backend
+        JSON (ver carregar_existente), incluindo as operações pendentes no log.
+
+        Args:
+            armazenamento (str): Mecanismo do backend JSON ('json' ou 'log')
+            codec (Codec): Formato do arquivo do backend JSON
+        """
+        registros = carregar_existente(
+            armazenamento, os.path.join(self.data_path, 'contatos.json'), 'contatos', self.logger, codec
+        )
+
+        temp_path = f"{self.file_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as file:
+            for registro in registros:
+                file.write(self._serializar(registro) + b'\n')
+        os.replace(temp_path, self.file_path)
+        self.logger.info(f"Arquivo de contatos criado: {self.file_path} ({len(registros)} contatos migrados)")
+
+    @staticmethod
+    def _serializar(entrada):
+        """
+        Serializa uma linha do arquivo de dados.
+
+        Args:
+            entrada (dict): Registro do contato ou marca de exclusão
+
+        Returns:
+            bytes: Linha em JSON compacto, sem a quebra de linha
+        """
+        return json.dumps(entrada, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def _carregar(self):
+        """
+        Obtém o índice do arquivo, reconstruindo-o se o arquivo foi alterado
+        por outro processo.
+
+        Returns:
+            IndiceDeslocamentos: Índice do arquivo atual
+        """
+        return self._cache.obter(self._construir_indice)
+
+    def _construir_indice(self):
+        """
+        Percorre o arquivo linha a linha e monta o índice de deslocamentos.
+        O cache de contatos é descartado, pois o arquivo pode ter mudado.
+
+        Returns:
+            IndiceDeslocamentos: Índice do arquivo
+        """
+        self._contatos.clear()
+        indice = IndiceDeslocamentos()
+        deslocamento = 0
+        try:
+            with open(self.file_path, 'rb') as file:
+                for numero, linha in enumerate(file, 1):
+                    conteudo = linha.rstrip(b'\n')
+                    try:
+                        entrada = json.loads(conteudo)
+                    except ValueError:
+                        # Linha truncada por uma escrita interrompida
+                        self.logger.warning(f"Entrada inválida em {self.file_path}:{numero}")
+                        indice.bytes_mortos += len(linha)
+                    else:
+                        if 'excluido' in entrada:
+                            if entrada['excluido'] in indice.posicoes:
+                                indice.remover(entrada['excluido'], len(conteudo))
+                            else:
+                                indice.bytes_mortos += len(linha)
+                        else:
+                            indice.registrar(entrada.get('id'), deslocamento, len(conteudo))
+                    deslocamento += len(linha)
+        except OSError as e:
+            self.logger.error(f"Erro ao carregar contatos: {str(e)}")
+        return indice
+
+    def _mapear(self):
+        """
+        Obtém o mapeamento em memória do arquivo, refazendo-o quando o
+        arquivo cresceu ou foi substituído.
+
+        Returns:
+            mmap.mmap: Conteúdo do arquivo (b'' se estiver vazio)
+        """
+        stat = os.stat(self.file_path)
+        if self._mapa is not None and self._mapa_inode == stat.st_ino and len(self._mapa) == stat.st_size:
+            return self._mapa
+        if self._mapa is not None:
+            self._mapa.close()
+            self._mapa = None
+        if stat.st_size == 0:
+            return b''
+        with open(self.file_path, 'rb') as file:
+            self._mapa = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapa_inode = stat.st_ino
+        return self._mapa
+
+    def _registros(self, indice):
+        """
+        Lê os registros atuais, um de cada vez, na ordem de criação.
+
+        Args:
+            indice (IndiceDeslocamentos): Índice do arquivo
+
+        Yields:
+            dict: Registro de cada contato
+        """
+        mapa = self._mapear()
+        for deslocamento, tamanho in indice.posicoes.values():
+            yield json.loads(mapa[deslocamento:deslocamento + tamanho])
+
+    def _obter(self, indice, id):
+        """
+        Obtém um contato pelo ID, passando pelo cache LRU.
+
+        Args:
+            indice (IndiceDeslocamentos): Índice do arquivo
+            id (int): ID do contato
+
+        Returns:
+            Contato: Cópia do contato em cache ou None se não existir
+        """
+        contato = self._contatos.get(id)
+        if contato is not None:
+            self._contatos.move_to_end(id)
+        else:
+            posicao = indice.posicoes.get(id)
+            if posicao is None:
+                return None
+            deslocamento, tamanho = posicao
+            contato = Contato.from_dict(json.loads(self._mapear()[deslocamento:deslocamento + tamanho]))
+            self._contatos[id] = contato
+            while len(self._contatos) > self.tamanho_cache:
+                self._contatos.popitem(last=False)
+        # Quem chama pode alterar o contato; o objeto em cache não é exposto
+        return Contato.from_tuple(contato.to_tuple())
+
+    def _filtrar_registros(self, indice, condicao):
+        """
+        Percorre os registros e converte os que atendem à condição.
+
+        Args:
+            indice (IndiceDeslocamentos): Índice do arquivo
+            condicao (callable): Recebe o registro e retorna True para mantê-lo
+
+        Returns:
+            list: Lista de objetos Contato
+        """
+        return [Contato.from_dict(registro) for registro in self._registros(indice) if condicao(registro)]
+
+    def versao(self):
+        """
+        Obtém a versão dos dados de contatos, que muda a cada gravação feita
+        por qualquer processo.
+
+        Returns:
+            tuple: Assinatura do arquivo de dados
+        """
+        return self._cache.versao()
+
+    def versoes_escrita(self):
+        """
+        Obtém as versões dos dados imediatamente antes e depois da última
+        escrita feita pela thread atual, lidas sob a trava de arquivo.
+
+        Returns:
+            tuple: (versão anterior, versão posterior) ou None se a thread
+                   ainda não gravou
+        """
+        return getattr(self._escrita, 'versoes', None)
+
+    @sincronizado
+    def listar_todos(self):
+        """
+        Lista todos os contatos.
+
+        Returns:
+            list: Lista de objetos Contato
+        """
+        return [Contato.from_dict(registro) for registro in self._registros(self._carregar())]
+
+    @sincronizado
+    def listar_visoes(self):
+        """
+        Lista todos os contatos como visões somente leitura.
+
+        Returns:
+            list: Lista de objetos VisaoContato
+        """
+        return [VisaoContato(registro) for registro in self._registros(self._carregar())]
+
+    @sincronizado
+    def listar_pagina(self, limite, apos_id=None):
+        """
+        Lista uma página de contatos em ordem de ID (paginação por cursor).
+        Apenas os contatos da página são lidos do arquivo.
+
+        Args:
+            limite (int): Quantidade máxima de contatos na página
+            apos_id (int, optional): Cursor; a página começa após este ID
+
+        Returns:
+            tuple: (lista de objetos Contato, cursor da próxima página ou None)
+        """
+        indice = self._carregar()
+        ids = indice.posicoes if apos_id is None else (id for id in indice.posicoes if id > apos_id)
+        ids = heapq.nsmallest(limite + 1, ids)
+        pagina = [self._obter(indice, id) for id in ids[:limite]]
+        proximo = ids[limite - 1] if len(ids) > limite else None
+        return pagina, proximo
+
+    @sincronizado
+    def buscar_por_id(self, id):
+        """
+        Busca um contato pelo ID.
+
+        Args:
+            id (int): ID do contato
+
+        Returns:
+            Contato: Objeto contato encontrado ou None
+        """
+        return self._obter(self._carregar(), id)
+
+    @sincronizado
+    def buscar_por_nome(self, nome):
+        """
+        Busca contatos pelo nome (parcial).
+
+        Args:
+            nome (str): Nome ou parte do nome a ser buscado
+
+        Returns:
+            list: Lista de objetos Contato que correspondem à busca
+        """
+        chave = chave_busca(nome)
+        return self._filtrar_registros(self._carregar(), lambda registro: chave in chave_busca(registro.get('nome')))
+
+    @sincronizado
+    def filtrar(self, filtros):
+        """
+        Busca contatos que atendem a todos os filtros informados, em uma
+        única passagem pelo arquivo.
+
+        Args:
+            filtros (dict): Filtros a aplicar, entre 'nome', 'categoria_id',
+                            'telefone' e 'email' (categoria_id None seleciona
+                            os contatos sem categoria)
+
+        Returns:
+            list: Lista de objetos Contato
+        """
+        return self._filtrar_registros(self._carregar(), condicao_filtros(filtros))
+
+    @sincronizado
+    def filtrar_pagina(self, filtros, limite, apos_id=None):
+        """
+        Lista uma página, em ordem de ID, dos contatos que atendem aos
+        filtros (paginação por cursor). As linhas anteriores ao cursor não
+        são lidas e apenas os contatos da página são convertidos em objetos
+        Contato.
+
+        Args:
+            filtros (dict): Filtros aceitos por filtrar
+            limite (int): Quantidade máxima de contatos na página
+            apos_id (int, optional): Cursor; a página começa após este ID
+
+        Returns:
+            tuple: (lista de objetos Contato, cursor da próxima página ou None)
+        """
+        indice = self._carregar()
+        condicao = condicao_filtros(filtros)
+        mapa = self._mapear()
+        ids = heapq.nsmallest(limite + 1, (
+            id for id, (deslocamento, tamanho) in indice.posicoes.items()
+            if (apos_id is None or id > apos_id) and condicao(json.loads(mapa[deslocamento:deslocamento + tamanho]))
+        ))
+        pagina = [self._obter(indice, id) for id in ids[:limite]]
+        proximo = ids[limite - 1] if len(ids) > limite else None
+        return pagina, proximo
+
+    def iterar_registros(self, filtros=None):
+        """
+        Percorre os contatos como dicionários, um por vez; usado nas exportações.
+
+        O arquivo é mapeado à parte, para que a leitura continue válida mesmo
+        que uma escrita concorrente compacte o arquivo ou refaça o mapeamento
+        compartilhado. Apenas os deslocamentos ficam em memória.
+
+        Args:
+            filtros (dict, optional): Filtros aceitos por filtrar
+
+        Yields:
+            dict: Cada contato que atende aos filtros, na ordem de criação
+        """
+        condicao = condicao_filtros(filtros or {})
+        with self._lock:
+            posicoes = list(self._carregar().posicoes.values())
+            file = open(self.file_path, 'rb')
+        with file:
+            if not posicoes:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                for deslocamento, tamanho in posicoes:
+                    registro = json.loads(mapa[deslocamento:deslocamento + tamanho])
+                    if condicao(registro):
+                        yield VisaoContato(registro).to_dict()
+
+    @sincronizado
+    def pesquisar_texto(self, termos, pontuacoes_categorias=None, limite=20):
+        """
+        Busca textual em nome, email e telefone, ordenada por relevância BM25.
+
+        As estatísticas do BM25 (quantidade de documentos, tamanho médio e
+        frequência de cada termo) são calculadas na mesma passagem pelo
+        arquivo; apenas os contatos que contêm algum termo ficam em memória.
+
+        Args:
+            termos (list): Termos da consulta, já normalizados
+            pontuacoes_categorias (dict, optional): Relevância de cada categoria
+                                                    para a consulta, somada à
+                                                    dos seus contatos
+            limite (int): Quantidade máxima de resultados
+
+        Returns:
+            list: Pares (Contato, pontuação) do mais para o menos relevante
+        """
+        indice = self._carregar()
+        consulta = set(termos)
+        categorias = pontuacoes_categorias or {}
+        total_documentos = 0
+        total_termos = 0
+        documentos_por_termo = Counter()
+        candidatos = []
+        for registro in self._registros(indice):
+            frequencias = Counter(
+                termo for campo, extrair in CAMPOS_TEXTO.items() for termo in extrair(registro.get(campo))
+            )
+            tamanho = sum(frequencias.values())
+            if tamanho:
+                total_documentos += 1
+                total_termos += tamanho
+            encontrados = {termo: frequencias[termo] for termo in consulta if termo in frequencias}
+            documentos_por_termo.update(encontrados.keys())
+            if encontrados or registro.get('categoria_id') in categorias:
+                candidatos.append((registro.get('id'), encontrados, tamanho, registro.get('categoria_id')))
+
+        tamanho_medio = total_termos / total_documentos if total_documentos else 1
+        k1, b = IndiceTextual.K1, IndiceTextual.B
+        pontuacoes = {}
+        for id, encontrados, tamanho, categoria_id in candidatos:
+            pontuacao = categorias.get(categoria_id, 0.0)
+            for termo, frequencia in encontrados.items():
+                documentos = documentos_por_termo[termo]
+                idf = math.log(1 + (total_documentos - documentos + 0.5) / (documentos + 0.5))
+                normalizacao = k1 * (1 - b + b * tamanho / tamanho_medio)
+                pontuacao += idf * frequencia * (k1 + 1) / (frequencia + normalizacao)
+            pontuacoes[id] = pontuacao
+
+        melhores = heapq.nlargest(limite, pontuacoes.items(), key=lambda item: (item[1], -item[0]))
+        return [(self._obter(indice, id), pontuacao) for id, pontuacao in melhores]
+
+    @sincronizado
+    def buscar_aproximado(self, termo, limite=10, filtros=None):
+        """
+        Busca contatos cujo nome se aproxima do termo, tolerando erros de
+        digitação, do mais parecido para o menos parecido. Percorre o arquivo
+        inteiro (ver a descrição da classe); os demais filtros descartam os
+        registros antes do cálculo da distância.
+
+        Args:
+            termo (str): Nome ou parte do nome, possivelmente com erros
+            limite (int): Quantidade máxima de contatos
+            filtros (dict, optional): Filtros aceitos por filtrar, exceto o nome
+
+        Returns:
+            list: Lista de objetos Contato
+        """
+        indice = self._carregar()
+        termo = chave_busca(termo)
+        maximo = tolerancia(termo)
+        condicao = condicao_filtros(filtros or {})
+        resultados = []
+        for registro in self._registros(indice):
+            if not condicao(registro):
+                continue
+            distancia = distancia_trecho(termo, chave_busca(registro.get('nome')), maximo)
+            if distancia is not None:
+                resultados.append((distancia, registro.get('id')))
+        return [self._obter(indice, id) for _, id in heapq.nsmallest(limite, resultados)]
+
+    @sincronizado
+    def autocompletar(self, prefixo, limite=10):
+        """
+        Busca contatos cujo nome começa com o prefixo, em ordem alfabética.
+
+        Args:
+            prefixo (str): Início do nome
+            limite (int): Quantidade máxima de contatos
+
+        Returns:
+            list: Lista de objetos Contato
+        """
+        indice = self._carregar()
+        prefixo = chave_busca(prefixo)
+        nomes = ((chave_busca(registro.get('nome')), registro.get('id')) for registro in self._registros(indice))
+        encontrados = heapq.nsmallest(limite, (nome for nome in nomes if nome[0].startswith(prefixo)))
+        return [self._obter(indice, id) for _, id in encontrados]
+
+    @sincronizado
+    def buscar_por_telefone(self, telefone):
+        """
+        Busca contatos pelo telefone, ignorando a formatação.
+
+        Args:
+            telefone (str): Telefone em qualquer formato
+
+        Returns:
+            list: Lista de objetos Contato com o telefone
+        """
+        return self.filtrar({'telefone': telefone})
+
+    @sincronizado
+    def buscar_por_email(self, email):
+        """
+        Busca contatos pelo email exato, sem diferenciar maiúsculas.
+
+        Args:
+            email (str): Email a ser buscado
+
+        Returns:
+            list: Lista de objetos Contato com o email
+        """
+        return self.filtrar({'email': email})
+
+    @sincronizado
+    def buscar_por_categoria(self, categoria_id):
+        """
+        Busca contatos por categoria.
+
+        Args:
+            categoria_id (int): ID da categoria
+
+        Returns:
+            list: Lista de objetos Contato que pertencem à categoria
+        """
+        return self.filtrar({'categoria_id': categoria_id})
+
+    @sincronizado
+    def contar_por_categoria(self, filtros=None):
+        """
+        Conta os contatos de cada categoria, opcionalmente apenas entre os
+        que atendem aos filtros.
+
+        Args:
+            filtros (dict, optional): Filtros aceitos por filtrar
+
+        Returns:
+            dict: Quantidade de contatos indexada pelo ID da categoria
+                  (contatos sem categoria ficam na chave None)
+        """
+        if filtros:
+            return dict(Counter(contato.categoria_id for contato in self.filtrar(filtros)))
+        return dict(Counter(registro.get('categoria_id') for registro in self._registros(self._carregar())))
+
+    def _anexar(self, indice, entradas):
+        """
+        Acrescenta linhas ao arquivo e atualiza o índice. Deve ser chamado
+        com a trava de arquivo adquirida.
+
+        Args:
+            indice (IndiceDeslocamentos): Índice do arquivo
+            entradas (list): Registros a gravar ou marcas {"excluido": id}
+
+        Returns:
+            bool: True se gravado com sucesso, False caso contrário
+        """
+        linhas = [self._serializar(entrada) for entrada in entradas]
+        antes = self._cache.versao()
+        try:
+            with open(self.file_path, 'a+b') as file:
+                deslocamento = file.seek(0, os.SEEK_END)
+                if deslocamento:
+                    # Uma escrita interrompida pode ter deixado a última linha
+                    # sem quebra; a nova linha não pode ser emendada nela
+                    file.seek(deslocamento - 1)
+                    if file.read(1) != b'\n':
+                        file.write(b'\n')
+                        deslocamento += 1
+                file.write(b''.join(linha + b'\n' for linha in linhas))
+        except OSError as e:
+            self.logger.error(f"Erro ao salvar contatos: {str(e)}")
+            self._cache.invalidar()
+            return False
+
+        for entrada, linha in zip(entradas, linhas):
+            if 'excluido' in entrada:
+                indice.remover(entrada['excluido'], len(linha))
+                self._contatos.pop(entrada['excluido'], None)
+            else:
+                indice.registrar(entrada['id'], deslocamento, len(linha))
+                self._contatos.pop(entrada['id'], None)
+            deslocamento += len(linha) + 1
+
+        if indice.bytes_mortos > max(indice.bytes_vivos, MINIMO_COMPACTACAO):
+            self._compactar(indice)
+        self._cache.atualizar(indice)
+        self._escrita.versoes = (antes, self._cache.versao())
+        return True
+
+    def _compactar(self, indice):
+        """
+        Regrava o arquivo apenas com as linhas atuais. Deve ser chamado com a
+        trava de arquivo adquirida.
+
+        Args:
+            indice (IndiceDeslocamentos): Índice do arquivo, atualizado no lugar
+        """
+        mapa = self._mapear()
+        temp_path = f"{self.file_path}.{os.getpid()}.tmp"
+        posicoes = {}
+        deslocamento = 0
+        try:
+            with open(temp_path, 'wb') as file:
+                for id, (inicio, tamanho) in indice.posicoes.items():
+                    file.write(mapa[inicio:inicio + tamanho + 1])
+                    posicoes[id] = (deslocamento, tamanho)
+                    deslocamento += tamanho + 1
+            os.replace(temp_path, self.file_path)
+        except OSError as e:
+            self.logger.error(f"Erro ao compactar contatos: {str(e)}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        indice.posicoes = posicoes
+        indice.bytes_vivos = deslocamento
+        indice.bytes_mortos = 0
+        self.logger.info(f"Arquivo de contatos compactado: {len(posicoes)} contatos")
+
+    def _reservar_ids(self, indice, quantidade):
+        """
+        Reserva IDs para novos contatos na sequência compartilhada com o
+        backend JSON, pulando IDs já ocupados.
+
+        Args:
+            indice (IndiceDeslocamentos): Índice do arquivo
+            quantidade (int): Quantidade de IDs a reservar
+
+        Returns:
+            list: IDs reservados, em ordem crescente
+        """
+        ids = []
+        while len(ids) < quantidade:
+            reservados = self._sequencia.reservar(
+                lambda: max(indice.posicoes, default=0),
+                quantidade - len(ids)
+            )
+            ids.extend(id for id in reservados if id not in indice.posicoes)
+        return ids
+
+    def _indice_emails(self, indice):
+        """
+        Monta o índice de emails percorrendo o arquivo, para verificar emails
+        duplicados. Deve ser chamado com a trava de arquivo adquirida.
+
+        Args:
+            indice (IndiceDeslocamentos): Índice do arquivo
+
+        Returns:
+            IndiceExato: Índice dos contatos pela chave do email
+        """
+        emails = IndiceExato('email', chave_email)
+        for registro in self._registros(indice):
+            emails.adicionar(registro)
+        return emails
+
+    @sincronizado
+    def criar(self, contato, emails_unicos=False):
+        """
+        Cria um novo contato.
+
+        Args:
+            contato (Contato): Objeto contato a ser criado
+            emails_unicos (bool): Recusa o contato se outro já usar o email
+
+        Returns:
+            Contato: Contato criado com ID atribuído ou None se falhar
+        """
+        criado = self.executar_lote([('criar', contato)], emails_unicos)[0]
+        if criado is None:
+            self.logger.error(f"Falha ao criar contato: {contato.nome}")
+        return criado
+
+    @sincronizado
+    def atualizar(self, contato, emails_unicos=False):
+        """
+        Atualiza um contato existente.
+
+        Args:
+            contato (Contato): Objeto contato a ser atualizado
+            emails_unicos (bool): Recusa a alteração se outro contato já usar o email
+
+        Returns:
+            bool: True se atualizado com sucesso, False caso contrário
+        """
+        if not contato.id:
+            self.logger.error("Tentativa de atualizar contato sem ID")
+            return False
+        return self.executar_lote([('atualizar', contato)], emails_unicos)[0]
+
+    @sincronizado
+    def excluir(self, id):
+        """
+        Exclui um contato pelo ID.
+
+        Args:
+            id (int): ID do contato a ser excluído
+
+        Returns:
+            bool: True se excluído com sucesso, False caso contrário
+        """
+        return self.executar_lote([('excluir', id)])[0]
+
+    @sincronizado
+    def executar_lote(self, operacoes, emails_unicos=False):
+        """
+        Aplica várias operações acrescentando as linhas ao arquivo de uma vez.
+
+        Args:
+            operacoes (list): Tuplas ('criar', Contato), ('atualizar', Contato)
+                              ou ('excluir', id)
+            emails_unicos (bool): Recusa criações e atualizações cujo email já
+                                  pertence a outro contato, inclusive a um
+                                  gravado antes no mesmo lote
+
+        Returns:
+            list: Resultado de cada operação, na ordem recebida: o contato
+                  criado (ou None) para 'criar' e True/False para as demais
+
+        Raises:
+            ValueError: Se alguma operação não for conhecida
+        """
+        for op, _ in operacoes:
+            if op not in ('criar', 'atualizar', 'excluir'):
+                raise ValueError(f"Operação desconhecida: {op}")
+
+        # A trava cobre leitura do índice, verificação dos emails e escrita:
+        # outro processo não pode acrescentar linhas entre elas
+        with trava_arquivo(self.lock_path):
+            indice = self._carregar()
+            quantidade = sum(1 for op, _ in operacoes if op == 'criar')
+            novos_ids = iter(self._reservar_ids(indice, quantidade))
+            existentes = set(indice.posicoes)
+            emails = self._indice_emails(indice) if emails_unicos else None
+
+            resultados = []
+            entradas = []
+            for op, valor in operacoes:
+                if op != 'excluir' and emails is not None and emails.buscar(valor.email) - {valor.id}:
+                    self.logger.warning(f"Email já cadastrado, contato recusado: {valor.email}")
+                    resultados.append(None if op == 'criar' else False)
+                    continue
+                if op == 'criar':
+                    valor.id = next(novos_ids)
+                    existentes.add(valor.id)
+                    entradas.append(valor.to_dict())
+                    resultados.append(valor)
+                elif op == 'atualizar':
+                    if not valor.id or valor.id not in existentes:
+                        self.logger.warning(f"Contato não encontrado para atualização: ID {valor.id}")
+                        resultados.append(False)
+                        continue
+                    entradas.append(valor.to_dict())
+                    resultados.append(True)
+                else:
+                    if valor not in existentes:
+                        self.logger.warning(f"Contato não encontrado para exclusão: ID {valor}")
+                        resultados.append(False)
+                        continue
+                    existentes.discard(valor)
+                    entradas.append({'excluido': valor})
+                    resultados.append(True)
+                if emails is not None:
+                    # Mantém o índice de emails em dia com as operações do lote
+                    emails.remover({'id': valor if op == 'excluir' else valor.id})
+                    if op != 'excluir':
+                        emails.adicionar(entradas[-1])
+
+            if entradas and not self._anexar(indice, entradas):
+                self.logger.error(f"Falha ao salvar lote de contatos: {len(entradas)} operações")
+                return [None if op == 'criar' else False for op, _ in operacoes]
+
+        for (op, valor), resultado in zip(operacoes, resultados):
+            if resultado and op == 'criar':
+                self.logger.info(f"Contato criado: {valor.nome} (ID: {valor.id})")
+            elif resultado and op == 'atualizar':
+                self.logger.info(f"Contato atualizado: {valor.nome} (ID: {valor.id})")
+            elif resultado:
+                self.logger.info(f"Contato excluído: ID {valor}")
+        return resultados
+
+    @sincronizado
+    def criar_em_lote(self, contatos, emails_unicos=False):
+        """
+        Cria vários contatos com uma única gravação.
+
+        Args:
+            contatos (list): Objetos Contato a serem criados
+            emails_unicos (bool): Recusa contatos cujo email já esteja em uso
+
+        Returns:
+            list: Contatos criados com ID atribuído (None onde a gravação falhou)
+        """
+        return self.executar_lote([('criar', contato) for contato in contatos], emails_unicos)
+
+    @sincronizado
+    def atualizar_em_lote(self, contatos, emails_unicos=False):
+        """
+        Atualiza vários contatos existentes com uma única gravação.
+
+        Args:
+            contatos (list): Objetos Contato a serem atualizados
+            emails_unicos (bool): Recusa alterações para um email já em uso
+
+        Returns:
+            list: True/False para cada contato, na ordem recebida
+        """
+        return self.executar_lote([('atualizar', contato) for contato in contatos], emails_unicos)
+
+    @sincronizado
+    def excluir_em_lote(self, ids):
+        """
+        Exclui vários contatos com uma única gravação.
+
+        Args:
+            ids (list): IDs dos contatos a serem excluídos
+
+        Returns:
+            list: True/False para cada ID, na ordem recebida
+        """
+        return self.executar_lote([('excluir', id) for id in ids])
@@ -0,0 +1,219 @@
+import re
+import unicodedata
+
+
+def _texto(valor):
+    """
+    Converte o valor de um campo em texto; números informados pela API, como
+    um telefone numérico, são normalizados pela sua representação.
+
+    Args:
+        valor: Valor do campo (None resulta em texto vazio)
+
+    Returns:
+        str: Texto do valor
+    """
+    return '' if valor is None else str(valor)
+
+
+def chave_busca(texto):
+    """
+    Calcula a chave de busca de um texto: decomposição Unicode (NFKD),
+    remoção dos diacríticos e casefold, de modo que "João", "JOAO" e "joão"
+    resultem na mesma chave.
+
+    Args:
+        texto (str): Texto original
+
+    Returns:
+        str: Chave normalizada
+    """
+    texto = _texto(texto)
+    if texto.isascii():
+        # Sem acentos a decomposição não altera o texto
+        return texto.casefold()
+    decomposto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in decomposto if not unicodedata.combining(c)).casefold()
+
+
+def termos(texto):
+    """
+    Divide um texto em termos de busca textual (palavras já normalizadas
+    por chave_busca).
+
+    Args:
+        texto (str): Texto original
+
+    Returns:
+        list: Termos na ordem em que aparecem
+    """
+    return re.findall(r'\w+', chave_busca(texto))
+
+
+def termos_telefone(texto):
+    """
+    Divide um telefone em termos de busca: os grupos de dígitos como
+    digitados e, além deles, o número completo normalizado por chave_telefone.
+
+    Args:
+        texto (str): Telefone como digitado
+
+    Returns:
+        list: Termos do telefone
+    """
+    resultado = termos(texto)
+    chave = chave_telefone(texto)
+    if chave and chave not in resultado:
+        resultado.append(chave)
+    return resultado
+
+
+def chave_telefone(texto):
+    """
+    Calcula a chave de busca de um telefone: apenas os dígitos do número
+    nacional (DDD + número), sem o prefixo de discagem "0" nem o código do
+    país 55, de modo que "(11) 99999-9999" e "+55 11 99999-9999" resultem na
+    mesma chave.
+
+    Args:
+        texto (str): Telefone como digitado
+
+    Returns:
+        str: Chave normalizada (vazia se não houver dígitos)
+    """
+    digitos = ''.join(c for c in _texto(texto) if c in '0123456789').lstrip('0')
+    if len(digitos) in (12, 13) and digitos.startswith('55'):
+        digitos = digitos[2:]
+    return digitos
+
+
+def chave_email(texto):
+    """
+    Calcula a chave de comparação de um email (sem espaços nas pontas e com
+    casefold), de modo que "Ana@Exemplo.com" e "ana@exemplo.com" coincidam.
+
+    Args:
+        texto (str): Email como digitado
+
+    Returns:
+        str: Chave normalizada (vazia se não houver email)
+    """
+    return _texto(texto).strip().casefold()
+
+
+def distancia_trecho(termo, texto, maximo):
+    """
+    Calcula a menor distância de edição (Levenshtein) entre o termo e
+    qualquer trecho do texto, de modo que "mraia" fique a 2 edições de
+    "ana maria souza".
+
+    Usa o algoritmo de vetores de bits de Myers: a coluna da programação
+    dinâmica é representada pelas diferenças entre células vizinhas, em dois
+    inteiros com um bit por caractere do termo, e cada caractere do texto a
+    atualiza com um número fixo de operações sobre esses inteiros.
+
+    Args:
+        termo (str): Termo buscado, já normalizado
+        texto (str): Texto onde o termo é procurado, já normalizado
+        maximo (int): Maior distância de interesse
+
+    Returns:
+        int: Distância encontrada ou None se for maior que o máximo
+    """
+    if not termo:
+        return 0
+    # Bits das posições do termo onde cada caractere aparece
+    posicoes = {}
+    for i, caractere in enumerate(termo):
+        posicoes[caractere] = posicoes.get(caractere, 0) | (1 << i)
+    mascara = (1 << len(termo)) - 1
+    ultimo = 1 << (len(termo) - 1)
+
+    # Diferenças verticais positivas e negativas da coluna atual; o trecho pode
+    # começar em qualquer posição, por isso a primeira linha é toda zero e a
+    # distância na última linha começa no tamanho do termo
+    positivos, negativos = mascara, 0
+    distancia = menor = len(termo)
+    for caractere in texto:
+        iguais = posicoes.get(caractere, 0)
+        xv = iguais | negativos
+        xh = (((iguais & positivos) + positivos) ^ positivos) | iguais
+        ph = negativos | (~(xh | positivos) & mascara)
+        mh = positivos & xh
+        if ph & ultimo:
+            distancia += 1
+        elif mh & ultimo:
+            distancia -= 1
+            if distancia < menor:
+                menor = distancia
+        ph = (ph << 1) & mascara
+        mh = (mh << 1) & mascara
+        positivos = mh | (~(xv | ph) & mascara)
+        negativos = ph & xv
+    return menor if menor <= maximo else None
+
+
+def tolerancia(termo):
+    """
+    Obtém a quantidade de erros de digitação aceita para um termo.
+
+    Args:
+        termo (str): Termo buscado, já normalizado
+
+    Returns:
+        int: Distância de edição máxima
+    """
+    return max(1, len(termo) // 4)
+
+
+def partes_termo(termo, quantidade):
+    """
+    Divide o termo em partes consecutivas de tamanhos o mais iguais possível;
+    usado pelas buscas aproximadas, já que k edições alteram no máximo k de
+    k + 1 partes.
+
+    Args:
+        termo (str): Termo a dividir
+        quantidade (int): Quantidade de partes (no máximo len(termo))
+
+    Returns:
+        list: Partes do termo, na ordem
+    """
+    tamanho, resto = divmod(len(termo), quantidade)
+    partes = []
+    inicio = 0
+    for i in range(quantidade):
+        fim = inicio + tamanho + (i < resto)
+        partes.append(termo[inicio:fim])
+        inicio = fim
+    return partes
+
+
+def condicao_filtros(filtros):
+    """
+    Cria o predicado que verifica um registro contra os filtros de busca,
+    com as mesmas regras dos índices: trecho do nome comparado por
+    chave_busca, telefone e email comparados pelas suas chaves e categoria
+    exata. Usado pelas buscas que percorrem os registros um a um.
+
+    Args:
+        filtros (dict): Filtros entre 'nome', 'categoria_id' (None seleciona
+                        os registros sem categoria), 'telefone' e 'email'
+
+    Returns:
+        callable: Recebe o registro e retorna True se ele atende a todos
+    """
+    condicoes = []
+    if 'categoria_id' in filtros:
+        categoria_id = filtros['categoria_id']
+        condicoes.append(lambda registro: registro.get('categoria_id') == categoria_id)
+    if 'telefone' in filtros:
+        telefone = chave_telefone(filtros['telefone'])
+        condicoes.append(lambda registro: bool(telefone) and chave_telefone(registro.get('telefone')) == telefone)
+    if 'email' in filtros:
+        email = chave_email(filtros['email'])
+        condicoes.append(lambda registro: bool(email) and chave_email(registro.get('email')) == email)
+    if 'nome' in filtros:
+        nome = chave_busca(filtros['nome'])
+        condicoes.append(lambda registro: nome in chave_busca(registro.get('nome')))
+    return lambda registro: all(condicao(registro) for condicao in condicoes)
@@ -0,0 +1,79 @@
+import os
+from repositories.armazenamento import trava_arquivo
+
+
+class Sequencia:
+    """
+    Contador de IDs persistido em arquivo, um por coleção.
+
+    Os IDs são sempre crescentes e nunca reutilizados, mesmo após a exclusão
+    do último registro ou a reinicialização da aplicação. A leitura e o
+    incremento acontecem sob uma trava de arquivo, então vários workers podem
+    alocar IDs ao mesmo tempo sem repetição.
+    """
+    def __init__(self, caminho):
+        """
+        Inicializa a sequência.
+
+        Args:
+            caminho (str): Caminho do arquivo que guarda o último ID alocado
+        """
+        self.caminho = caminho
+        self.lock_path = f"{caminho}.lock"
+
+    def _ler(self):
+        """
+        Lê o último ID alocado.
+
+        Returns:
+            int: Último ID ou None se o arquivo não existir ou for inválido
+        """
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as file:
+                return int(file.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def _gravar(self, valor):
+        """
+        Grava o último ID alocado de forma atômica.
+
+        Args:
+            valor (int): Último ID alocado
+        """
+        temp_path = f"{self.caminho}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(str(valor))
+        os.replace(temp_path, self.caminho)
+
+    def proximo(self, valor_inicial):
+        """
+        Aloca o próximo ID.
+
+        Args:
+            valor_inicial (callable): Retorna o maior ID existente; só é chamado
+                                      quando a sequência ainda não foi criada
+
+        Returns:
+            int: ID alocado
+        """
+        return self.reservar(valor_inicial, 1)[0]
+
+    def reservar(self, valor_inicial, quantidade):
+        """
+        Aloca um bloco de IDs consecutivos com um único acesso ao arquivo.
+
+        Args:
+            valor_inicial (callable): Retorna o maior ID existente; só é chamado
+                                      quando a sequência ainda não foi criada
+            quantidade (int): Quantidade de IDs a alocar
+
+        Returns:
+            list: IDs alocados, em ordem crescente
+        """
+        with trava_arquivo(self.lock_path):
+            atual = self._ler()
+            if atual is None:
+                atual = valor_inicial()
+            self._gravar(atual + quantidade)
+        return list(range(atual + 1, atual + quantidade + 1))
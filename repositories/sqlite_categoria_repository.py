@@ -0,0 +1,273 @@
+import os
+import sqlite3
+from types import MappingProxyType
+from models.categoria import Categoria, VisaoCategoria
+from logger_singleton import Logger
+from repositories.formatos import Codec
+from repositories.sqlite_conexao import ConexaoSqlite, carregar_backend_json, consulta_textual
+
+COLUNAS = "id, nome, descricao"
+SQL_INSERIR = "INSERT INTO categorias (nome, descricao) VALUES (?, ?)"
+SQL_ATUALIZAR = "UPDATE categorias SET nome = ?, descricao = ? WHERE id = ?"
+SQL_EXCLUIR = "DELETE FROM categorias WHERE id = ?"
+
+class SqliteCategoriaRepository:
+    def __init__(self, data_path='data', armazenamento='json', formato='json', compressao=None):
+        """
+        Inicializa o repositório de categorias em SQLite. Na primeira
+        inicialização do banco, as categorias e os contatos do backend JSON
+        no mesmo diretório são importados.
+
+        Args:
+            data_path (str): Caminho para o diretório de dados
+            armazenamento (str): Mecanismo do backend JSON de onde os dados
+                                 são importados ('json' ou 'log')
+            formato (str): Formato dos arquivos do backend JSON
+            compressao (str, optional): Compressão dos arquivos do backend JSON
+        """
+        self.logger = Logger.get_instance()
+        self.data_path = data_path
+        self.db_path = os.path.join(data_path, 'agenda.db')
+        self._conexao = ConexaoSqlite(self.db_path, importar=lambda: carregar_backend_json(
+            data_path, armazenamento, Codec(formato, compressao), self.logger
+        ))
+
+    def _consultar(self, sql, parametros=(), converter=Categoria.from_dict):
+        """
+        Executa uma consulta e converte as linhas em categorias.
+
+        Args:
+            sql (str): Consulta SQL
+            parametros (tuple): Parâmetros da consulta
+            converter (callable): Função que recebe cada linha como dicionário
+
+        Returns:
+            list: Lista de objetos Categoria (ou do tipo criado por converter)
+        """
+        try:
+            linhas = self._conexao.obter().execute(sql, parametros).fetchall()
+        except sqlite3.Error as e:
+            self.logger.error(f"Erro ao consultar categorias: {str(e)}")
+            return []
+        return [converter(dict(linha)) for linha in linhas]
+
+    def listar_todas(self):
+        """
+        Lista todas as categorias.
+
+        Returns:
+            list: Lista de objetos Categoria
+        """
+        return self._consultar(f"SELECT {COLUNAS} FROM categorias ORDER BY id")
+
+    def listar_visoes(self):
+        """
+        Lista todas as categorias como visões somente leitura, sem criar
+        objetos Categoria; usado pelas listagens que apenas exibem ou serializam.
+
+        Returns:
+            list: Lista de objetos VisaoCategoria
+        """
+        return self._consultar(f"SELECT {COLUNAS} FROM categorias ORDER BY id", converter=VisaoCategoria)
+
+    def registro_por_id(self):
+        """
+        Obtém as categorias como visões somente leitura indexadas por ID, para
+        resolver a categoria de vários contatos sem uma consulta por contato.
+
+        Returns:
+            MappingProxyType: Categorias indexadas por ID, somente leitura
+        """
+        return MappingProxyType({categoria.id: categoria for categoria in self.listar_visoes()})
+
+    def buscar_por_id(self, id):
+        """
+        Busca uma categoria pelo ID.
+
+        Args:
+            id (int): ID da categoria
+
+        Returns:
+            Categoria: Objeto categoria encontrado ou None
+        """
+        resultados = self._consultar(f"SELECT {COLUNAS} FROM categorias WHERE id = ?", (id,))
+        return resultados[0] if resultados else None
+
+    def pontuar_texto(self, termos):
+        """
+        Calcula a relevância de cada categoria (nome e descrição) para uma
+        busca textual.
+
+        Args:
+            termos (list): Termos da consulta, já normalizados
+
+        Returns:
+            dict: Pontuação indexada pelo ID da categoria
+        """
+        if not termos:
+            return {}
+        try:
+            linhas = self._conexao.obter().execute(
+                "SELECT rowid, bm25(categorias_fts) FROM categorias_fts WHERE categorias_fts MATCH ?",
+                (consulta_textual(termos),)
+            ).fetchall()
+        except sqlite3.Error as e:
+            self.logger.error(f"Erro ao pesquisar categorias: {str(e)}")
+            return {}
+        # bm25() retorna valores menores para os documentos mais relevantes
+        return {id: -pontuacao for id, pontuacao in linhas}
+
+    def criar(self, categoria):
+        """
+        Cria uma nova categoria.
+
+        Args:
+            categoria (Categoria): Objeto categoria a ser criado
+
+        Returns:
+            Categoria: Categoria criada com ID atribuído
+        """
+        try:
+            with self._conexao.obter() as conexao:
+                cursor = conexao.execute(
+                    SQL_INSERIR,
+                    (categoria.nome, categoria.descricao)
+                )
+            categoria.id = cursor.lastrowid
+        except sqlite3.Error as e:
+            self.logger.error(f"Falha ao criar categoria: {categoria.nome} ({str(e)})")
+            return None
+
+        self.logger.info(f"Categoria criada: {categoria.nome} (ID: {categoria.id})")
+        return categoria
+
+    def atualizar(self, categoria):
+        """
+        Atualiza uma categoria existente.
+
+        Args:
+            categoria (Categoria): Objeto categoria a ser atualizado
+
+        Returns:
+            bool: True se atualizado com sucesso, False caso contrário
+        """
+        if not categoria.id:
+            self.logger.error("Tentativa de atualizar categoria sem ID")
+            return False
+
+        try:
+            with self._conexao.obter() as conexao:
+                cursor = conexao.execute(
+                    SQL_ATUALIZAR,
+                    (categoria.nome, categoria.descricao, categoria.id)
+                )
+        except sqlite3.Error as e:
+            self.logger.error(f"Falha ao salvar atualização da categoria: {categoria.nome} ({str(e)})")
+            return False
+
+        if cursor.rowcount == 0:
+            self.logger.warning(f"Categoria não encontrada para atualização: ID {categoria.id}")
+            return False
+
+        self.logger.info(f"Categoria atualizada: {categoria.nome} (ID: {categoria.id})")
+        return True
+
+    def excluir(self, id):
+        """
+        Exclui uma categoria pelo ID.
+
+        Args:
+            id (int): ID da categoria a ser excluída
+
+        Returns:
+            bool: True se excluída com sucesso, False caso contrário
+        """
+        try:
+            with self._conexao.obter() as conexao:
+                cursor = conexao.execute(SQL_EXCLUIR, (id,))
+        except sqlite3.Error as e:
+            self.logger.error(f"Falha ao excluir categoria: ID {id} ({str(e)})")
+            return False
+
+        if cursor.rowcount == 0:
+            self.logger.warning(f"Categoria não encontrada para exclusão: ID {id}")
+            return False
+
+        self.logger.info(f"Categoria excluída: ID {id}")
+        return True
+
+    def executar_lote(self, operacoes):
+        """
+        Aplica várias operações em uma única transação.
+
+        Args:
+            operacoes (list): Tuplas ('criar', Categoria), ('atualizar', Categoria)
+                              ou ('excluir', id)
+
+        Returns:
+            list: Resultado de cada operação, na ordem recebida: a categoria
+                  criada (ou None) para 'criar' e True/False para as demais
+
+        Raises:
+            ValueError: Se alguma operação não for conhecida
+        """
+        for op, _ in operacoes:
+            if op not in ('criar', 'atualizar', 'excluir'):
+                raise ValueError(f"Operação desconhecida: {op}")
+
+        resultados = []
+        try:
+            with self._conexao.obter() as conexao:
+                for op, valor in operacoes:
+                    if op == 'criar':
+                        cursor = conexao.execute(SQL_INSERIR, (valor.nome, valor.descricao))
+                        valor.id = cursor.lastrowid
+                        resultados.append(valor)
+                    elif op == 'atualizar':
+                        cursor = conexao.execute(SQL_ATUALIZAR, (valor.nome, valor.descricao, valor.id))
+                        resultados.append(cursor.rowcount > 0)
+                    else:
+                        cursor = conexao.execute(SQL_EXCLUIR, (valor,))
+                        resultados.append(cursor.rowcount > 0)
+        except sqlite3.Error as e:
+            self.logger.error(f"Falha ao aplicar lote de categorias: {str(e)}")
+            return [None if op == 'criar' else False for op, _ in operacoes]
+
+        self.logger.info(f"Lote de categorias aplicado: {len(operacoes)} operações")
+        return resultados
+
+    def criar_em_lote(self, categorias):
+        """
+        Cria várias categorias em uma única transação.
+
+        Args:
+            categorias (list): Objetos Categoria a serem criados
+
+        Returns:
+            list: Categorias criadas com ID atribuído (None onde a gravação falhou)
+        """
+        return self.executar_lote([('criar', categoria) for categoria in categorias])
+
+    def atualizar_em_lote(self, categorias):
+        """
+        Atualiza várias categorias existentes em uma única transação.
+
+        Args:
+            categorias (list): Objetos Categoria a serem atualizados
+
+        Returns:
+            list: True/False para cada categoria, na ordem recebida
+        """
+        return self.executar_lote([('atualizar', categoria) for categoria in categorias])
+
+    def excluir_em_lote(self, ids):
+        """
+        Exclui várias categorias em uma única transação.
+
+        Args:
+            ids (list): IDs das categorias a serem excluídas
+
+        Returns:
+            list: True/False para cada ID, na ordem recebida
+        """
+        return self.executar_lote([('excluir', id) for id in ids])
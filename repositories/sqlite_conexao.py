@@ -0,0 +1,312 @@
+import os
+import sqlite3
+import threading
+from repositories.armazenamento import carregar_existente
+from repositories.normalizacao import chave_busca, chave_email, chave_telefone
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS categorias (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT NOT NULL,
+    descricao TEXT
+);
+
+CREATE TABLE IF NOT EXISTS contatos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT NOT NULL,
+    telefone TEXT NOT NULL,
+    email TEXT,
+    categoria_id INTEGER,
+    nome_busca TEXT,
+    telefone_busca TEXT,
+    email_busca TEXT
+);
+"""
+
+INDICES = """
+CREATE INDEX IF NOT EXISTS idx_contatos_categoria ON contatos (categoria_id);
+CREATE INDEX IF NOT EXISTS idx_contatos_nome_busca ON contatos (nome_busca);
+CREATE INDEX IF NOT EXISTS idx_contatos_telefone_busca ON contatos (telefone_busca);
+CREATE INDEX IF NOT EXISTS idx_contatos_email_busca ON contatos (email_busca);
+"""
+
+
+# Índices de texto completo (FTS5) mantidos por gatilhos a cada escrita
+BUSCA_TEXTUAL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS contatos_fts USING fts5(
+    nome, email, telefone, telefone_busca,
+    content='contatos', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS contatos_fts_inserir AFTER INSERT ON contatos BEGIN
+    INSERT INTO contatos_fts (rowid, nome, email, telefone, telefone_busca)
+    VALUES (new.id, new.nome, new.email, new.telefone, new.telefone_busca);
+END;
+
+CREATE TRIGGER IF NOT EXISTS contatos_fts_excluir AFTER DELETE ON contatos BEGIN
+    INSERT INTO contatos_fts (contatos_fts, rowid, nome, email, telefone, telefone_busca)
+    VALUES ('delete', old.id, old.nome, old.email, old.telefone, old.telefone_busca);
+END;
+
+CREATE TRIGGER IF NOT EXISTS contatos_fts_atualizar AFTER UPDATE ON contatos BEGIN
+    INSERT INTO contatos_fts (contatos_fts, rowid, nome, email, telefone, telefone_busca)
+    VALUES ('delete', old.id, old.nome, old.email, old.telefone, old.telefone_busca);
+    INSERT INTO contatos_fts (rowid, nome, email, telefone, telefone_busca)
+    VALUES (new.id, new.nome, new.email, new.telefone, new.telefone_busca);
+END;
+
+-- Trigramas da chave de busca do nome, para busca por trecho e busca aproximada;
+-- a chave já é normalizada, então o tokenizador não altera maiúsculas
+CREATE VIRTUAL TABLE IF NOT EXISTS contatos_trigramas USING fts5(
+    nome_busca, content='contatos', content_rowid='id', tokenize='trigram case_sensitive 1'
+);
+
+CREATE TRIGGER IF NOT EXISTS contatos_trigramas_inserir AFTER INSERT ON contatos BEGIN
+    INSERT INTO contatos_trigramas (rowid, nome_busca) VALUES (new.id, new.nome_busca);
+END;
+
+CREATE TRIGGER IF NOT EXISTS contatos_trigramas_excluir AFTER DELETE ON contatos BEGIN
+    INSERT INTO contatos_trigramas (contatos_trigramas, rowid, nome_busca)
+    VALUES ('delete', old.id, old.nome_busca);
+END;
+
+CREATE TRIGGER IF NOT EXISTS contatos_trigramas_atualizar AFTER UPDATE ON contatos BEGIN
+    INSERT INTO contatos_trigramas (contatos_trigramas, rowid, nome_busca)
+    VALUES ('delete', old.id, old.nome_busca);
+    INSERT INTO contatos_trigramas (rowid, nome_busca) VALUES (new.id, new.nome_busca);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS categorias_fts USING fts5(
+    nome, descricao,
+    content='categorias', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS categorias_fts_inserir AFTER INSERT ON categorias BEGIN
+    INSERT INTO categorias_fts (rowid, nome, descricao) VALUES (new.id, new.nome, new.descricao);
+END;
+
+CREATE TRIGGER IF NOT EXISTS categorias_fts_excluir AFTER DELETE ON categorias BEGIN
+    INSERT INTO categorias_fts (categorias_fts, rowid, nome, descricao)
+    VALUES ('delete', old.id, old.nome, old.descricao);
+END;
+
+CREATE TRIGGER IF NOT EXISTS categorias_fts_atualizar AFTER UPDATE ON categorias BEGIN
+    INSERT INTO categorias_fts (categorias_fts, rowid, nome, descricao)
+    VALUES ('delete', old.id, old.nome, old.descricao);
+    INSERT INTO categorias_fts (rowid, nome, descricao) VALUES (new.id, new.nome, new.descricao);
+END;
+"""
+
+# Contador de alterações da tabela de contatos, usado para invalidar caches
+VERSOES = """
+CREATE TABLE IF NOT EXISTS versoes (
+    tabela TEXT PRIMARY KEY,
+    valor INTEGER NOT NULL
+);
+
+INSERT OR IGNORE INTO versoes (tabela, valor) VALUES ('contatos', 0);
+
+CREATE TRIGGER IF NOT EXISTS contatos_versao_inserir AFTER INSERT ON contatos BEGIN
+    UPDATE versoes SET valor = valor + 1 WHERE tabela = 'contatos';
+END;
+
+CREATE TRIGGER IF NOT EXISTS contatos_versao_atualizar AFTER UPDATE ON contatos BEGIN
+    UPDATE versoes SET valor = valor + 1 WHERE tabela = 'contatos';
+END;
+
+CREATE TRIGGER IF NOT EXISTS contatos_versao_excluir AFTER DELETE ON contatos BEGIN
+    UPDATE versoes SET valor = valor + 1 WHERE tabela = 'contatos';
+END;
+"""
+
+# Registro da importação dos dados do backend JSON, feita uma única vez
+IMPORTACOES = """
+CREATE TABLE IF NOT EXISTS importacoes (
+    origem TEXT PRIMARY KEY
+);
+"""
+
+SQL_IMPORTAR_CATEGORIA = "INSERT INTO categorias (id, nome, descricao) VALUES (?, ?, ?)"
+SQL_IMPORTAR_CONTATO = (
+    "INSERT INTO contatos (id, nome, telefone, email, categoria_id, nome_busca, telefone_busca, email_busca) "
+    "VALUES (?1, ?2, ?3, ?4, ?5, chave_busca(?2), chave_telefone(?3), chave_email(?4))"
+)
+
+# Colunas de busca calculadas a partir de outras colunas na escrita
+COLUNAS_DERIVADAS = {
+    'nome_busca': 'chave_busca(nome)',
+    'telefone_busca': 'chave_telefone(telefone)',
+    'email_busca': 'chave_email(email)'
+}
+
+
+def _criar_busca_textual(conexao):
+    """
+    Cria os índices de texto completo e, quando eles ainda não existiam,
+    preenche-os com os dados atuais.
+
+    Args:
+        conexao (sqlite3.Connection): Conexão aberta
+    """
+    tabelas = ('contatos_fts', 'contatos_trigramas', 'categorias_fts')
+    existentes = {
+        linha[0] for linha in
+        conexao.execute(f"SELECT name FROM sqlite_master WHERE name IN ({', '.join('?' * len(tabelas))})", tabelas)
+    }
+    conexao.executescript(BUSCA_TEXTUAL)
+    for tabela in tabelas:
+        if tabela not in existentes:
+            conexao.execute(f"INSERT INTO {tabela} ({tabela}) VALUES ('rebuild')")
+
+
+def _migrar(conexao):
+    """
+    Adiciona a bancos criados por versões anteriores as colunas de busca
+    que ainda não existem, preenchidas a partir dos dados atuais.
+
+    Args:
+        conexao (sqlite3.Connection): Conexão aberta
+    """
+    colunas = {linha[1] for linha in conexao.execute("PRAGMA table_info(contatos)")}
+    for coluna, expressao in COLUNAS_DERIVADAS.items():
+        if coluna not in colunas:
+            conexao.execute(f"ALTER TABLE contatos ADD COLUMN {coluna} TEXT")
+            conexao.execute(f"UPDATE contatos SET {coluna} = {expressao}")
+
+
+def carregar_backend_json(data_path, armazenamento, codec, logger):
+    """
+    Carrega as categorias e os contatos do backend JSON para a importação.
+
+    Args:
+        data_path (str): Diretório de dados do backend JSON
+        armazenamento (str): Mecanismo do backend JSON ('json' ou 'log')
+        codec (Codec): Formato configurado dos arquivos
+        logger (Logger): Logger da aplicação
+
+    Returns:
+        dict: Registros de 'categorias' e 'contatos' como dicionários
+    """
+    return {
+        nome: carregar_existente(armazenamento, os.path.join(data_path, f'{nome}.json'), nome, logger, codec)
+        for nome in ('categorias', 'contatos')
+    }
+
+
+class ConexaoSqlite:
+    """
+    Fornece conexões SQLite reutilizadas por thread para um arquivo de banco.
+
+    Conexões sqlite3 não podem ser compartilhadas entre threads, então cada
+    thread abre a sua na primeira consulta e a reutiliza nas seguintes. O banco
+    opera em modo WAL, permitindo leitores concorrentes durante uma escrita.
+    """
+    def __init__(self, db_path, importar=None):
+        """
+        Inicializa a fábrica de conexões e cria o esquema se necessário.
+
+        Args:
+            db_path (str): Caminho do arquivo de banco de dados
+            importar (callable, optional): Função que retorna os registros de
+                                           'categorias' e 'contatos' a importar
+                                           na primeira inicialização do banco
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+
+        diretorio = os.path.dirname(db_path)
+        if diretorio and not os.path.exists(diretorio):
+            os.makedirs(diretorio)
+
+        with self.obter() as conexao:
+            conexao.executescript(ESQUEMA)
+            _migrar(conexao)
+            conexao.executescript(INDICES)
+            _criar_busca_textual(conexao)
+            conexao.executescript(VERSOES)
+            conexao.executescript(IMPORTACOES)
+        if importar is not None:
+            self._importar(importar)
+
+    def _importar(self, carregar):
+        """
+        Importa os dados do backend JSON uma única vez, na primeira
+        inicialização do banco.
+
+        A importação é registrada na mesma transação em que é feita, iniciada
+        com BEGIN IMMEDIATE: entre processos que iniciam juntos, apenas um
+        importa. Um banco que já tem dados apenas registra a importação, sem
+        receber os registros.
+
+        Args:
+            carregar (callable): Função que retorna os registros a importar
+        """
+        conexao = self.obter()
+        with conexao:
+            conexao.execute("BEGIN IMMEDIATE")
+            if conexao.execute("INSERT OR IGNORE INTO importacoes (origem) VALUES ('json')").rowcount == 0:
+                return
+            if conexao.execute(
+                "SELECT EXISTS (SELECT 1 FROM contatos) OR EXISTS (SELECT 1 FROM categorias)"
+            ).fetchone()[0]:
+                return
+            # Os IDs são mantidos; o AUTOINCREMENT continua a partir do maior
+            dados = carregar()
+            conexao.executemany(SQL_IMPORTAR_CATEGORIA, (
+                (registro.get('id'), registro.get('nome'), registro.get('descricao'))
+                for registro in dados['categorias']
+            ))
+            conexao.executemany(SQL_IMPORTAR_CONTATO, (
+                (registro.get('id'), registro.get('nome'), registro.get('telefone'),
+                 registro.get('email'), registro.get('categoria_id'))
+                for registro in dados['contatos']
+            ))
+
+    def obter(self):
+        """
+        Obtém a conexão da thread atual, abrindo-a se necessário.
+
+        A conexão pode ser usada como gerenciador de contexto para delimitar
+        uma transação (commit ao sair, rollback em caso de exceção).
+
+        Returns:
+            sqlite3.Connection: Conexão da thread atual
+        """
+        conexao = getattr(self._local, 'conexao', None)
+        if conexao is None:
+            conexao = sqlite3.connect(self.db_path, timeout=30)
+            conexao.row_factory = sqlite3.Row
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("PRAGMA synchronous=NORMAL")
+            conexao.create_function('chave_busca', 1, chave_busca, deterministic=True)
+            conexao.create_function('chave_telefone', 1, chave_telefone, deterministic=True)
+            conexao.create_function('chave_email', 1, chave_email, deterministic=True)
+            self._local.conexao = conexao
+        return conexao
+
+
+def consulta_textual(termos):
+    """
+    Monta a expressão MATCH do FTS5 que encontra qualquer um dos termos.
+
+    Args:
+        termos (list): Termos da consulta, já normalizados
+
+    Returns:
+        str: Expressão de consulta
+    """
+    return ' OR '.join(f'"{termo}"' for termo in termos)
+
+
+def consulta_trecho(trecho):
+    """
+    Monta a expressão MATCH do índice de trigramas que encontra os nomes
+    que contêm o trecho. O trecho precisa ter ao menos três caracteres.
+
+    Args:
+        trecho (str): Trecho já normalizado
+
+    Returns:
+        str: Expressão de consulta
+    """
+    return '"' + trecho.replace('"', '""') + '"'
@@ -0,0 +1,718 @@
+import heapq
+import os
+import sqlite3
+import threading
+from models.contato import Contato, VisaoContato
+from logger_singleton import Logger
+from repositories.formatos import Codec
+from repositories.sqlite_conexao import ConexaoSqlite, carregar_backend_json, consulta_textual, consulta_trecho
+from repositories.normalizacao import (
+    chave_busca, chave_email, chave_telefone, distancia_trecho, partes_termo, tolerancia
+)
+
+COLUNAS = "id, nome, telefone, email, categoria_id"
+# As chaves de busca de nome, telefone e email são calculadas uma única vez, na escrita
+SQL_INSERIR = (
+    "INSERT INTO contatos (nome, telefone, email, categoria_id, nome_busca, telefone_busca, email_busca) "
+    "VALUES (?1, ?2, ?3, ?4, chave_busca(?1), chave_telefone(?2), chave_email(?3))"
+)
+SQL_ATUALIZAR = (
+    "UPDATE contatos SET nome = ?1, telefone = ?2, email = ?3, categoria_id = ?4, "
+    "nome_busca = chave_busca(?1), telefone_busca = chave_telefone(?2), "
+    "email_busca = chave_email(?3) WHERE id = ?5"
+)
+SQL_EXCLUIR = "DELETE FROM contatos WHERE id = ?"
+# Trechos a partir deste tamanho são buscados no índice de trigramas
+TAMANHO_TRIGRAMA = 3
+
+class SqliteContatoRepository:
+    def __init__(self, data_path='data', armazenamento='json', formato='json', compressao=None):
+        """
+        Inicializa o repositório de contatos em SQLite. Na primeira
+        inicialização do banco, as categorias e os contatos do backend JSON
+        no mesmo diretório são importados.
+
+        Args:
+            data_path (str): Caminho para o diretório de dados
+            armazenamento (str): Mecanismo do backend JSON de onde os dados
+                                 são importados ('json' ou 'log')
+            formato (str): Formato dos arquivos do backend JSON
+            compressao (str, optional): Compressão dos arquivos do backend JSON
+        """
+        self.logger = Logger.get_instance()
+        self.data_path = data_path
+        self.db_path = os.path.join(data_path, 'agenda.db')
+        self._conexao = ConexaoSqlite(self.db_path, importar=lambda: carregar_backend_json(
+            data_path, armazenamento, Codec(formato, compressao), self.logger
+        ))
+        self._escrita = threading.local()
+
+    def _consultar(self, sql, parametros=(), converter=Contato.from_dict):
+        """
+        Executa uma consulta e converte as linhas em contatos.
+
+        Args:
+            sql (str): Consulta SQL
+            parametros (tuple): Parâmetros da consulta
+            converter (callable): Função que recebe cada linha como dicionário
+
+        Returns:
+            list: Lista de objetos Contato (ou do tipo criado por converter)
+        """
+        try:
+            linhas = self._conexao.obter().execute(sql, parametros).fetchall()
+        except sqlite3.Error as e:
+            self.logger.error(f"Erro ao consultar contatos: {str(e)}")
+            return []
+        return [converter(dict(linha)) for linha in linhas]
+
+    def versao(self):
+        """
+        Obtém o contador de alterações dos contatos, incrementado por gatilhos
+        a cada escrita de qualquer processo.
+
+        Returns:
+            int: Versão atual dos dados
+        """
+        try:
+            return self._conexao.obter().execute(
+                "SELECT valor FROM versoes WHERE tabela = 'contatos'"
+            ).fetchone()[0]
+        except sqlite3.Error as e:
+            self.logger.error(f"Erro ao consultar versão dos contatos: {str(e)}")
+            return None
+
+    def versoes_escrita(self):
+        """
+        Obtém as versões dos dados imediatamente antes e depois da última
+        escrita feita pela thread atual, lidas na transação da escrita.
+
+        Returns:
+            tuple: (versão anterior, versão posterior) ou None se a thread
+                   ainda não gravou
+        """
+        return getattr(self._escrita, 'versoes', None)
+
+    def _iniciar_escrita(self, conexao):
+        """
+        Inicia a transação de escrita com BEGIN IMMEDIATE, que obtém a trava
+        de escrita do banco antes de qualquer leitura: nenhuma outra conexão
+        grava até o fim da transação.
+
+        Args:
+            conexao (sqlite3.Connection): Conexão da thread atual
+
+        Returns:
+            int: Versão dos dados antes da escrita
+        """
+        conexao.execute("BEGIN IMMEDIATE")
+        return self.versao()
+
+    def listar_todos(self):
+        """
+        Lista todos os contatos.
+
+        Returns:
+            list: Lista de objetos Contato
+        """
+        return self._consultar(f"SELECT {COLUNAS} FROM contatos ORDER BY id")
+
+    def listar_visoes(self):
+        """
+        Lista todos os contatos como visões somente leitura, sem criar
+        objetos Contato; usado pelas listagens que apenas exibem ou serializam.
+
+        Returns:
+            list: Lista de objetos VisaoContato
+        """
+        return self._consultar(f"SELECT {COLUNAS} FROM contatos ORDER BY id", converter=VisaoContato)
+
+    def listar_pagina(self, limite, apos_id=None):
+        """
+        Lista uma página de contatos em ordem de ID (paginação por cursor).
+
+        Args:
+            limite (int): Quantidade máxima de contatos na página
+            apos_id (int, optional): Cursor; a página começa após este ID
+
+        Returns:
+            tuple: (lista de objetos Contato, cursor da próxima página ou None)
+        """
+        contatos = self._consultar(
+            f"SELECT {COLUNAS} FROM contatos WHERE id > ? ORDER BY id LIMIT ?",
+            (apos_id if apos_id is not None else 0, limite + 1)
+        )
+        proximo = contatos[limite - 1].id if len(contatos) > limite else None
+        return contatos[:limite], proximo
+
+    def buscar_por_id(self, id):
+        """
+        Busca um contato pelo ID.
+
+        Args:
+            id (int): ID do contato
+
+        Returns:
+            Contato: Objeto contato encontrado ou None
+        """
+        resultados = self._consultar(f"SELECT {COLUNAS} FROM contatos WHERE id = ?", (id,))
+        return resultados[0] if resultados else None
+
+    def buscar_por_nome(self, nome):
+        """
+        Busca contatos pelo nome (parcial).
+
+        Args:
+            nome (str): Nome ou parte do nome a ser buscado
+
+        Returns:
+            list: Lista de objetos Contato que correspondem à busca
+        """
+        return self.filtrar({'nome': nome})
+
+    def filtrar(self, filtros):
+        """
+        Busca contatos que atendem a todos os filtros informados, combinados
+        em uma única consulta; o planejador do SQLite escolhe o índice mais
+        seletivo.
+
+        Args:
+            filtros (dict): Filtros a aplicar, entre 'nome', 'categoria_id',
+                            'telefone' e 'email' (categoria_id None seleciona
+                            os contatos sem categoria)
+
+        Returns:
+            list: Lista de objetos Contato
+        """
+        where, parametros = self._condicoes(filtros)
+        return self._consultar(f"SELECT {COLUNAS} FROM contatos {where}ORDER BY id", parametros)
+
+    def filtrar_pagina(self, filtros, limite, apos_id=None):
+        """
+        Lista uma página, em ordem de ID, dos contatos que atendem aos
+        filtros (paginação por cursor); a consulta lê apenas as linhas da
+        página.
+
+        Args:
+            filtros (dict): Filtros aceitos por filtrar
+            limite (int): Quantidade máxima de contatos na página
+            apos_id (int, optional): Cursor; a página começa após este ID
+
+        Returns:
+            tuple: (lista de objetos Contato, cursor da próxima página ou None)
+        """
+        where, parametros = self._condicoes(filtros, apos_id)
+        contatos = self._consultar(
+            f"SELECT {COLUNAS} FROM contatos {where}ORDER BY id LIMIT ?",
+            parametros + [limite + 1]
+        )
+        proximo = contatos[limite - 1].id if len(contatos) > limite else None
+        return contatos[:limite], proximo
+
+    def _condicoes(self, filtros, apos_id=None):
+        """
+        Monta a cláusula WHERE correspondente aos filtros.
+
+        Args:
+            filtros (dict): Filtros aceitos por filtrar
+            apos_id (int, optional): Cursor; seleciona só os IDs maiores
+
+        Returns:
+            tuple: (cláusula WHERE seguida de espaço ou string vazia, parâmetros)
+        """
+        condicoes = []
+        parametros = []
+        if apos_id is not None:
+            condicoes.append("id > ?")
+            parametros.append(apos_id)
+        if 'categoria_id' in filtros:
+            condicoes.append("categoria_id IS ?")
+            parametros.append(filtros['categoria_id'])
+        if 'telefone' in filtros:
+            condicoes.append("telefone_busca = ?")
+            parametros.append(chave_telefone(filtros['telefone']))
+        if 'email' in filtros:
+            condicoes.append("email_busca = ?")
+            parametros.append(chave_email(filtros['email']))
+        if 'nome' in filtros:
+            condicao, valores = self._condicao_trecho(chave_busca(filtros['nome']))
+            condicoes.append(condicao)
+            parametros.extend(valores)
+
+        where = f"WHERE {' AND '.join(condicoes)} " if condicoes else ""
+        return where, parametros
+
+    def _condicao_trecho(self, chave):
+        """
+        Monta a condição que seleciona os contatos cujo nome contém o trecho.
+        Trechos com ao menos três caracteres são buscados no índice de
+        trigramas (contatos_trigramas); os menores, que não formam um
+        trigrama, são comparados com o nome_busca de cada contato.
+
+        Args:
+            chave (str): Trecho já normalizado
+
+        Returns:
+            tuple: (condição SQL, parâmetros)
+        """
+        if len(chave) >= TAMANHO_TRIGRAMA:
+            return (
+                "id IN (SELECT rowid FROM contatos_trigramas WHERE contatos_trigramas MATCH ?)",
+                [consulta_trecho(chave)]
+            )
+        return "instr(nome_busca, ?) > 0", [chave]
+
+    def iterar_registros(self, filtros=None):
+        """
+        Percorre os contatos como dicionários, um por vez, lendo as linhas do
+        cursor conforme são consumidas; usado nas exportações.
+
+        Args:
+            filtros (dict, optional): Filtros aceitos por filtrar
+
+        Yields:
+            dict: Cada contato que atende aos filtros, em ordem de ID
+        """
+        where, parametros = self._condicoes(filtros or {})
+        try:
+            cursor = self._conexao.obter().execute(f"SELECT {COLUNAS} FROM contatos {where}ORDER BY id", parametros)
+            for linha in cursor:
+                yield VisaoContato(dict(linha)).to_dict()
+        except sqlite3.Error as e:
+            self.logger.error(f"Erro ao consultar contatos: {str(e)}")
+
+    def pesquisar_texto(self, termos, pontuacoes_categorias=None, limite=20):
+        """
+        Busca textual em nome, email e telefone, ordenada por relevância
+        (BM25 do índice FTS5).
+
+        Args:
+            termos (list): Termos da consulta, já normalizados
+            pontuacoes_categorias (dict, optional): Relevância de cada categoria
+                                                    para a consulta, somada à
+                                                    dos seus contatos
+            limite (int): Quantidade máxima de resultados
+
+        Returns:
+            list: Pares (Contato, pontuação) do mais para o menos relevante
+        """
+        conexao = self._conexao.obter()
+        pontuacoes_categorias = pontuacoes_categorias or {}
+        try:
+            # bm25() retorna valores menores para os documentos mais relevantes
+            pontuacoes = {
+                id: -pontuacao for id, pontuacao in conexao.execute(
+                    "SELECT rowid, bm25(contatos_fts) FROM contatos_fts WHERE contatos_fts MATCH ?",
+                    (consulta_textual(termos),)
+                )
+            } if termos else {}
+            if pontuacoes_categorias:
+                linhas = conexao.execute(
+                    "SELECT id, categoria_id FROM contatos WHERE categoria_id IN "
+                    f"({', '.join('?' * len(pontuacoes_categorias))})",
+                    list(pontuacoes_categorias)
+                )
+                for id, categoria_id in linhas:
+                    pontuacoes[id] = pontuacoes.get(id, 0.0) + pontuacoes_categorias[categoria_id]
+        except sqlite3.Error as e:
+            self.logger.error(f"Erro ao pesquisar contatos: {str(e)}")
+            return []
+
+        melhores = heapq.nlargest(limite, pontuacoes.items(), key=lambda item: (item[1], -item[0]))
+        if not melhores:
+            return []
+        contatos = {
+            contato.id: contato for contato in self._consultar(
+                f"SELECT {COLUNAS} FROM contatos WHERE id IN ({', '.join('?' * len(melhores))})",
+                [id for id, _ in melhores]
+            )
+        }
+        return [(contatos[id], pontuacao) for id, pontuacao in melhores if id in contatos]
+
+    def buscar_aproximado(self, termo, limite=10, filtros=None):
+        """
+        Busca contatos cujo nome se aproxima do termo, tolerando erros de
+        digitação, do mais parecido para o menos parecido. Os demais filtros
+        restringem os candidatos na própria consulta.
+
+        Args:
+            termo (str): Nome ou parte do nome, possivelmente com erros
+            limite (int): Quantidade máxima de contatos
+            filtros (dict, optional): Filtros aceitos por filtrar, exceto o nome
+
+        Returns:
+            list: Lista de objetos Contato
+        """
+        termo = chave_busca(termo)
+        maximo = tolerancia(termo)
+        where, restricoes = self._condicoes(filtros or {})
+        where = f"{where}AND " if where else "WHERE "
+        try:
+            conexao = self._conexao.obter()
+            # Havendo contatos suficientes que contêm o termo sem erros, a
+            # distância dos demais não precisa ser calculada
+            condicao, parametros = self._condicao_trecho(termo)
+            exatos = conexao.execute(
+                f"SELECT id, nome_busca FROM contatos {where}{condicao} ORDER BY id LIMIT ?",
+                restricoes + parametros + [limite]
+            ).fetchall()
+            if len(exatos) >= limite:
+                linhas = exatos
+            else:
+                condicao, parametros = self._candidatos_aproximados(termo, maximo)
+                linhas = conexao.execute(
+                    f"SELECT id, nome_busca FROM contatos {where}({condicao})", restricoes + parametros
+                ).fetchall()
+        except sqlite3.Error as e:
+            self.logger.error(f"Erro ao consultar contatos: {str(e)}")
+            return []
+
+        resultados = []
+        for id, nome_busca in linhas:
+            distancia = distancia_trecho(termo, nome_busca or '', maximo)
+            if distancia is not None:
+                resultados.append((distancia, id))
+        ids = [id for _, id in sorted(resultados)[:limite]]
+        if not ids:
+            return []
+
+        contatos = self._consultar(
+            f"SELECT {COLUNAS} FROM contatos WHERE id IN ({', '.join('?' * len(ids))})",
+            ids
+        )
+        ordem = {id: posicao for posicao, id in enumerate(ids)}
+        return sorted(contatos, key=lambda contato: ordem[contato.id])
+
+    def _candidatos_aproximados(self, termo, maximo):
+        """
+        Monta a condição que seleciona os candidatos da busca aproximada pelo
+        índice de trigramas, com o mesmo filtro de IndiceTrigramas: um trecho
+        a até `maximo` edições do termo contém ao menos (trigramas do termo -
+        3 * maximo) deles. Nos termos curtos demais para esse filtro, os
+        candidatos são os nomes que contêm alguma das `maximo` + 1 partes do
+        termo. Só os candidatos passam pelo cálculo da distância.
+
+        Args:
+            termo (str): Termo já normalizado
+            maximo (int): Distância de edição máxima
+
+        Returns:
+            tuple: (condição SQL, parâmetros)
+        """
+        trigramas = sorted({termo[i:i + TAMANHO_TRIGRAMA] for i in range(len(termo) - TAMANHO_TRIGRAMA + 1)})
+        minimo = len(trigramas) - TAMANHO_TRIGRAMA * maximo
+        if minimo > 0:
+            postings = " UNION ALL ".join(
+                ["SELECT rowid FROM contatos_trigramas WHERE contatos_trigramas MATCH ?"] * len(trigramas)
+            )
+            return (
+                f"id IN (SELECT rowid FROM ({postings}) GROUP BY rowid HAVING COUNT(*) >= ?)",
+                [consulta_trecho(trigrama) for trigrama in trigramas] + [minimo]
+            )
+        if len(termo) > maximo:
+            condicoes = []
+            parametros = []
+            for parte in partes_termo(termo, maximo + 1):
+                condicao, valores = self._condicao_trecho(parte)
+                condicoes.append(condicao)
+                parametros.extend(valores)
+            return ' OR '.join(condicoes), parametros
+        # Com tantas edições quanto caracteres, qualquer contato atende
+        return "1", []
+
+    def autocompletar(self, prefixo, limite=10):
+        """
+        Busca contatos cujo nome começa com o prefixo, em ordem alfabética.
+
+        Args:
+            prefixo (str): Início do nome
+            limite (int): Quantidade máxima de contatos
+
+        Returns:
+            list: Lista de objetos Contato
+        """
+        # Faixa [prefixo, prefixo + maior caractere) sobre o índice de nome_busca
+        prefixo = chave_busca(prefixo)
+        return self._consultar(
+            f"SELECT {COLUNAS} FROM contatos WHERE nome_busca >= ? AND nome_busca < ? "
+            "ORDER BY nome_busca, id LIMIT ?",
+            (prefixo, prefixo + '\U0010ffff', limite)
+        )
+
+    def buscar_por_telefone(self, telefone):
+        """
+        Busca contatos pelo telefone, ignorando a formatação.
+
+        Args:
+            telefone (str): Telefone em qualquer formato
+
+        Returns:
+            list: Lista de objetos Contato com o telefone
+        """
+        chave = chave_telefone(telefone)
+        if not chave:
+            return []
+        return self._consultar(
+            f"SELECT {COLUNAS} FROM contatos WHERE telefone_busca = ? ORDER BY id",
+            (chave,)
+        )
+
+    def buscar_por_email(self, email):
+        """
+        Busca contatos pelo email exato, sem diferenciar maiúsculas.
+
+        Args:
+            email (str): Email a ser buscado
+
+        Returns:
+            list: Lista de objetos Contato com o email
+        """
+        chave = chave_email(email)
+        if not chave:
+            return []
+        return self._consultar(
+            f"SELECT {COLUNAS} FROM contatos WHERE email_busca = ? ORDER BY id",
+            (chave,)
+        )
+
+    def buscar_por_categoria(self, categoria_id):
+        """
+        Busca contatos por categoria.
+
+        Args:
+            categoria_id (int): ID da categoria
+
+        Returns:
+            list: Lista de objetos Contato que pertencem à categoria
+        """
+        return self._consultar(
+            f"SELECT {COLUNAS} FROM contatos WHERE categoria_id IS ? ORDER BY id",
+            (categoria_id,)
+        )
+
+    def contar_por_categoria(self, filtros=None):
+        """
+        Conta os contatos de cada categoria, opcionalmente apenas entre os
+        que atendem aos filtros.
+
+        Args:
+            filtros (dict, optional): Filtros aceitos por filtrar
+
+        Returns:
+            dict: Quantidade de contatos indexada pelo ID da categoria
+                  (contatos sem categoria ficam na chave None)
+        """
+        where, parametros = self._condicoes(filtros or {})
+        try:
+            linhas = self._conexao.obter().execute(
+                f"SELECT categoria_id, COUNT(*) FROM contatos {where}GROUP BY categoria_id",
+                parametros
+            ).fetchall()
+        except sqlite3.Error as e:
+            self.logger.error(f"Erro ao contar contatos: {str(e)}")
+            return {}
+        return {categoria_id: total for categoria_id, total in linhas}
+
+    def _email_em_uso(self, conexao, contato):
+        """
+        Verifica se outro contato já usa o email. Chamado dentro da transação
+        iniciada por _iniciar_escrita, para que nenhuma outra conexão grave
+        entre a verificação e a escrita.
+
+        Args:
+            conexao (sqlite3.Connection): Conexão da transação em andamento
+            contato (Contato): Contato a ser gravado
+
+        Returns:
+            bool: True se o email pertence a outro contato
+        """
+        chave = chave_email(contato.email)
+        if chave and conexao.execute(
+            "SELECT 1 FROM contatos WHERE email_busca = ? AND id IS NOT ? LIMIT 1",
+            (chave, contato.id)
+        ).fetchone():
+            self.logger.warning(f"Email já cadastrado, contato recusado: {contato.email}")
+            return True
+        return False
+
+    def criar(self, contato, emails_unicos=False):
+        """
+        Cria um novo contato.
+
+        Args:
+            contato (Contato): Objeto contato a ser criado
+            emails_unicos (bool): Recusa o contato se outro já usar o email
+
+        Returns:
+            Contato: Contato criado com ID atribuído ou None se falhar
+        """
+        try:
+            with self._conexao.obter() as conexao:
+                antes = self._iniciar_escrita(conexao)
+                if emails_unicos and self._email_em_uso(conexao, contato):
+                    return None
+                cursor = conexao.execute(
+                    SQL_INSERIR,
+                    (contato.nome, contato.telefone, contato.email, contato.categoria_id)
+                )
+                self._escrita.versoes = (antes, self.versao())
+            contato.id = cursor.lastrowid
+        except sqlite3.Error as e:
+            self.logger.error(f"Falha ao criar contato: {contato.nome} ({str(e)})")
+            return None
+
+        self.logger.info(f"Contato criado: {contato.nome} (ID: {contato.id})")
+        return contato
+
+    def atualizar(self, contato, emails_unicos=False):
+        """
+        Atualiza um contato existente.
+
+        Args:
+            contato (Contato): Objeto contato a ser atualizado
+            emails_unicos (bool): Recusa a alteração se outro contato já usar o email
+
+        Returns:
+            bool: True se atualizado com sucesso, False caso contrário
+        """
+        if not contato.id:
+            self.logger.error("Tentativa de atualizar contato sem ID")
+            return False
+
+        try:
+            with self._conexao.obter() as conexao:
+                antes = self._iniciar_escrita(conexao)
+                if emails_unicos and self._email_em_uso(conexao, contato):
+                    return False
+                cursor = conexao.execute(
+                    SQL_ATUALIZAR,
+                    (contato.nome, contato.telefone, contato.email, contato.categoria_id, contato.id)
+                )
+                self._escrita.versoes = (antes, self.versao())
+        except sqlite3.Error as e:
+            self.logger.error(f"Falha ao salvar atualização do contato: {contato.nome} ({str(e)})")
+            return False
+
+        if cursor.rowcount == 0:
+            self.logger.warning(f"Contato não encontrado para atualização: ID {contato.id}")
+            return False
+
+        self.logger.info(f"Contato atualizado: {contato.nome} (ID: {contato.id})")
+        return True
+
+    def excluir(self, id):
+        """
+        Exclui um contato pelo ID.
+
+        Args:
+            id (int): ID do contato a ser excluído
+
+        Returns:
+            bool: True se excluído com sucesso, False caso contrário
+        """
+        try:
+            with self._conexao.obter() as conexao:
+                antes = self._iniciar_escrita(conexao)
+                cursor = conexao.execute(SQL_EXCLUIR, (id,))
+                self._escrita.versoes = (antes, self.versao())
+        except sqlite3.Error as e:
+            self.logger.error(f"Falha ao excluir contato: ID {id} ({str(e)})")
+            return False
+
+        if cursor.rowcount == 0:
+            self.logger.warning(f"Contato não encontrado para exclusão: ID {id}")
+            return False
+
+        self.logger.info(f"Contato excluído: ID {id}")
+        return True
+
+    def executar_lote(self, operacoes, emails_unicos=False):
+        """
+        Aplica várias operações em uma única transação.
+
+        Args:
+            operacoes (list): Tuplas ('criar', Contato), ('atualizar', Contato)
+                              ou ('excluir', id)
+            emails_unicos (bool): Recusa criações e atualizações cujo email já
+                                  pertence a outro contato, inclusive a um
+                                  gravado antes no mesmo lote
+
+        Returns:
+            list: Resultado de cada operação, na ordem recebida: o contato
+                  criado (ou None) para 'criar' e True/False para as demais
+
+        Raises:
+            ValueError: Se alguma operação não for conhecida
+        """
+        for op, _ in operacoes:
+            if op not in ('criar', 'atualizar', 'excluir'):
+                raise ValueError(f"Operação desconhecida: {op}")
+
+        resultados = []
+        try:
+            with self._conexao.obter() as conexao:
+                antes = self._iniciar_escrita(conexao)
+                for op, valor in operacoes:
+                    if op != 'excluir' and emails_unicos and self._email_em_uso(conexao, valor):
+                        resultados.append(None if op == 'criar' else False)
+                    elif op == 'criar':
+                        cursor = conexao.execute(
+                            SQL_INSERIR,
+                            (valor.nome, valor.telefone, valor.email, valor.categoria_id)
+                        )
+                        valor.id = cursor.lastrowid
+                        resultados.append(valor)
+                    elif op == 'atualizar':
+                        cursor = conexao.execute(
+                            SQL_ATUALIZAR,
+                            (valor.nome, valor.telefone, valor.email, valor.categoria_id, valor.id)
+                        )
+                        resultados.append(cursor.rowcount > 0)
+                    else:
+                        cursor = conexao.execute(SQL_EXCLUIR, (valor,))
+                        resultados.append(cursor.rowcount > 0)
+                self._escrita.versoes = (antes, self.versao())
+        except sqlite3.Error as e:
+            self.logger.error(f"Falha ao aplicar lote de contatos: {str(e)}")
+            return [None if op == 'criar' else False for op, _ in operacoes]
+
+        self.logger.info(f"Lote de contatos aplicado: {len(operacoes)} operações")
+        return resultados
+
+    def criar_em_lote(self, contatos, emails_unicos=False):
+        """
+        Cria vários contatos em uma única transação.
+
+        Args:
+            contatos (list): Objetos Contato a serem criados
+            emails_unicos (bool): Recusa contatos cujo email já esteja em uso
+
+        Returns:
+            list: Contatos criados com ID atribuído (None onde a gravação falhou)
+        """
+        return self.executar_lote([('criar', contato) for contato in contatos], emails_unicos)
+
+    def atualizar_em_lote(self, contatos, emails_unicos=False):
+        """
+        Atualiza vários contatos existentes em uma única transação.
+
+        Args:
+            contatos (list): Objetos Contato a serem atualizados
+            emails_unicos (bool): Recusa alterações para um email já em uso
+
+        Returns:
+            list: True/False para cada contato, na ordem recebida
+        """
+        return self.executar_lote([('atualizar', contato) for contato in contatos], emails_unicos)
+
+    def excluir_em_lote(self, ids):
+        """
+        Exclui vários contatos em uma única transação.
+
+        Args:
+            ids (list): IDs dos contatos a serem excluídos
+
+        Returns:
+            list: True/False para cada ID, na ordem recebida
+        """
+        return self.executar_lote([('excluir', id) for id in ids])
@@ -0,0 +1,306 @@
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate, compress, count
+from operator import add
+from repositories.normalizacao import chave_busca, chave_email, chave_telefone
+
+# Separa os valores de uma coluna de texto empacotada
+SEPARADOR = '\x00'
+
+
+def _e(mascara, outra):
+    """
+    Combina duas máscaras de linhas com E lógico, em uma única operação
+    sobre inteiros em vez de um laço por linha.
+
+    Args:
+        mascara (bytes): Máscara com 1 nas linhas selecionadas
+        outra (bytes): Máscara do mesmo tamanho
+
+    Returns:
+        bytes: Máscara com as linhas presentes em ambas
+    """
+    resultado = int.from_bytes(mascara, 'little') & int.from_bytes(outra, 'little')
+    return resultado.to_bytes(len(mascara), 'little')
+
+
+def _exceto(mascara, outra):
+    """
+    Remove de uma máscara de linhas as linhas marcadas em outra (E NÃO).
+
+    Args:
+        mascara (bytes): Máscara com 1 nas linhas selecionadas
+        outra (bytes): Máscara do mesmo tamanho com 1 nas linhas excluídas
+
+    Returns:
+        bytes: Máscara com as linhas da primeira ausentes da segunda
+    """
+    resultado = int.from_bytes(mascara, 'little') & ~int.from_bytes(outra, 'little')
+    return resultado.to_bytes(len(mascara), 'little')
+
+
+class ColunaTexto:
+    """
+    Coluna de textos normalizados de uma TabelaColunar.
+
+    Para as buscas, os valores são empacotados sob demanda em uma única
+    string (delimitada por SEPARADOR), percorrida com str.find; a linha de
+    cada ocorrência é localizada por busca binária no início das linhas.
+    """
+    def __init__(self, normalizar):
+        """
+        Inicializa a coluna vazia.
+
+        Args:
+            normalizar (callable): Função que calcula o valor armazenado
+        """
+        self.normalizar = normalizar
+        self._valores = []
+        self._texto = None
+        self._inicios = None
+
+    def anexar(self, valor):
+        """
+        Acrescenta o valor de uma nova linha.
+
+        Args:
+            valor (str): Valor original do campo
+        """
+        self._valores.append(self.normalizar(valor).replace(SEPARADOR, ''))
+        self._texto = None
+
+    def apagar(self, linha):
+        """
+        Esvazia o valor de uma linha removida.
+
+        Args:
+            linha (int): Posição da linha
+        """
+        self._valores[linha] = ''
+        self._texto = None
+
+    def compactar(self, mascara):
+        """
+        Mantém apenas as linhas marcadas na máscara.
+
+        Args:
+            mascara (bytes): Máscara com 1 nas linhas mantidas
+        """
+        self._valores = list(compress(self._valores, mascara))
+        self._texto = None
+
+    def _empacotar(self):
+        """Monta a string empacotada e o início de cada linha nela."""
+        if self._texto is None:
+            self._texto = SEPARADOR + SEPARADOR.join(self._valores) + SEPARADOR
+            # A linha i começa depois de i + 1 separadores e dos valores anteriores
+            self._inicios = list(map(add, accumulate(map(len, self._valores), initial=0), count(1)))
+
+    def contem(self, trecho):
+        """
+        Seleciona as linhas cujo valor contém o trecho.
+
+        Args:
+            trecho (str): Trecho já normalizado, não vazio
+
+        Returns:
+            bytearray: Máscara com 1 nas linhas encontradas
+        """
+        self._empacotar()
+        mascara = bytearray(len(self._valores))
+        texto, inicios = self._texto, self._inicios
+        posicao = texto.find(trecho)
+        while posicao != -1:
+            linha = bisect_right(inicios, posicao) - 1
+            mascara[linha] = 1
+            # Uma ocorrência basta; a busca continua na linha seguinte
+            posicao = texto.find(trecho, inicios[linha + 1]) if linha + 1 < len(inicios) else -1
+        return mascara
+
+    def igual(self, valor):
+        """
+        Seleciona as linhas cujo valor é exatamente o informado.
+
+        Args:
+            valor (str): Valor já normalizado, não vazio
+
+        Returns:
+            bytearray: Máscara com 1 nas linhas encontradas
+        """
+        self._empacotar()
+        mascara = bytearray(len(self._valores))
+        alvo = SEPARADOR + valor + SEPARADOR
+        posicao = self._texto.find(alvo)
+        while posicao != -1:
+            mascara[bisect_right(self._inicios, posicao + 1) - 1] = 1
+            # O separador final da ocorrência é o inicial da próxima linha
+            posicao = self._texto.find(alvo, posicao + len(alvo) - 1)
+        return mascara
+
+
+class TabelaColunar:
+    """
+    Representação colunar dos contatos, mantida como índice secundário da
+    coleção para consultas que agregam a agenda inteira.
+
+    IDs e categorias ficam em array('q') (inteiros de 64 bits) e nome,
+    telefone e email em colunas de texto empacotadas. Filtros produzem
+    máscaras de bytes, combinadas e contadas por operações sobre a coluna
+    inteira (map, compress, Counter, str.find) em vez de um laço em Python
+    sobre os registros.
+
+    Nenhum valor de categoria é reservado: contatos sem categoria e linhas
+    removidas (até a próxima compactação) são marcados em máscaras próprias,
+    de modo que qualquer categoria_id, inclusive 0 ou negativo, é contado
+    como tal.
+
+    Registros cujo ID ou categoria não é um inteiro de 64 bits (por exemplo,
+    "3" em um arquivo editado à mão) ficam fora da tabela; enquanto houver
+    algum, a tabela não está completa e quem a consulta deve usar os demais
+    índices da coleção.
+    """
+    def __init__(self):
+        """Inicializa a tabela vazia."""
+        self.ids = array('q')
+        self.categorias = array('q')
+        self._vivas = bytearray()
+        self._sem_categoria = bytearray()
+        self._colunas = {
+            'nome': ColunaTexto(chave_busca),
+            'telefone': ColunaTexto(chave_telefone),
+            'email': ColunaTexto(chave_email)
+        }
+        self._linhas = {}
+        self._removidas = 0
+        self._fora = set()
+
+    def __len__(self):
+        return len(self._linhas)
+
+    @property
+    def completa(self):
+        """True se todos os registros da coleção estão na tabela."""
+        return not self._fora
+
+    @property
+    def fora(self):
+        """Quantidade de registros que não puderam ser representados."""
+        return len(self._fora)
+
+    def adicionar(self, registro):
+        """
+        Acrescenta a linha de um registro. Um registro cujo ID ou categoria
+        não cabe nas colunas numéricas fica fora da tabela (ver completa).
+
+        Args:
+            registro (dict): Registro do contato
+        """
+        id = registro.get('id')
+        categoria_id = registro.get('categoria_id')
+        # As colunas numéricas são validadas antes de qualquer alteração
+        try:
+            ids = array('q', (id, categoria_id or 0))
+        except (TypeError, OverflowError):
+            self._fora.add(id)
+            return
+        self._linhas[id] = len(self.ids)
+        self.ids.append(ids[0])
+        self.categorias.append(ids[1])
+        self._vivas.append(1)
+        self._sem_categoria.append(categoria_id is None)
+        for campo, coluna in self._colunas.items():
+            coluna.anexar(registro.get(campo))
+
+    def remover(self, registro):
+        """
+        Marca a linha de um registro como removida.
+
+        Args:
+            registro (dict): Registro do contato
+        """
+        linha = self._linhas.pop(registro.get('id'), None)
+        if linha is None:
+            self._fora.discard(registro.get('id'))
+            return
+        self._vivas[linha] = 0
+        for coluna in self._colunas.values():
+            coluna.apagar(linha)
+        self._removidas += 1
+        if self._removidas > len(self._linhas):
+            self._compactar()
+
+    def _compactar(self):
+        """Descarta as linhas removidas e recalcula as posições."""
+        vivas = bytes(self._vivas)
+        self.ids = array('q', compress(self.ids, vivas))
+        self.categorias = array('q', compress(self.categorias, vivas))
+        self._sem_categoria = bytearray(compress(self._sem_categoria, vivas))
+        self._vivas = bytearray(b'\x01' * len(self.ids))
+        for coluna in self._colunas.values():
+            coluna.compactar(vivas)
+        self._linhas = dict(zip(self.ids, count()))
+        self._removidas = 0
+
+    def selecionar(self, filtros=None):
+        """
+        Calcula a máscara das linhas que atendem a todos os filtros.
+
+        Args:
+            filtros (dict, optional): Filtros entre 'nome' (trecho),
+                                      'categoria_id' (None seleciona os contatos
+                                      sem categoria), 'telefone' e 'email'
+                                      (iguais após normalização)
+
+        Returns:
+            bytes: Máscara com 1 nas linhas selecionadas
+        """
+        filtros = filtros or {}
+        mascara = bytes(self._vivas)
+        if 'categoria_id' in filtros:
+            alvo = filtros['categoria_id']
+            if alvo is None:
+                mascara = _e(mascara, self._sem_categoria)
+            else:
+                iguais = bytes(map(alvo.__eq__, self.categorias))
+                mascara = _exceto(_e(mascara, iguais), self._sem_categoria)
+        for campo, coluna in self._colunas.items():
+            if campo not in filtros:
+                continue
+            chave = coluna.normalizar(filtros[campo]).replace(SEPARADOR, '')
+            if not chave:
+                return bytes(len(mascara))
+            parcial = coluna.contem(chave) if campo == 'nome' else coluna.igual(chave)
+            mascara = _e(mascara, parcial)
+        return mascara
+
+    def ids_selecionados(self, mascara):
+        """
+        Obtém os IDs das linhas selecionadas.
+
+        Args:
+            mascara (bytes): Máscara retornada por selecionar
+
+        Returns:
+            list: IDs das linhas selecionadas
+        """
+        return list(compress(self.ids, mascara))
+
+    def contar_por_categoria(self, mascara=None):
+        """
+        Conta as linhas selecionadas de cada categoria.
+
+        Args:
+            mascara (bytes, optional): Máscara retornada por selecionar; sem
+                                       ela todas as linhas são contadas
+
+        Returns:
+            dict: Quantidade indexada pelo ID da categoria (contatos sem
+                  categoria ficam na chave None)
+        """
+        selecionadas = bytes(self._vivas) if mascara is None else mascara
+        contagens = Counter(compress(self.categorias, _exceto(selecionadas, self._sem_categoria)))
+        sem_categoria = _e(selecionadas, self._sem_categoria).count(1)
+        if sem_categoria:
+            contagens[None] = sem_categoria
+        return dict(contagens)
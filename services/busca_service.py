@@ -0,0 +1,42 @@
+from repositories.fabrica import obter_contato_repository, obter_categoria_repository
+from repositories.normalizacao import termos
+from logger_singleton import Logger
+
+class BuscaService:
+    # Peso dos campos da categoria em relação aos campos do próprio contato
+    PESO_CATEGORIA = 0.5
+    
+    def __init__(self):
+        """
+        Inicializa o serviço de busca textual sobre contatos e categorias. O
+        backend de persistência é escolhido pelas variáveis de ambiente e os
+        repositórios são compartilhados com os demais serviços (ver
+        repositories/fabrica.py).
+        """
+        self.logger = Logger.get_instance()
+        self.contato_repository = obter_contato_repository()
+        self.categoria_repository = obter_categoria_repository()
+    
+    def pesquisar(self, consulta, limite=20):
+        """
+        Busca contatos por nome, email e telefone e pelo nome e descrição da
+        categoria, do mais para o menos relevante.
+        
+        Args:
+            consulta (str): Texto livre da busca
+            limite (int): Quantidade máxima de resultados
+            
+        Returns:
+            list: Pares (Contato, pontuação)
+        """
+        termos_consulta = termos(consulta)
+        if not termos_consulta:
+            self.logger.warning("Busca textual vazia")
+            return []
+        
+        self.logger.info(f"Busca textual: {consulta}")
+        pontuacoes_categorias = {
+            categoria_id: pontuacao * self.PESO_CATEGORIA
+            for categoria_id, pontuacao in self.categoria_repository.pontuar_texto(termos_consulta).items()
+        }
+        return self.contato_repository.pesquisar_texto(termos_consulta, pontuacoes_categorias, limite)
\ No newline at end of file
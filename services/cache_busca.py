@@ -0,0 +1,126 @@
+import threading
+from collections import OrderedDict
+from models.contato import Contato
+from repositories.normalizacao import chave_busca
+
+class CacheBuscaNome:
+    """
+    Cache LRU dos resultados recentes da busca de contatos por nome.
+    
+    Uma consulta que contém um termo já em cache (por exemplo "anab" depois
+    de "ana") é respondida filtrando os candidatos daquele termo, sem nova
+    consulta ao repositório. As escritas feitas pelo serviço atualizam as
+    entradas afetadas; alterações feitas por outros processos mudam a versão
+    do repositório e descartam o cache inteiro.
+    
+    As entradas guardam os contatos como tuplas imutáveis; cada consulta
+    recebe objetos Contato novos, que pode alterar sem afetar o cache.
+    
+    Cada escrita do serviço informa as versões lidas pelo repositório sob as
+    travas da própria escrita, imediatamente antes e depois dela. Se a versão
+    anterior não é a do cache, outra escrita aconteceu no intervalo e o cache
+    é descartado em vez de avançar para a nova versão.
+    """
+    def __init__(self, versao, capacidade=128):
+        """
+        Inicializa o cache vazio.
+        
+        Args:
+            versao (callable): Função que retorna a versão atual dos dados
+            capacidade (int): Quantidade máxima de termos em cache
+        """
+        self._versao_atual = versao
+        self.capacidade = capacidade
+        self._entradas = OrderedDict()
+        self._versao = None
+        self._lock = threading.Lock()
+    
+    def _verificar_versao(self):
+        """Descarta o cache se os dados foram alterados por fora do serviço."""
+        versao = self._versao_atual()
+        if versao != self._versao:
+            self._entradas.clear()
+            self._versao = versao
+    
+    def _acompanhar(self, versoes):
+        """
+        Avança o cache para a versão gravada por uma escrita do serviço.
+        
+        Args:
+            versoes (tuple): Versões antes e depois da escrita, ou None se o
+                             repositório não as informou
+        
+        Returns:
+            bool: True se as entradas podem ser atualizadas com a escrita;
+                  False se o cache foi descartado
+        """
+        antes, depois = versoes or (None, None)
+        # A versão posterior já é a do cache nas demais operações do mesmo lote
+        valido = versoes is not None and self._versao in (antes, depois)
+        if not valido:
+            self._entradas.clear()
+        self._versao = depois
+        return valido
+    
+    def buscar(self, termo, consultar):
+        """
+        Obtém os contatos cujo nome contém o termo.
+        
+        Args:
+            termo (str): Nome ou parte do nome
+            consultar (callable): Busca no repositório, usada quando nenhum
+                                  termo em cache contém a consulta
+        
+        Returns:
+            list: Lista de novos objetos Contato
+        """
+        chave = chave_busca(termo)
+        with self._lock:
+            self._verificar_versao()
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                # Os resultados de "anab" estão contidos nos de qualquer trecho
+                # dele; o menor conjunto em cache é o ponto de partida
+                bases = [valor for outra, valor in self._entradas.items() if outra in chave]
+                if bases:
+                    entrada = [(nome, valores) for nome, valores in min(bases, key=len) if chave in nome]
+                else:
+                    entrada = [(chave_busca(contato.nome), contato.to_tuple()) for contato in consultar(termo)]
+                self._entradas[chave] = entrada
+                while len(self._entradas) > self.capacidade:
+                    self._entradas.popitem(last=False)
+            self._entradas.move_to_end(chave)
+            return [Contato.from_tuple(valores) for _, valores in entrada]
+    
+    def registrar(self, contato, versoes):
+        """
+        Atualiza as entradas afetadas pela criação ou alteração de um contato.
+        
+        Args:
+            contato (Contato): Contato gravado
+            versoes (tuple): Versões antes e depois da escrita (ver
+                             versoes_escrita dos repositórios)
+        """
+        nome = chave_busca(contato.nome)
+        valores = contato.to_tuple()
+        with self._lock:
+            if not self._acompanhar(versoes):
+                return
+            for chave, entrada in self._entradas.items():
+                entrada[:] = [item for item in entrada if item[1][0] != contato.id]
+                if chave in nome:
+                    entrada.append((nome, valores))
+    
+    def remover(self, id, versoes):
+        """
+        Retira um contato excluído das entradas em cache.
+        
+        Args:
+            id (int): ID do contato excluído
+            versoes (tuple): Versões antes e depois da escrita
+        """
+        with self._lock:
+            if not self._acompanhar(versoes):
+                return
+            for entrada in self._entradas.values():
+                entrada[:] = [item for item in entrada if item[1][0] != id]
\ No newline at end of file
@@ -1,14 +1,16 @@
-from repositories.categoria_repository import CategoriaRepository
+from repositories.fabrica import obter_categoria_repository
 from models.categoria import Categoria
 from logger_singleton import Logger
 
 class CategoriaService:
     def __init__(self):
         """
-        Inicializa o serviço de categorias.
+        Inicializa o serviço de categorias. O backend de persistência é
+        escolhido pelas variáveis de ambiente e o repositório é compartilhado
+        com os demais serviços (ver repositories/fabrica.py).
         """
         self.logger = Logger.get_instance()
-        self.repository = CategoriaRepository()
+        self.repository = obter_categoria_repository()
     
     def listar_todas(self):
         """
@@ -20,6 +22,27 @@ class CategoriaService:
         self.logger.info("Listando todas as categorias")
         return self.repository.listar_todas()
     
+    def listar_visoes(self):
+        """
+        Lista todas as categorias como visões somente leitura, para listagens
+        que apenas exibem ou serializam os dados.
+        
+        Returns:
+            list: Lista de objetos VisaoCategoria
+        """
+        self.logger.info("Listando todas as categorias")
+        return self.repository.listar_visoes()
+    
+    def registro_por_id(self):
+        """
+        Obtém as categorias compartilhadas indexadas por ID, para resolver a
+        categoria de cada contato de uma listagem.
+        
+        Returns:
+            Mapping: Objetos VisaoCategoria indexados pelo ID
+        """
+        return self.repository.registro_por_id()
+    
     def buscar_por_id(self, id):
         """
         Busca uma categoria pelo ID.
@@ -95,4 +118,111 @@ class CategoriaService:
             bool: True se excluída com sucesso, False caso contrário
         """
         self.logger.info(f"Excluindo categoria: ID {id}")
-        return self.repository.excluir(id)
\ No newline at end of file
+        return self.repository.excluir(id)
+    
+    def _montar_categoria(self, item, id=None):
+        """
+        Monta uma categoria a partir dos dados de um item de lote.
+        
+        Args:
+            item (dict): Dicionário com nome e descricao
+            id (int, optional): ID da categoria, para atualizações
+            
+        Returns:
+            Categoria: Categoria montada ou None se os dados forem insuficientes
+        """
+        if not item.get('nome'):
+            return None
+        return Categoria(id=id, nome=item['nome'], descricao=item.get('descricao'))
+    
+    def criar_em_lote(self, dados):
+        """
+        Cria várias categorias com uma única gravação.
+        
+        Args:
+            dados (list): Dicionários com nome e descricao
+            
+        Returns:
+            list: Categoria criada para cada item, na ordem recebida, ou None
+                  para itens inválidos ou que não puderam ser gravados
+        """
+        categorias = [self._montar_categoria(item) for item in dados]
+        validas = [categoria for categoria in categorias if categoria is not None]
+        if len(validas) < len(categorias):
+            self.logger.warning(f"Lote de criação com {len(categorias) - len(validas)} categorias inválidas")
+        
+        self.logger.info(f"Criando lote de categorias: {len(validas)}")
+        criadas = iter(self.repository.criar_em_lote(validas) if validas else [])
+        return [next(criadas) if categoria is not None else None for categoria in categorias]
+    
+    def atualizar_em_lote(self, dados):
+        """
+        Atualiza várias categorias com uma única gravação.
+        
+        Args:
+            dados (list): Dicionários com id, nome e descricao
+            
+        Returns:
+            list: True/False para cada item, na ordem recebida
+        """
+        categorias = [self._montar_categoria(item, item.get('id')) if item.get('id') else None for item in dados]
+        validas = [categoria for categoria in categorias if categoria is not None]
+        if len(validas) < len(categorias):
+            self.logger.warning(f"Lote de atualização com {len(categorias) - len(validas)} categorias inválidas")
+        
+        self.logger.info(f"Atualizando lote de categorias: {len(validas)}")
+        resultados = iter(self.repository.atualizar_em_lote(validas) if validas else [])
+        return [next(resultados) if categoria is not None else False for categoria in categorias]
+    
+    def excluir_em_lote(self, ids):
+        """
+        Exclui várias categorias com uma única gravação.
+        
+        Args:
+            ids (list): IDs das categorias a serem excluídas
+            
+        Returns:
+            list: True/False para cada ID, na ordem recebida
+        """
+        self.logger.info(f"Excluindo lote de categorias: {len(ids)}")
+        if not ids:
+            return []
+        return self.repository.excluir_em_lote(ids)
+    
+    def executar_lote(self, operacoes):
+        """
+        Aplica um lote misto de criações, atualizações e exclusões com uma
+        única gravação.
+        
+        Args:
+            operacoes (list): Dicionários {'op': 'criar', 'dados': {...}},
+                              {'op': 'atualizar', 'id': id, 'dados': {...}}
+                              ou {'op': 'excluir', 'id': id}
+            
+        Returns:
+            list: Para cada operação, na ordem recebida: a Categoria criada (ou
+                  None) para 'criar' e True/False para as demais
+        """
+        montadas = []
+        for operacao in operacoes:
+            op = operacao.get('op')
+            if op == 'criar':
+                valor = self._montar_categoria(operacao.get('dados') or {})
+            elif op == 'atualizar' and operacao.get('id'):
+                valor = self._montar_categoria(operacao.get('dados') or {}, operacao['id'])
+            elif op == 'excluir' and operacao.get('id'):
+                valor = operacao['id']
+            else:
+                valor = None
+            montadas.append((op, valor))
+        
+        validas = [(op, valor) for op, valor in montadas if valor is not None]
+        if len(validas) < len(montadas):
+            self.logger.warning(f"Lote de categorias com {len(montadas) - len(validas)} operações inválidas")
+        
+        self.logger.info(f"Executando lote de categorias: {len(validas)} operações")
+        resultados = iter(self.repository.executar_lote(validas) if validas else [])
+        return [
+            next(resultados) if valor is not None else (None if op == 'criar' else False)
+            for op, valor in montadas
+        ]
@@ -1,14 +1,36 @@
-from repositories.contato_repository import ContatoRepository
+import os
+from repositories.fabrica import obter_contato_repository
+from repositories.normalizacao import chave_email
+from services.cache_busca import CacheBuscaNome
 from models.contato import Contato
 from logger_singleton import Logger
 
+# Tratamento de emails já cadastrados em outro contato
+POLITICAS_EMAIL = ('permitir', 'avisar', 'rejeitar')
+
 class ContatoService:
-    def __init__(self):
+    def __init__(self, politica_email=None):
         """
-        Inicializa o serviço de contatos.
+        Inicializa o serviço de contatos. O backend de persistência é
+        escolhido pelas variáveis de ambiente e o repositório é compartilhado
+        com os demais serviços (ver repositories/fabrica.py).
+        
+        Args:
+            politica_email (str, optional): 'permitir' aceita emails repetidos,
+                                            'avisar' aceita e registra um aviso,
+                                            'rejeitar' recusa o contato. Padrão:
+                                            variável AGENDA_EMAIL_DUPLICADO ou
+                                            'permitir'
+                                            
+        Raises:
+            ValueError: Se a política não for conhecida
         """
         self.logger = Logger.get_instance()
-        self.repository = ContatoRepository()
+        self.repository = obter_contato_repository()
+        self.politica_email = politica_email or os.environ.get('AGENDA_EMAIL_DUPLICADO', 'permitir')
+        if self.politica_email not in POLITICAS_EMAIL:
+            raise ValueError(f"Política de email desconhecida: {self.politica_email}")
+        self._cache_busca = CacheBuscaNome(lambda: self.repository.versao())
     
     def listar_todos(self):
         """
@@ -20,6 +42,60 @@ class ContatoService:
         self.logger.info("Listando todos os contatos")
         return self.repository.listar_todos()
     
+    def listar_visoes(self):
+        """
+        Lista todos os contatos como visões somente leitura, para listagens
+        que apenas exibem ou serializam os dados.
+        
+        Returns:
+            list: Lista de objetos VisaoContato
+        """
+        self.logger.info("Listando todos os contatos")
+        return self.repository.listar_visoes()
+    
+    def listar_pagina(self, limite, apos_id=None):
+        """
+        Lista uma página de contatos em ordem de ID.
+        
+        Args:
+            limite (int): Quantidade máxima de contatos na página
+            apos_id (int, optional): Cursor; a página começa após este ID
+            
+        Returns:
+            tuple: (lista de objetos Contato, cursor da próxima página ou None)
+        """
+        self.logger.info(f"Listando página de contatos: limite {limite}, após ID {apos_id}")
+        return self.repository.listar_pagina(limite, apos_id)
+    
+    def filtrar_pagina(self, limite, apos_id=None, nome=None, categoria_id=None, telefone=None, email=None):
+        """
+        Lista uma página, em ordem de ID, dos contatos que atendem a todos os
+        filtros informados. O repositório só converte em objetos Contato os
+        contatos da página.
+        
+        Args:
+            limite (int): Quantidade máxima de contatos na página
+            apos_id (int, optional): Cursor; a página começa após este ID
+            nome (str, optional): Nome ou parte do nome
+            categoria_id (int, optional): ID da categoria
+            telefone (str, optional): Telefone em qualquer formato
+            email (str, optional): Email exato
+            
+        Returns:
+            tuple: (lista de objetos Contato, cursor da próxima página ou None)
+        """
+        filtros = {
+            chave: valor for chave, valor in (
+                ('nome', nome), ('categoria_id', categoria_id),
+                ('telefone', telefone), ('email', email)
+            ) if valor is not None and valor != ''
+        }
+        if not filtros:
+            return self.listar_pagina(limite, apos_id)
+        
+        self.logger.info(f"Filtrando página de contatos: {filtros}, limite {limite}, após ID {apos_id}")
+        return self.repository.filtrar_pagina(filtros, limite, apos_id)
+    
     def buscar_por_id(self, id):
         """
         Busca um contato pelo ID.
@@ -48,7 +124,117 @@ class ContatoService:
             return []
         
         self.logger.info(f"Buscando contatos por nome: {nome}")
-        return self.repository.buscar_por_nome(nome)
+        return self._cache_busca.buscar(nome, self.repository.buscar_por_nome)
+    
+    def filtrar(self, nome=None, categoria_id=None, telefone=None, email=None):
+        """
+        Busca contatos que atendem a todos os filtros informados.
+        
+        Args:
+            nome (str, optional): Nome ou parte do nome
+            categoria_id (int, optional): ID da categoria
+            telefone (str, optional): Telefone em qualquer formato
+            email (str, optional): Email exato
+            
+        Returns:
+            list: Lista de objetos Contato
+        """
+        filtros = {
+            chave: valor for chave, valor in (
+                ('nome', nome), ('categoria_id', categoria_id),
+                ('telefone', telefone), ('email', email)
+            ) if valor is not None and valor != ''
+        }
+        if not filtros:
+            return self.listar_todos()
+        if list(filtros) == ['nome']:
+            return self.buscar_por_nome(nome)
+        
+        self.logger.info(f"Filtrando contatos: {filtros}")
+        return self.repository.filtrar(filtros)
+    
+    def exportar(self, nome=None, categoria_id=None, telefone=None, email=None):
+        """
+        Percorre os contatos que atendem aos filtros como dicionários, um por
+        vez, sem montar a lista completa em memória.
+        
+        Args:
+            nome (str, optional): Nome ou parte do nome
+            categoria_id (int, optional): ID da categoria
+            telefone (str, optional): Telefone em qualquer formato
+            email (str, optional): Email exato
+            
+        Returns:
+            generator: Dicionários dos contatos
+        """
+        filtros = {
+            chave: valor for chave, valor in (
+                ('nome', nome), ('categoria_id', categoria_id),
+                ('telefone', telefone), ('email', email)
+            ) if valor is not None and valor != ''
+        }
+        self.logger.info(f"Exportando contatos: {filtros}")
+        return self.repository.iterar_registros(filtros)
+    
+    def buscar_aproximado(self, query, limit=10, categoria_id=None, telefone=None, email=None):
+        """
+        Busca contatos pelo nome tolerando erros de digitação, entre os que
+        atendem aos demais filtros informados.
+        
+        Args:
+            query (str): Nome ou parte do nome digitado
+            limit (int): Quantidade máxima de contatos
+            categoria_id (int, optional): ID da categoria
+            telefone (str, optional): Telefone em qualquer formato
+            email (str, optional): Email exato
+            
+        Returns:
+            list: Lista de objetos Contato, do mais parecido para o menos parecido
+        """
+        if not query:
+            self.logger.warning("Busca aproximada por nome vazio")
+            return []
+        
+        filtros = {
+            chave: valor for chave, valor in (
+                ('categoria_id', categoria_id), ('telefone', telefone), ('email', email)
+            ) if valor is not None and valor != ''
+        }
+        self.logger.info(f"Buscando contatos por nome aproximado: {query}, filtros {filtros}")
+        return self.repository.buscar_aproximado(query, limit, filtros)
+    
+    def autocompletar(self, prefixo, limite=10):
+        """
+        Sugere contatos cujo nome começa com o prefixo.
+        
+        Args:
+            prefixo (str): Início do nome digitado
+            limite (int): Quantidade máxima de sugestões
+            
+        Returns:
+            list: Lista de objetos Contato em ordem alfabética
+        """
+        if not prefixo:
+            return []
+        
+        return self.repository.autocompletar(prefixo, limite)
+    
+    def buscar_por_telefone(self, telefone):
+        """
+        Busca contatos pelo telefone, em qualquer formatação.
+        
+        Args:
+            telefone (str): Telefone a ser buscado
+            
+        Returns:
+            list: Lista de objetos Contato com o telefone
+        """
+        if not telefone:
+            self.logger.warning("Busca por telefone vazio")
+            return []
+        
+        self.logger.info(f"Buscando contatos por telefone: {telefone}")
+        return self.repository.buscar_por_telefone(telefone)
     
     def buscar_por_categoria(self, categoria_id):
         """
@@ -63,6 +249,91 @@ class ContatoService:
         self.logger.info(f"Buscando contatos por categoria: ID {categoria_id}")
         return self.repository.buscar_por_categoria(categoria_id)
     
+    def contar_por_categoria(self, nome=None, telefone=None, email=None):
+        """
+        Conta os contatos de cada categoria, opcionalmente apenas entre os
+        que atendem aos filtros informados.
+        
+        Args:
+            nome (str, optional): Nome ou parte do nome
+            telefone (str, optional): Telefone em qualquer formato
+            email (str, optional): Email exato
+            
+        Returns:
+            dict: Quantidade de contatos indexada pelo ID da categoria
+        """
+        filtros = {
+            chave: valor for chave, valor in (('nome', nome), ('telefone', telefone), ('email', email))
+            if valor is not None and valor != ''
+        }
+        self.logger.info("Contando contatos por categoria")
+        if not filtros:
+            return self.repository.contar_por_categoria()
+        return self.repository.contar_por_categoria(filtros)
+    
+    def buscar_por_email(self, email):
+        """
+        Busca contatos pelo email exato, sem diferenciar maiúsculas.
+        
+        Args:
+            email (str): Email a ser buscado
+            
+        Returns:
+            list: Lista de objetos Contato com o email
+        """
+        if not email:
+            self.logger.warning("Busca por email vazio")
+            return []
+        
+        self.logger.info(f"Buscando contatos por email: {email}")
+        return self.repository.buscar_por_email(email)
+    
+    def email_duplicado(self, email, ignorar_id=None):
+        """
+        Verifica, pelo índice de emails, se outro contato já usa o email.
+        
+        Args:
+            email (str): Email a ser verificado
+            ignorar_id (int, optional): ID do próprio contato, em atualizações
+            
+        Returns:
+            bool: True se o email pertence a outro contato
+        """
+        if not email:
+            return False
+        return any(contato.id != ignorar_id for contato in self.repository.buscar_por_email(email))
+    
+    def _emails_unicos(self):
+        """
+        Indica se a política recusa emails já cadastrados. A verificação é
+        feita pelo repositório dentro da própria escrita, sob as suas travas,
+        para que uma gravação concorrente não passe entre ela e a escrita.
+        
+        Returns:
+            bool: True na política 'rejeitar'
+        """
+        return self.politica_email == 'rejeitar'
+    
+    def _avisar_email(self, contato, vistos=None):
+        """
+        Na política 'avisar', registra um aviso se o email do contato já é
+        usado por outro.
+        
+        Args:
+            contato (Contato): Contato a ser gravado
+            vistos (set, optional): Chaves dos emails anteriores do mesmo lote
+        """
+        if self.politica_email != 'avisar' or not contato.email:
+            return
+        
+        duplicado = self.email_duplicado(contato.email, contato.id)
+        if vistos is not None:
+            chave = chave_email(contato.email)
+            duplicado = duplicado or chave in vistos
+            vistos.add(chave)
+        if duplicado:
+            self.logger.warning(f"Email já cadastrado em outro contato: {contato.email}")
+    
     def criar(self, nome, telefone, email=None, categoria_id=None):
         """
         Cria um novo contato.
@@ -88,9 +359,13 @@ class ContatoService:
             email=email,
             categoria_id=categoria_id
         )
+        self._avisar_email(contato)
         
         self.logger.info(f"Criando novo contato: {nome}")
-        return self.repository.criar(contato)
+        criado = self.repository.criar(contato, emails_unicos=self._emails_unicos())
+        if criado:
+            self._cache_busca.registrar(criado, self.repository.versoes_escrita())
+        return criado
     
     def atualizar(self, id, nome, telefone, email=None, categoria_id=None):
         """
@@ -122,9 +397,13 @@ class ContatoService:
         contato.telefone = telefone
         contato.email = email
         contato.categoria_id = categoria_id
+        self._avisar_email(contato)
         
         self.logger.info(f"Atualizando contato: ID {id}")
-        return self.repository.atualizar(contato)
+        sucesso = self.repository.atualizar(contato, emails_unicos=self._emails_unicos())
+        if sucesso:
+            self._cache_busca.registrar(contato, self.repository.versoes_escrita())
+        return sucesso
     
     def excluir(self, id):
         """
@@ -137,4 +416,162 @@ class ContatoService:
             bool: True se excluído com sucesso, False caso contrário
         """
         self.logger.info(f"Excluindo contato: ID {id}")
-        return self.repository.excluir(id)
\ No newline at end of file
+        sucesso = self.repository.excluir(id)
+        if sucesso:
+            self._cache_busca.remover(id, self.repository.versoes_escrita())
+        return sucesso
+    
+    def _atualizar_cache(self, op, valor, resultado, versoes):
+        """
+        Reflete no cache de buscas uma operação de lote bem-sucedida.
+        
+        Args:
+            op (str): 'criar', 'atualizar' ou 'excluir'
+            valor: Contato gravado ou ID excluído
+            resultado: Resultado da operação no repositório
+            versoes (tuple): Versões antes e depois da gravação do lote
+        """
+        if not resultado:
+            return
+        if op == 'excluir':
+            self._cache_busca.remover(valor, versoes)
+        else:
+            self._cache_busca.registrar(valor, versoes)
+    
+    def _montar_contato(self, item, id=None):
+        """
+        Monta um contato a partir dos dados de um item de lote.
+        
+        Args:
+            item (dict): Dicionário com nome, telefone, email e categoria_id
+            id (int, optional): ID do contato, para atualizações
+            
+        Returns:
+            Contato: Contato montado ou None se os dados forem insuficientes
+        """
+        if not item.get('nome') or not item.get('telefone'):
+            return None
+        return Contato(
+            id=id,
+            nome=item['nome'],
+            telefone=item['telefone'],
+            email=item.get('email'),
+            categoria_id=item.get('categoria_id')
+        )
+    
+    def criar_em_lote(self, dados):
+        """
+        Cria vários contatos com uma única gravação.
+        
+        Args:
+            dados (list): Dicionários com nome, telefone, email e categoria_id
+            
+        Returns:
+            list: Contato criado para cada item, na ordem recebida, ou None
+                  para itens inválidos ou que não puderam ser gravados
+        """
+        vistos = set()
+        contatos = [self._montar_contato(item) for item in dados]
+        validos = [contato for contato in contatos if contato is not None]
+        for contato in validos:
+            self._avisar_email(contato, vistos)
+        if len(validos) < len(contatos):
+            self.logger.warning(f"Lote de criação com {len(contatos) - len(validos)} contatos inválidos")
+        
+        self.logger.info(f"Criando lote de contatos: {len(validos)}")
+        criados = iter(self.repository.criar_em_lote(validos, emails_unicos=self._emails_unicos()) if validos else [])
+        resultados = [next(criados) if contato is not None else None for contato in contatos]
+        versoes = self.repository.versoes_escrita()
+        for criado in resultados:
+            self._atualizar_cache('criar', criado, criado, versoes)
+        return resultados
+    
+    def atualizar_em_lote(self, dados):
+        """
+        Atualiza vários contatos com uma única gravação.
+        
+        Args:
+            dados (list): Dicionários com id, nome, telefone, email e categoria_id
+            
+        Returns:
+            list: True/False para cada item, na ordem recebida
+        """
+        vistos = set()
+        contatos = [self._montar_contato(item, item.get('id')) if item.get('id') else None for item in dados]
+        validos = [contato for contato in contatos if contato is not None]
+        for contato in validos:
+            self._avisar_email(contato, vistos)
+        if len(validos) < len(contatos):
+            self.logger.warning(f"Lote de atualização com {len(contatos) - len(validos)} contatos inválidos")
+        
+        self.logger.info(f"Atualizando lote de contatos: {len(validos)}")
+        aplicados = iter(self.repository.atualizar_em_lote(validos, emails_unicos=self._emails_unicos()) if validos else [])
+        resultados = [next(aplicados) if contato is not None else False for contato in contatos]
+        versoes = self.repository.versoes_escrita()
+        for contato, sucesso in zip(contatos, resultados):
+            self._atualizar_cache('atualizar', contato, sucesso, versoes)
+        return resultados
+    
+    def excluir_em_lote(self, ids):
+        """
+        Exclui vários contatos com uma única gravação.
+        
+        Args:
+            ids (list): IDs dos contatos a serem excluídos
+            
+        Returns:
+            list: True/False para cada ID, na ordem recebida
+        """
+        self.logger.info(f"Excluindo lote de contatos: {len(ids)}")
+        if not ids:
+            return []
+        resultados = self.repository.excluir_em_lote(ids)
+        versoes = self.repository.versoes_escrita()
+        for id, sucesso in zip(ids, resultados):
+            self._atualizar_cache('excluir', id, sucesso, versoes)
+        return resultados
+    
+    def executar_lote(self, operacoes):
+        """
+        Aplica um lote misto de criações, atualizações e exclusões com uma
+        única gravação.
+        
+        Args:
+            operacoes (list): Dicionários {'op': 'criar', 'dados': {...}},
+                              {'op': 'atualizar', 'id': id, 'dados': {...}}
+                              ou {'op': 'excluir', 'id': id}
+            
+        Returns:
+            list: Para cada operação, na ordem recebida: o Contato criado (ou
+                  None) para 'criar' e True/False para as demais
+        """
+        montadas = []
+        vistos = set()
+        for operacao in operacoes:
+            op = operacao.get('op')
+            if op == 'criar':
+                valor = self._montar_contato(operacao.get('dados') or {})
+            elif op == 'atualizar' and operacao.get('id'):
+                valor = self._montar_contato(operacao.get('dados') or {}, operacao['id'])
+            elif op == 'excluir' and operacao.get('id'):
+                valor = operacao['id']
+            else:
+                valor = None
+            if op != 'excluir' and valor is not None:
+                self._avisar_email(valor, vistos)
+            montadas.append((op, valor))
+        
+        validas = [(op, valor) for op, valor in montadas if valor is not None]
+        if len(validas) < len(montadas):
+            self.logger.warning(f"Lote de contatos com {len(montadas) - len(validas)} operações inválidas")
+        
+        self.logger.info(f"Executando lote de contatos: {len(validas)} operações")
+        aplicadas = iter(self.repository.executar_lote(validas, emails_unicos=self._emails_unicos()) if validas else [])
+        resultados = [
+            next(aplicadas) if valor is not None else (None if op == 'criar' else False)
+            for op, valor in montadas
+        ]
+        versoes = self.repository.versoes_escrita()
+        for (op, valor), resultado in zip(montadas, resultados):
+            self._atualizar_cache(op, valor, resultado, versoes)
+        return resultados
@@ -1,4 +1,5 @@
 import pytest
+import json
 import tempfile
 import shutil
 import os
@@ -65,6 +66,23 @@ class TestCategoriaAPI:
             
             assert response.status_code == 404
             assert 'error' in response.json
+    
+    def test_lote_categorias_item_invalido(self):
+        """Testa que um item inválido rejeita o lote inteiro antes de gravar"""
+        with app.test_client() as client:
+            total = len(client.get('/categorias/api').json)
+            
+            for invalido in ({'op': 'criar', 'dados': {'nome': '   '}},
+                             {'op': 'criar', 'dados': {'descricao': 'Sem nome'}},
+                             {'op': 'excluir', 'id': True}):
+                response = client.post('/categorias/api/batch', json=[
+                    {'op': 'criar', 'dados': {'nome': 'Lote Categoria Válida'}},
+                    invalido
+                ])
+                
+                assert response.status_code == 400
+                assert response.json['indice'] == 1
+            assert len(client.get('/categorias/api').json) == total
 
 @pytest.mark.integration
 class TestContatoAPI:
@@ -126,5 +144,213 @@ class TestContatoAPI:
             assert 'id' in response.json
         
         shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def test_lote_contatos(self):
+        """Testa lote misto de operações em uma única requisição"""
+        temp_dir = tempfile.mkdtemp()
+        app.config['TESTING'] = True
+        app.config['DATA_PATH'] = temp_dir
+        
+        with app.test_client() as client:
+            criado = client.post('/contatos/api', json={'nome': 'Lote Antigo', 'telefone': '1'}).json
+            
+            response = client.post('/contatos/api/batch', json={'operacoes': [
+                {'op': 'criar', 'dados': {'nome': 'Lote Novo', 'telefone': '2'}},
+                {'op': 'atualizar', 'id': criado['id'], 'dados': {'nome': 'Lote Editado', 'telefone': '3'}},
+                {'op': 'excluir', 'id': 888888888888}
+            ]})
+            
+            assert response.status_code == 200
+            status = [r['status'] for r in response.json['resultados']]
+            assert status == [201, 200, 404]
+            assert response.json['resultados'][0]['contato']['nome'] == 'Lote Novo'
+            assert client.get(f"/contatos/api/{criado['id']}").json['nome'] == 'Lote Editado'
+            
+            # Limpa os contatos criados
+            novo_id = response.json['resultados'][0]['contato']['id']
+            client.post('/contatos/api/batch', json=[
+                {'op': 'excluir', 'id': criado['id']},
+                {'op': 'excluir', 'id': novo_id}
+            ])
+        
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def test_lote_contatos_item_invalido(self):
+        """Testa que um item sem os campos obrigatórios rejeita o lote inteiro"""
+        with app.test_client() as client:
+            total = len(client.get('/contatos/api').json)
+            
+            for invalido in ({'op': 'criar', 'dados': {'nome': '', 'telefone': '1'}},
+                             {'op': 'criar', 'dados': {'nome': 'Sem telefone'}},
+                             {'op': 'excluir', 'id': True},
+                             {'op': 'atualizar', 'id': False, 'dados': {'nome': 'Booleano', 'telefone': '1'}}):
+                response = client.post('/contatos/api/batch', json=[
+                    {'op': 'criar', 'dados': {'nome': 'Lote Válido', 'telefone': '2'}},
+                    invalido
+                ])
+                
+                assert response.status_code == 400
+                assert response.json['indice'] == 1
+            assert len(client.get('/contatos/api').json) == total
+    
+    def test_lote_contatos_vazio(self):
+        """Testa lote sem operações"""
+        with app.test_client() as client:
+            response = client.post('/contatos/api/batch', json={'operacoes': []})
+            
+            assert response.status_code == 400
+            assert 'error' in response.json
+    
+    def test_listar_contatos_paginado(self):
+        """Testa paginação por cursor com link para a próxima página"""
+        with app.test_client() as client:
+            response = client.get('/contatos/api?limit=1')
+            assert response.status_code == 200
+            assert len(response.json) <= 1
+            
+            if 'Link' in response.headers:
+                proximo = response.headers['Link'].split(';')[0].strip('<>')
+                seguinte = client.get(proximo)
+                assert seguinte.status_code == 200
+                assert seguinte.json[0]['id'] > response.json[0]['id']
+            
+            assert client.get('/contatos/api?limit=0').status_code == 400
+            assert client.get('/contatos/api?after_id=abc').status_code == 400
+    
+    def test_paginas_da_listagem_mantem_filtros(self):
+        """Testa que os links de paginação da página web mantêm todos os filtros"""
+        with app.test_client() as client:
+            criados = [
+                client.post('/contatos/api', json={'nome': f'Paginação Filtro {i}', 'telefone': '(47) 3000-0001', 'email': 'pagina@filtro.com'}).json
+                for i in range(2)
+            ]
+            
+            response = client.get('/contatos/', query_string={'telefone': '4730000001', 'email': 'pagina@filtro.com', 'limit': 1})
+            assert response.status_code == 200
+            html = response.get_data(as_text=True)
+            assert f'after_id={criados[0]["id"]}' in html
+            assert html.count('telefone=4730000001') == 2
+            assert html.count('email=pagina@filtro.com') == 2
+            
+            for criado in criados:
+                client.delete(f"/contatos/api/{criado['id']}")
+    
+    def test_autocompletar_contatos(self):
+        """Testa sugestões de nomes por prefixo"""
+        with app.test_client() as client:
+            criado = client.post('/contatos/api', json={'nome': 'Autocompletar XYZ', 'telefone': '1'}).json
+            
+            response = client.get('/contatos/api/autocomplete?prefix=autocompletar x')
+            assert response.status_code == 200
+            assert any(c['id'] == criado['id'] for c in response.json)
+            
+            client.delete(f"/contatos/api/{criado['id']}")
+    
+    def test_contar_contatos_por_categoria(self):
+        """Testa contagem por categoria com filtro por nome"""
+        with app.test_client() as client:
+            criado = client.post('/contatos/api', json={'nome': 'Contagem Zyxwv', 'telefone': '1'}).json
+            
+            response = client.get('/contatos/api/contagem?nome=contagem zyxwv')
+            assert response.status_code == 200
+            assert response.json == {'total': 1, 'por_categoria': [{'categoria_id': None, 'total': 1}]}
+            
+            client.delete(f"/contatos/api/{criado['id']}")
+    
+    def test_exportar_contatos(self):
+        """Testa a exportação em JSON delimitado por linhas"""
+        with app.test_client() as client:
+            criado = client.post('/contatos/api', json={'nome': 'Exportação Wvuts', 'telefone': '1'}).json
+            
+            response = client.get('/contatos/api/export?nome=exportação wvuts')
+            assert response.status_code == 200
+            assert response.mimetype == 'application/x-ndjson'
+            assert [json.loads(linha) for linha in response.get_data(as_text=True).splitlines()] == [criado]
+            assert client.get('/contatos/api/export?categoria_id=x').status_code == 400
+            
+            client.delete(f"/contatos/api/{criado['id']}")
+    
+    def test_buscar_contatos_aproximado(self):
+        """Testa busca tolerante a erros de digitação"""
+        with app.test_client() as client:
+            criado = client.post('/contatos/api', json={'nome': 'Fuzzyname Qwerty', 'telefone': '1'}).json
+            
+            response = client.get('/contatos/api?nome=fuzzynme qwerty&fuzzy=1')
+            assert response.status_code == 200
+            assert response.json[0]['id'] == criado['id']
+            
+            # Os demais filtros valem antes do limite: a página não fica vazia
+            # por causa de um resultado mais parecido que eles excluem
+            outro = client.post('/contatos/api', json={'nome': 'Fuzzyname Qwerti', 'telefone': '(48) 3999-1111'}).json
+            response = client.get('/contatos/api', query_string={
+                'nome': 'fuzzynme qwerty', 'fuzzy': '1', 'telefone': '4839991111', 'limit': '1'
+            })
+            assert [c['id'] for c in response.json] == [outro['id']]
+            
+            client.delete(f"/contatos/api/{criado['id']}")
+            client.delete(f"/contatos/api/{outro['id']}")
+    
+    def test_buscar_contatos_por_telefone(self):
+        """Testa busca reversa por telefone"""
+        with app.test_client() as client:
+            criado = client.post('/contatos/api', json={'nome': 'Telefone Reverso', 'telefone': '(48) 3123-4567'}).json
+            
+            response = client.get('/contatos/api', query_string={'telefone': '+55 48 3123 4567'})
+            assert response.status_code == 200
+            assert [c['id'] for c in response.json] == [criado['id']]
+            
+            client.delete(f"/contatos/api/{criado['id']}")
+    
+    def test_buscar_contatos_por_email(self):
+        """Testa busca exata por email"""
+        with app.test_client() as client:
+            criado = client.post('/contatos/api', json={
+                'nome': 'Email Exato', 'telefone': '1', 'email': 'Email.Exato@Teste.com'
+            }).json
+            
+            response = client.get('/contatos/api?email=email.exato@teste.com')
+            assert response.status_code == 200
+            assert [c['id'] for c in response.json] == [criado['id']]
+            
+            client.delete(f"/contatos/api/{criado['id']}")
+    
+    def test_filtros_combinados(self):
+        """Testa nome e categoria aplicados juntos"""
+        with app.test_client() as client:
+            categoria = client.post('/categorias/api', json={'nome': 'Filtro Combinado'}).json
+            dentro = client.post('/contatos/api', json={
+                'nome': 'Combinado Dentro', 'telefone': '1', 'categoria_id': categoria['id']
+            }).json
+            fora = client.post('/contatos/api', json={'nome': 'Combinado Fora', 'telefone': '2'}).json
+            
+            response = client.get(f"/contatos/api?nome=combinado&categoria_id={categoria['id']}")
+            assert response.status_code == 200
+            assert [c['id'] for c in response.json] == [dentro['id']]
+            
+            client.delete(f"/contatos/api/{dentro['id']}")
+            client.delete(f"/contatos/api/{fora['id']}")
+            client.delete(f"/categorias/api/{categoria['id']}")
 
-
+@pytest.mark.integration
+class TestBuscaAPI:
+    """Testes de integração para a busca textual"""
+    
+    def test_pesquisar_por_categoria_e_contato(self):
+        """Testa busca única em campos do contato e da categoria"""
+        with app.test_client() as client:
+            categoria = client.post('/categorias/api', json={
+                'nome': 'Zyxwvu', 'descricao': 'Categoria da busca textual'
+            }).json
+            contato = client.post('/contatos/api', json={
+                'nome': 'Busca Textual', 'telefone': '1', 'categoria_id': categoria['id']
+            }).json
+            
+            response = client.get('/api/search?q=zyxwvu')
+            assert response.status_code == 200
+            assert [c['id'] for c in response.json] == [contato['id']]
+            assert response.json[0]['pontuacao'] > 0
+            
+            assert client.get('/api/search?q=').status_code == 400
+            
+            client.delete(f"/contatos/api/{contato['id']}")
+            client.delete(f"/categorias/api/{categoria['id']}")
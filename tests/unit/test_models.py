@@ -1,6 +1,6 @@
 import pytest
-from models.contato import Contato
-from models.categoria import Categoria
+from models.contato import Contato, VisaoContato
+from models.categoria import Categoria, VisaoCategoria
 
 @pytest.mark.unit
 class TestContato:
@@ -82,6 +82,61 @@ class TestContato:
         assert contato.id is None
         assert contato.email is None
         assert contato.categoria_id is None
+    
+    def test_contato_usa_slots(self):
+        """Testa que o contato não aceita atributos fora dos campos"""
+        contato = Contato(id=1, nome="Pedro")
+        
+        assert not hasattr(contato, '__dict__')
+        with pytest.raises(AttributeError):
+            contato.apelido = "Pedrinho"
+    
+    def test_contato_tupla_ida_e_volta(self):
+        """Testa conversão do contato para tupla e de volta"""
+        contato = Contato(id=7, nome="Bia", telefone="123", email="bia@teste.com", categoria_id=2)
+        
+        valores = contato.to_tuple()
+        copia = Contato.from_tuple(valores)
+        
+        assert valores == (7, "Bia", "123", "bia@teste.com", 2)
+        assert copia.to_dict() == contato.to_dict()
+    
+    def test_contato_igualdade_e_hash_pelo_id(self):
+        """Testa que contatos com o mesmo ID são iguais e têm o mesmo hash"""
+        contato = Contato(id=3, nome="Ana")
+        mesmo_id = Contato(id=3, nome="Ana Maria")
+        
+        assert contato == mesmo_id
+        assert hash(contato) == hash(mesmo_id)
+        assert len({contato, mesmo_id}) == 1
+        assert contato != Contato(id=4, nome="Ana")
+    
+    def test_contatos_sem_id_so_iguais_a_si_mesmos(self):
+        """Testa igualdade de contatos ainda não salvos"""
+        contato = Contato(nome="Ana")
+        
+        assert contato == contato
+        assert contato != Contato(nome="Ana")
+    
+    def test_visao_contato_nao_copia_registro(self):
+        """Testa que a visão expõe os campos e serializa o próprio registro"""
+        registro = {'id': 1, 'nome': 'Ana', 'telefone': '123', 'email': None, 'categoria_id': 2}
+        visao = VisaoContato(registro)
+        
+        assert (visao.id, visao.nome, visao.categoria_id) == (1, 'Ana', 2)
+        assert visao.to_dict() is registro
+        assert visao.to_contato() == Contato(id=1)
+        with pytest.raises(AttributeError):
+            visao.nome = 'Bia'
+    
+    def test_visao_contato_registro_incompleto(self):
+        """Testa visão sobre registro com campos ausentes ou extras"""
+        visao = VisaoContato({'id': 1, 'nome': 'Ana', 'extra': True})
+        
+        assert visao.email is None
+        assert visao.to_dict() == {
+            'id': 1, 'nome': 'Ana', 'telefone': None, 'email': None, 'categoria_id': None
+        }
 
 @pytest.mark.unit
 class TestCategoria:
@@ -146,4 +201,22 @@ class TestCategoria:
         
         assert categoria.nome == 'Serviços'
         assert categoria.id is None
-        assert categoria.descricao is None
\ No newline at end of file
+        assert categoria.descricao is None
+    
+    def test_categoria_tupla_e_igualdade(self):
+        """Testa conversão para tupla e igualdade pelo ID"""
+        categoria = Categoria(id=2, nome="Amigos", descricao="Pessoais")
+        
+        assert Categoria.from_tuple(categoria.to_tuple()) == categoria
+        assert categoria.to_tuple() == (2, "Amigos", "Pessoais")
+        assert not hasattr(categoria, '__dict__')
+        assert categoria != Categoria(id=3, nome="Amigos")
+    
+    def test_visao_categoria(self):
+        """Testa a visão somente leitura de categoria"""
+        registro = {'id': 1, 'nome': 'Amigos', 'descricao': None}
+        visao = VisaoCategoria(registro)
+        
+        assert visao.nome == 'Amigos'
+        assert visao.to_dict() is registro
+        assert visao.to_categoria().to_dict() == registro
\ No newline at end of file
@@ -1,11 +1,21 @@
 import pytest
 import os
+import io
+import json
+import multiprocessing
 import tempfile
 from unittest.mock import patch
 from repositories.contato_repository import ContatoRepository
 from repositories.categoria_repository import CategoriaRepository
+from repositories.colecao import Colecao
+from repositories.leitor_json import ler_registros
+from repositories.indices import IndiceIds, IndiceNomesOrdenados, IndiceTextual, IndiceTrigramas
+from repositories.tabela_colunar import TabelaColunar
+from repositories import mmap_contato_repository
+from repositories.mmap_contato_repository import MmapContatoRepository
 from models.contato import Contato
 from models.categoria import Categoria
+from repositories.normalizacao import chave_busca, distancia_trecho, termos
 
 @pytest.mark.unit
 class TestContatoRepository:
@@ -40,6 +50,26 @@ class TestContatoRepository:
         next_id = self.repository._get_next_id(contatos)
         assert next_id == 4
     
+    def test_id_nao_reutilizado_apos_exclusao(self):
+        """Testa que o ID do último contato excluído não é reaproveitado"""
+        self.repository.criar(Contato(nome="A", telefone="1"))
+        ultimo = self.repository.criar(Contato(nome="B", telefone="2"))
+        self.repository.excluir(ultimo.id)
+        
+        novo = self.repository.criar(Contato(nome="C", telefone="3"))
+        
+        assert novo.id == 3
+    
+    def test_sequencia_persiste_entre_instancias(self):
+        """Testa que a sequência de IDs sobrevive à reinicialização"""
+        contato = self.repository.criar(Contato(nome="A", telefone="1"))
+        self.repository.excluir(contato.id)
+        
+        with patch('repositories.contato_repository.Logger.get_instance'):
+            outro = ContatoRepository(self.temp_dir)
+        
+        assert outro.criar(Contato(nome="B", telefone="2")).id == 2
+    
     def test_listar_todos_arquivo_vazio(self):
         """Testa listagem quando arquivo está vazio"""
         contatos = self.repository.listar_todos()
@@ -61,6 +91,16 @@ class TestContatoRepository:
         assert len(contatos) == 1
         assert contatos[0].nome == "João"
     
+    def test_listar_visoes(self):
+        """Testa listagem por visões sobre os registros em cache"""
+        self.repository.criar(Contato(nome="Ana", telefone="1"))
+        self.repository.criar(Contato(nome="Bia", telefone="2"))
+        
+        visoes = self.repository.listar_visoes()
+        
+        assert [v.nome for v in visoes] == ["Ana", "Bia"]
+        assert [v.to_dict() for v in visoes] == [c.to_dict() for c in self.repository.listar_todos()]
+    
     def test_buscar_por_id_existente(self):
         """Testa busca por ID de contato existente"""
         # Cria um contato primeiro
@@ -128,6 +168,237 @@ class TestContatoRepository:
         assert len(resultados) == 2
         assert all(contato.categoria_id == 1 for contato in resultados)
     
+    def test_buscar_por_categoria_apos_mudanca_de_categoria(self):
+        """Testa que o índice de categorias acompanha as atualizações"""
+        contato = self.repository.criar(Contato(nome="Móvel", telefone="111", categoria_id=1))
+        self.repository.criar(Contato(nome="Fixo", telefone="222", categoria_id=1))
+        
+        contato.categoria_id = 2
+        self.repository.atualizar(contato)
+        
+        assert [c.nome for c in self.repository.buscar_por_categoria(1)] == ["Fixo"]
+        assert [c.nome for c in self.repository.buscar_por_categoria(2)] == ["Móvel"]
+    
+    def test_telefone_numerico(self):
+        """Testa que valores numéricos são indexados pela sua representação"""
+        contato = self.repository.criar(Contato(nome="Numérico", telefone=11988887777))
+        
+        assert [c.id for c in self.repository.buscar_por_telefone("(11) 98888-7777")] == [contato.id]
+        assert self.repository.criar(Contato(nome="Outro", telefone="1")).id == contato.id + 1
+        assert len(self.repository.listar_todos()) == 2
+    
+    def test_buscas_sem_cache_carregam_colecao(self):
+        """Testa que as buscas com o cache vazio o carregam para as seguintes usarem os índices"""
+        self.repository.criar(Contato(nome="Ana Souza", telefone="1", categoria_id=1))
+        self.repository.criar(Contato(nome="Bruno", telefone="2"))
+        self.repository.criar(Contato(nome="Mariana", telefone="3", categoria_id=1))
+        with patch('repositories.contato_repository.Logger.get_instance'):
+            repository = ContatoRepository(self.temp_dir)
+        
+        assert [c.nome for c in repository.buscar_por_nome("ANA")] == ["Ana Souza", "Mariana"]
+        assert [c.nome for c in repository.buscar_por_categoria(None)] == ["Bruno"]
+        assert len(repository.listar_todos()) == 3
+        assert repository._cache.atual() is not None
+    
+    def test_iterar_registros(self):
+        """Testa a exportação com e sem o cache carregado"""
+        self.repository.criar(Contato(nome="Ana", telefone="(11) 1111-1111", categoria_id=1))
+        self.repository.criar(Contato(nome="Bia", telefone="2222", categoria_id=2))
+        with patch('repositories.contato_repository.Logger.get_instance'):
+            frio = ContatoRepository(self.temp_dir)
+        
+        filtros = {'telefone': '11 11111111'}
+        assert list(frio.iterar_registros(filtros)) == list(self.repository.iterar_registros(filtros))
+        assert [r['nome'] for r in frio.iterar_registros()] == ["Ana", "Bia"]
+        assert list(self.repository.iterar_registros({'categoria_id': 2})) == [
+            {'id': 2, 'nome': "Bia", 'telefone': "2222", 'email': None, 'categoria_id': 2}
+        ]
+    
+    def test_contar_por_categoria(self):
+        """Testa contagem de contatos por categoria"""
+        self.repository.criar(Contato(nome="A", telefone="1", categoria_id=1))
+        self.repository.criar(Contato(nome="B", telefone="2", categoria_id=1))
+        contato = self.repository.criar(Contato(nome="C", telefone="3"))
+        
+        assert self.repository.contar_por_categoria() == {1: 2, None: 1}
+        
+        self.repository.excluir(contato.id)
+        assert self.repository.contar_por_categoria() == {1: 2}
+    
+    @pytest.mark.parametrize('colunar', [False, True])
+    def test_contar_por_categoria_com_filtros(self, colunar):
+        """Testa contagem restrita aos contatos filtrados, com e sem tabela colunar"""
+        with patch('repositories.contato_repository.Logger.get_instance'):
+            repositorio = ContatoRepository(self.temp_dir, colunar=colunar)
+        repositorio.criar(Contato(nome="Ana Silva", telefone="1", categoria_id=1))
+        repositorio.criar(Contato(nome="João Silva", telefone="2", categoria_id=2))
+        repositorio.criar(Contato(nome="Silvana", telefone="3", email="s@x.com"))
+        repositorio.criar(Contato(nome="Pedro", telefone="4", categoria_id=1))
+        
+        assert repositorio.contar_por_categoria({'nome': 'silva'}) == {1: 1, 2: 1, None: 1}
+        assert repositorio.contar_por_categoria({'nome': 'silva', 'email': 'S@X.COM'}) == {None: 1}
+        assert repositorio.contar_por_categoria({'telefone': '9'}) == {}
+    
+    def test_filtrar_pela_tabela_colunar(self):
+        """Testa que filtros usam a tabela colunar e voltam aos índices se algum registro ficar fora"""
+        with patch('repositories.contato_repository.Logger.get_instance'):
+            repositorio = ContatoRepository(self.temp_dir, colunar=True)
+        repositorio.criar(Contato(nome="Ana Silva", telefone="1", categoria_id=1))
+        repositorio.criar(Contato(nome="João Silva", telefone="2", categoria_id=2))
+        
+        with patch.object(TabelaColunar, 'selecionar', autospec=True, side_effect=TabelaColunar.selecionar) as selecionar:
+            assert [c.nome for c in repositorio.filtrar({'nome': 'silva', 'categoria_id': 2})] == ["João Silva"]
+        assert selecionar.call_count == 1
+        
+        with open(repositorio.file_path, encoding='utf-8') as file:
+            registros = json.load(file)
+        registros.append({'id': 3, 'nome': 'Silvana', 'telefone': '3', 'email': None, 'categoria_id': '2'})
+        with open(repositorio.file_path, 'w', encoding='utf-8') as file:
+            json.dump(registros, file)
+        with patch('repositories.contato_repository.Logger.get_instance') as logger:
+            repositorio = ContatoRepository(self.temp_dir, colunar=True)
+            
+            with patch.object(TabelaColunar, 'selecionar', autospec=True, side_effect=TabelaColunar.selecionar) as selecionar:
+                assert [c.nome for c in repositorio.filtrar({'nome': 'silva'})] == ["Ana Silva", "João Silva", "Silvana"]
+                assert repositorio.contar_por_categoria({'nome': 'silva'}) == {1: 1, 2: 1, '2': 1}
+            assert selecionar.call_count == 0
+            logger.return_value.warning.assert_called_once()
+    
+    def test_listar_pagina(self):
+        """Testa paginação por cursor em ordem de ID"""
+        ids = [self.repository.criar(Contato(nome=f"C{i}", telefone="1")).id for i in range(5)]
+        self.repository.excluir(ids[1])
+        
+        pagina, proximo = self.repository.listar_pagina(2)
+        assert [c.id for c in pagina] == [ids[0], ids[2]]
+        assert proximo == ids[2]
+        
+        pagina, proximo = self.repository.listar_pagina(2, proximo)
+        assert [c.id for c in pagina] == [ids[3], ids[4]]
+        assert proximo is None
+    
+    def test_filtrar_pagina(self):
+        """Testa paginação por cursor de um resultado filtrado"""
+        ids = [
+            self.repository.criar(Contato(nome=f"Ana {i}" if i % 2 else f"Bia {i}", telefone="1", categoria_id=i % 3)).id
+            for i in range(8)
+        ]
+        
+        with patch('repositories.contato_repository.Contato.from_dict', wraps=Contato.from_dict) as converter:
+            pagina, proximo = self.repository.filtrar_pagina({'nome': 'ana'}, 2)
+        assert [c.id for c in pagina] == [ids[1], ids[3]]
+        assert proximo == ids[3]
+        assert converter.call_count == 2
+        
+        pagina, proximo = self.repository.filtrar_pagina({'nome': 'ana'}, 2, proximo)
+        assert [c.id for c in pagina] == [ids[5], ids[7]]
+        assert proximo is None
+        assert self.repository.filtrar_pagina({'nome': 'ana', 'categoria_id': 0}, 5) == \
+            (self.repository.filtrar({'nome': 'ana', 'categoria_id': 0}), None)
+        assert self.repository.filtrar_pagina({}, 1, ids[6])[0][0].id == ids[7]
+    
+    def test_buscar_por_nome_sem_acentos(self):
+        """Testa busca por nome ignorando acentos"""
+        self.repository.criar(Contato(nome="João Conceição", telefone="1"))
+        
+        assert [c.nome for c in self.repository.buscar_por_nome("joao")] == ["João Conceição"]
+        assert [c.nome for c in self.repository.autocompletar("JOA")] == ["João Conceição"]
+    
+    def test_buscar_por_telefone(self):
+        """Testa busca por telefone em formatos diferentes"""
+        contato = self.repository.criar(Contato(nome="Ana", telefone="(11) 99999-9999"))
+        self.repository.criar(Contato(nome="Bia", telefone="(11) 98888-8888"))
+        
+        assert [c.nome for c in self.repository.buscar_por_telefone("+55 11 99999-9999")] == ["Ana"]
+        assert [c.nome for c in self.repository.buscar_por_telefone("011999999999")] == ["Ana"]
+        
+        contato.telefone = "1133334444"
+        self.repository.atualizar(contato)
+        assert self.repository.buscar_por_telefone("11999999999") == []
+        assert self.repository.buscar_por_telefone("") == []
+    
+    def test_buscar_por_email(self):
+        """Testa busca exata por email sem diferenciar maiúsculas"""
+        contato = self.repository.criar(Contato(nome="Ana", telefone="1", email="Ana@Exemplo.com"))
+        self.repository.criar(Contato(nome="Bia", telefone="2"))
+        
+        assert [c.nome for c in self.repository.buscar_por_email(" ana@exemplo.COM")] == ["Ana"]
+        
+        self.repository.excluir(contato.id)
+        assert self.repository.buscar_por_email("ana@exemplo.com") == []
+    
+    def test_emails_unicos_na_escrita(self):
+        """Testa que a verificação de email duplicado vê as gravações de outra instância"""
+        with patch('repositories.contato_repository.Logger.get_instance'):
+            outra = ContatoRepository(self.temp_dir)
+        ana = self.repository.criar(Contato(nome="Ana", telefone="1"))
+        outra.criar(Contato(nome="Bia", telefone="2", email="bia@x.com"))
+        
+        assert self.repository.criar(Contato(nome="Carla", telefone="3", email="BIA@x.com"), emails_unicos=True) is None
+        ana.email = "bia@x.com"
+        assert self.repository.atualizar(ana, emails_unicos=True) is False
+        
+        resultados = self.repository.executar_lote([
+            ('criar', Contato(nome="Davi", telefone="4", email="d@x.com")),
+            ('criar', Contato(nome="Edu", telefone="5", email="D@x.com"))
+        ], emails_unicos=True)
+        assert resultados[0].nome == "Davi" and resultados[1] is None
+        assert [c.nome for c in outra.buscar_por_email("d@x.com")] == ["Davi"]
+    
+    def test_filtrar_combinando_indices(self):
+        """Testa filtros combinados por intersecção dos índices"""
+        self.repository.criar(Contato(nome="Ana Souza", telefone="11 1111-1111", categoria_id=1))
+        self.repository.criar(Contato(nome="Ana Lima", telefone="11 2222-2222", categoria_id=2, email="ana@x.com"))
+        self.repository.criar(Contato(nome="Bruno", telefone="11 1111-1111", categoria_id=1))
+        
+        assert [c.nome for c in self.repository.filtrar({'nome': 'ana', 'categoria_id': 1})] == ["Ana Souza"]
+        assert [c.nome for c in self.repository.filtrar({'telefone': '1111111111', 'categoria_id': 1})] == ["Ana Souza", "Bruno"]
+        assert [c.nome for c in self.repository.filtrar({'nome': 'lima', 'email': 'ANA@x.com'})] == ["Ana Lima"]
+        assert self.repository.filtrar({'nome': 'bruno', 'categoria_id': 2}) == []
+        assert self.repository.filtrar({'categoria_id': None}) == []
+        assert len(self.repository.filtrar({})) == 3
+    
+    def test_pesquisar_texto(self):
+        """Testa busca textual com relevância e pontuação das categorias"""
+        ana = self.repository.criar(Contato(nome="Ana Souza", telefone="(11) 99999-9999", email="ana@souza.com"))
+        bia = self.repository.criar(Contato(nome="Bia", telefone="2", categoria_id=5))
+        
+        resultados = self.repository.pesquisar_texto(termos("souza"))
+        assert [c.id for c, _ in resultados] == [ana.id]
+        
+        assert [c.id for c, _ in self.repository.pesquisar_texto(termos("11999999999"))] == [ana.id]
+        assert [c.id for c, _ in self.repository.pesquisar_texto(["x"], {5: 1.0})] == [bia.id]
+        
+        self.repository.excluir(ana.id)
+        assert self.repository.pesquisar_texto(termos("souza")) == []
+    
+    def test_buscar_aproximado(self):
+        """Testa busca aproximada ordenada por semelhança"""
+        self.repository.criar(Contato(nome="Conceição", telefone="1"))
+        self.repository.criar(Contato(nome="Concepção", telefone="2", categoria_id=2))
+        self.repository.criar(Contato(nome="Pedro", telefone="3"))
+        
+        resultados = self.repository.buscar_aproximado("conseicao")
+        
+        assert [c.nome for c in resultados] == ["Conceição", "Concepção"]
+        assert len(self.repository.buscar_aproximado("conseicao", 1)) == 1
+        # Os filtros restringem os candidatos antes do limite
+        assert [c.nome for c in self.repository.buscar_aproximado("conseicao", 1, {'categoria_id': 2})] == ["Concepção"]
+        assert self.repository.buscar_aproximado("conseicao", 1, {'telefone': '3'}) == []
+    
+    def test_autocompletar(self):
+        """Testa sugestões por prefixo refletindo atualizações"""
+        ana = self.repository.criar(Contato(nome="Ana", telefone="1"))
+        self.repository.criar(Contato(nome="anabela", telefone="2"))
+        self.repository.criar(Contato(nome="Bruno", telefone="3"))
+        
+        assert [c.nome for c in self.repository.autocompletar("AN")] == ["Ana", "anabela"]
+        
+        ana.nome = "Beatriz"
+        self.repository.atualizar(ana)
+        assert [c.nome for c in self.repository.autocompletar("an")] == ["anabela"]
+        assert [c.nome for c in self.repository.autocompletar("b", 1)] == ["Beatriz"]
+    
     def test_atualizar_contato_sucesso(self):
         """Testa atualização bem-sucedida de contato"""
         # Cria um contato
@@ -162,6 +433,66 @@ class TestContatoRepository:
         contato_excluido = self.repository.buscar_por_id(contato_criado.id)
         assert contato_excluido is None
 
+    def test_operacoes_em_lote_gravam_uma_vez(self):
+        """Testa que cada lote é persistido com uma única gravação"""
+        with patch.object(self.repository, '_save_to_file', wraps=self.repository._save_to_file) as mock_save:
+            criados = self.repository.criar_em_lote([
+                Contato(nome=f"Lote {i}", telefone=str(i)) for i in range(5)
+            ])
+        
+        assert [c.id for c in criados] == [1, 2, 3, 4, 5]
+        assert mock_save.call_count == 1
+        assert len(self.repository.listar_todos()) == 5
+    
+    def test_atualizar_e_excluir_em_lote(self):
+        """Testa resultados individuais de atualização e exclusão em lote"""
+        a, b = self.repository.criar_em_lote([
+            Contato(nome="A", telefone="1"),
+            Contato(nome="B", telefone="2")
+        ])
+        a.nome = "A2"
+        
+        resultados = self.repository.atualizar_em_lote([a, Contato(id=99, nome="X", telefone="9")])
+        assert resultados == [True, False]
+        assert self.repository.buscar_por_id(a.id).nome == "A2"
+        
+        assert self.repository.excluir_em_lote([b.id, 99]) == [True, False]
+        assert [c.nome for c in self.repository.listar_todos()] == ["A2"]
+    
+    def test_leituras_usam_cache_em_memoria(self):
+        """Testa que leituras repetidas não relêem o arquivo"""
+        self.repository.criar(Contato(nome="Cache", telefone="111"))
+
+        with patch('repositories.armazenamento.json.load') as mock_load:
+            self.repository.listar_todos()
+            self.repository.buscar_por_nome("Cache")
+            self.repository.buscar_por_id(1)
+
+        mock_load.assert_not_called()
+
+    def test_cache_recarrega_apos_alteracao_externa(self):
+        """Testa que alterações feitas fora do repositório são detectadas"""
+        self.repository.criar(Contato(nome="Original", telefone="111"))
+        assert len(self.repository.listar_todos()) == 1
+
+        # Outro processo substitui o arquivo
+        outro = [
+            {'id': 1, 'nome': 'Original', 'telefone': '111'},
+            {'id': 2, 'nome': 'Externo', 'telefone': '222'}
+        ]
+        with open(self.repository.file_path, 'w', encoding='utf-8') as file:
+            json.dump(outro, file)
+
+        nomes = [c.nome for c in self.repository.listar_todos()]
+        assert nomes == ['Original', 'Externo']
+
+def _criar_categorias(data_path, prefixo, quantidade):
+    """Cria categorias em outro processo, com sua própria instância do repositório."""
+    with patch('repositories.categoria_repository.Logger.get_instance'):
+        repositorio = CategoriaRepository(data_path)
+    for i in range(quantidade):
+        repositorio.criar(Categoria(nome=f"{prefixo} {i}"))
+
 @pytest.mark.unit
 class TestCategoriaRepository:
     """Testes unitários para CategoriaRepository"""
@@ -172,6 +503,22 @@ class TestCategoriaRepository:
         with patch('repositories.categoria_repository.Logger.get_instance'):
             self.repository = CategoriaRepository(self.temp_dir)
     
+    def test_escritas_concorrentes_entre_processos(self):
+        """Testa que escritas simultâneas de vários processos não se sobrescrevem"""
+        contexto = multiprocessing.get_context('fork')
+        processos = [
+            contexto.Process(target=_criar_categorias, args=(self.temp_dir, f"P{n}", 15))
+            for n in range(4)
+        ]
+        for processo in processos:
+            processo.start()
+        for processo in processos:
+            processo.join()
+        
+        categorias = self.repository.listar_todas()
+        assert len(categorias) == 60
+        assert len({c.id for c in categorias}) == 60
+    
     def test_criar_categoria_sucesso(self):
         """Testa criação bem-sucedida de categoria"""
         categoria = Categoria(nome="Trabalho", descricao="Contatos profissionais")
@@ -183,6 +530,34 @@ class TestCategoriaRepository:
         assert resultado.nome == "Trabalho"
         assert resultado.descricao == "Contatos profissionais"
     
+    def test_registro_por_id_compartilha_instancias(self):
+        """Testa que o registro de categorias devolve as mesmas instâncias"""
+        trabalho = self.repository.criar(Categoria(nome="Trabalho"))
+        amigos = self.repository.criar(Categoria(nome="Amigos"))
+        
+        registro = self.repository.registro_por_id()
+        
+        assert registro[trabalho.id].nome == "Trabalho"
+        assert self.repository.registro_por_id()[trabalho.id] is registro[trabalho.id]
+        assert self.repository.listar_visoes()[1] is registro[amigos.id]
+        assert Contato(categoria_id=amigos.id).categoria_em(registro) is registro[amigos.id]
+        
+        trabalho.nome = "Serviço"
+        self.repository.atualizar(trabalho)
+        assert self.repository.registro_por_id()[trabalho.id].nome == "Serviço"
+        
+        with pytest.raises(TypeError):
+            registro[99] = None
+    
+    def test_carga_interna_nomes_repetidos(self):
+        """Testa que nomes iguais carregados do arquivo compartilham a string"""
+        with open(self.repository.file_path, 'w', encoding='utf-8') as file:
+            json.dump([{'id': 1, 'nome': 'Família'}, {'id': 2, 'nome': 'Família'}], file)
+        
+        primeira, segunda = self.repository.listar_todas()
+        
+        assert primeira.nome is segunda.nome
+    
     def test_listar_todas_categorias(self):
         """Testa listagem de todas as categorias"""
         # Cria algumas categorias
@@ -236,4 +611,611 @@ class TestCategoriaRepository:
         
         # Verifica exclusão
         categoria_excluida = self.repository.buscar_por_id(categoria_criada.id)
-        assert categoria_excluida is None
\ No newline at end of file
+        assert categoria_excluida is None
+    
+    def test_pontuar_texto(self):
+        """Testa relevância das categorias por nome e descrição"""
+        trabalho = self.repository.criar(Categoria(nome="Trabalho", descricao="Colegas de trabalho"))
+        self.repository.criar(Categoria(nome="Família"))
+        
+        pontuacoes = self.repository.pontuar_texto(termos("trabalho"))
+        
+        assert list(pontuacoes) == [trabalho.id]
+        assert self.repository.pontuar_texto(termos("familia"))
+@pytest.mark.unit
+class TestColecao:
+    """Testes unitários para a coleção indexada por ID"""
+    
+    def test_obter_por_id(self):
+        """Testa busca direta pelo índice de IDs"""
+        colecao = Colecao([{'id': 1, 'nome': 'A'}, {'id': 7, 'nome': 'B'}])
+        
+        assert colecao.obter(7)['nome'] == 'B'
+        assert colecao.obter(3) is None
+        assert len(colecao) == 2
+    
+    def test_substituir_mantem_posicao(self):
+        """Testa que a atualização preserva a ordem dos registros"""
+        colecao = Colecao([{'id': 1, 'nome': 'A'}, {'id': 2, 'nome': 'B'}])
+        
+        anterior = colecao.substituir({'id': 1, 'nome': 'A2'})
+        
+        assert anterior['nome'] == 'A'
+        assert [r['nome'] for r in colecao] == ['A2', 'B']
+        assert colecao.substituir({'id': 9, 'nome': 'X'}) is None
+    
+    def test_remover_preserva_ordem_e_compacta(self):
+        """Testa exclusões sucessivas com compactação das lacunas"""
+        colecao = Colecao({'id': i} for i in range(1, 11))
+        
+        for id in (2, 4, 6, 8, 10, 1):
+            assert colecao.remover(id) == {'id': id}
+        
+        assert colecao.remover(2) is None
+        assert [r['id'] for r in colecao] == [3, 5, 7, 9]
+        assert colecao.obter(9) == {'id': 9}
+        
+        colecao.inserir({'id': 11})
+        assert colecao.registros()[-1] == {'id': 11}
+    
+    def test_falha_ao_indexar_desfaz_escrita(self):
+        """Testa que um registro rejeitado por um índice não fica na coleção"""
+        class IndiceRejeitaNovos:
+            def adicionar(self, registro):
+                if registro['nome'] != 'A':
+                    raise TypeError(registro['nome'])
+            
+            def remover(self, registro):
+                pass
+        
+        colecao = Colecao([{'id': 1, 'nome': 'A'}], {'ids': IndiceIds(), 'rejeita': IndiceRejeitaNovos()})
+        
+        with pytest.raises(TypeError):
+            colecao.inserir({'id': 2, 'nome': 'B'})
+        with pytest.raises(TypeError):
+            colecao.substituir({'id': 1, 'nome': 'A2'})
+        
+        assert colecao.registros() == [{'id': 1, 'nome': 'A'}]
+        assert 2 not in colecao
+        assert colecao.indices['ids'].pagina(10) == [1]
+
+@pytest.mark.unit
+class TestIndiceTrigramas:
+    """Testes unitários para o índice de trigramas"""
+    
+    def setup_method(self):
+        """Configuração para cada teste"""
+        self.indice = IndiceTrigramas('nome')
+        for registro in [
+            {'id': 1, 'nome': 'Mariana Souza'},
+            {'id': 2, 'nome': 'Ana Maria'},
+            {'id': 3, 'nome': 'Pedro'}
+        ]:
+            self.indice.adicionar(registro)
+    
+    def test_buscar_substring(self):
+        """Testa busca por substring sem diferenciar maiúsculas"""
+        assert self.indice.buscar('MARI') == {1, 2}
+        assert self.indice.buscar('ana s') == {1}
+        assert self.indice.buscar('xyz') == set()
+    
+    def test_buscar_sem_acentos(self):
+        """Testa que acentos e maiúsculas são ignorados nos dois lados"""
+        self.indice.adicionar({'id': 4, 'nome': 'João Conceição'})
+        
+        assert self.indice.buscar('joao') == {4}
+        assert self.indice.buscar('CONCEICAO') == {4}
+        assert self.indice.buscar('ção') == {4}
+    
+    def test_buscar_aproximado(self):
+        """Testa busca tolerante a erros de digitação, da mais próxima à mais distante"""
+        assert self.indice.buscar_aproximado('mraia', 2) == [(2, 1), (2, 2)]
+        assert self.indice.buscar_aproximado('pdro', 1) == [(1, 3)]
+        assert self.indice.buscar_aproximado('souzza', 1) == [(1, 1)]
+        assert self.indice.buscar_aproximado('xyz', 1) == []
+    
+    @pytest.mark.parametrize('termo,maximo', [
+        ('joao', 1), ('mraia', 1), ('ana', 1), ('an', 1), ('a', 1), ('fernadna', 2), ('sz', 2)
+    ])
+    def test_buscar_aproximado_termos_curtos(self, termo, maximo):
+        """Testa que os filtros dos termos curtos não perdem resultados"""
+        indice = IndiceTrigramas('nome')
+        nomes = ['João Silva', 'Joana', 'Maria', 'Mário', 'Ana Maria', 'Fernanda', 'Fernando Souza', 'Bia', 'Sz']
+        for id, nome in enumerate(nomes, 1):
+            indice.adicionar({'id': id, 'nome': nome})
+        
+        esperado = sorted(
+            (distancia, id) for id, nome in enumerate(nomes, 1)
+            if (distancia := distancia_trecho(termo, chave_busca(nome), maximo)) is not None
+        )
+        
+        assert indice.buscar_aproximado(termo, maximo) == esperado
+        assert indice.buscar_aproximado(termo, maximo, limite=2) == esperado[:2]
+    
+    def test_estimativa_e_restringir(self):
+        """Testa estimativa de seletividade e verificação de candidatos"""
+        assert self.indice.estimativa('maria') >= 2
+        assert self.indice.estimativa('xyz') == 0
+        assert self.indice.restringir({1, 3}, 'MARIA') == {1}
+    
+    def test_buscar_termo_curto(self):
+        """Testa termos menores que um trigrama"""
+        assert self.indice.buscar('pe') == {3}
+        assert self.indice.buscar('') == {1, 2, 3}
+    
+    def test_remover_registro(self):
+        """Testa que registros removidos deixam de ser encontrados"""
+        self.indice.remover({'id': 2, 'nome': 'Ana Maria'})
+        
+        assert self.indice.buscar('maria') == {1}
+        assert self.indice.buscar('an') == {1}
+
+@pytest.mark.unit
+class TestIndiceTextual:
+    """Testes unitários para o índice textual com relevância BM25"""
+    
+    def setup_method(self):
+        """Configuração para cada teste"""
+        self.indice = IndiceTextual({'nome': termos, 'email': termos})
+        for registro in [
+            {'id': 1, 'nome': 'Ana Maria', 'email': 'ana@exemplo.com'},
+            {'id': 2, 'nome': 'Ana', 'email': None},
+            {'id': 3, 'nome': 'Pedro Silva Santos Oliveira', 'email': 'pedro@ana.com'}
+        ]:
+            self.indice.adicionar(registro)
+    
+    def test_pontuar_por_relevancia(self):
+        """Testa que documentos curtos e com mais ocorrências pontuam mais"""
+        pontuacoes = self.indice.pontuar(['ana'])
+        
+        assert set(pontuacoes) == {1, 2, 3}
+        assert pontuacoes[1] > pontuacoes[3]
+        assert pontuacoes[2] > pontuacoes[3]
+        assert self.indice.pontuar(['joao']) == {}
+    
+    def test_termo_raro_pontua_mais(self):
+        """Testa o peso maior de termos raros (IDF)"""
+        pontuacoes = self.indice.pontuar(['ana', 'maria'])
+        
+        assert max(pontuacoes, key=pontuacoes.get) == 1
+    
+    def test_remover_registro(self):
+        """Testa atualização incremental das listas e tamanhos"""
+        self.indice.remover({'id': 1, 'nome': 'Ana Maria', 'email': 'ana@exemplo.com'})
+        
+        assert set(self.indice.pontuar(['ana'])) == {2, 3}
+        assert self.indice.pontuar(['maria']) == {}
+
+@pytest.mark.unit
+class TestIndiceNomesOrdenados:
+    """Testes unitários para o índice ordenado de nomes"""
+    
+    def setup_method(self):
+        """Configuração para cada teste"""
+        self.indice = IndiceNomesOrdenados('nome')
+        for registro in [
+            {'id': 1, 'nome': 'Mariana'},
+            {'id': 2, 'nome': 'ana'},
+            {'id': 3, 'nome': 'MARCOS'},
+            {'id': 4, 'nome': 'Pedro'}
+        ]:
+            self.indice.adicionar(registro)
+    
+    def test_prefixo_em_ordem_alfabetica(self):
+        """Testa busca por prefixo sem diferenciar maiúsculas"""
+        assert self.indice.prefixo('mar', 10) == [3, 1]
+        assert self.indice.prefixo('M', 1) == [3]
+        assert self.indice.prefixo('z', 10) == []
+    
+    def test_remover_registro(self):
+        """Testa que registros removidos saem do índice"""
+        self.indice.remover({'id': 3, 'nome': 'MARCOS'})
+        
+        assert self.indice.prefixo('mar', 10) == [1]
+    
+    def test_construcao_em_lote(self):
+        """Testa que a carga inicial pela coleção equivale às inserções uma a uma"""
+        colecao = Colecao(
+            [{'id': 1, 'nome': 'Mariana'}, {'id': 2, 'nome': 'ana'}, {'id': 3, 'nome': 'MARCOS'},
+             {'id': 4, 'nome': 'Pedro'}, {'id': 2, 'nome': 'Bia'}],
+            {'nomes': IndiceNomesOrdenados('nome')}
+        )
+        
+        assert [r['nome'] for r in colecao] == ['Mariana', 'Bia', 'MARCOS', 'Pedro']
+        assert colecao.indices['nomes'].prefixo('', 10) == [2, 3, 1, 4]
+        colecao.inserir({'id': 5, 'nome': 'Carla'})
+        assert colecao.indices['nomes'].prefixo('', 10) == [2, 5, 3, 1, 4]
+
+@pytest.mark.unit
+class TestArmazenamentoLog:
+    """Testes unitários para o armazenamento em log de operações"""
+    
+    def setup_method(self):
+        """Configuração para cada teste"""
+        self.temp_dir = tempfile.mkdtemp()
+        with patch('repositories.contato_repository.Logger.get_instance'):
+            self.repository = ContatoRepository(self.temp_dir, armazenamento='log')
+    
+    def _novo_repositorio(self):
+        """Simula a reinicialização da aplicação"""
+        with patch('repositories.contato_repository.Logger.get_instance'):
+            return ContatoRepository(self.temp_dir, armazenamento='log')
+    
+    def test_escritas_acrescentam_ao_log(self):
+        """Testa que escritas não regravam o snapshot"""
+        with open(self.repository.file_path, encoding='utf-8') as file:
+            snapshot = file.read()
+        
+        contato = self.repository.criar(Contato(nome="Log", telefone="111"))
+        contato.nome = "Log Atualizado"
+        self.repository.atualizar(contato)
+        
+        with open(self.repository.file_path, encoding='utf-8') as file:
+            assert file.read() == snapshot
+        with open(self.repository.file_path + '.log', encoding='utf-8') as file:
+            assert len(file.readlines()) == 2
+    
+    def test_reaplica_log_na_inicializacao(self):
+        """Testa que o estado é reconstruído a partir do log"""
+        a = self.repository.criar(Contato(nome="Ana", telefone="111"))
+        b = self.repository.criar(Contato(nome="Bruno", telefone="222"))
+        b.telefone = "333"
+        self.repository.atualizar(b)
+        self.repository.excluir(a.id)
+        
+        contatos = self._novo_repositorio().listar_todos()
+        
+        assert [(c.nome, c.telefone) for c in contatos] == [("Bruno", "333")]
+    
+    def test_compactacao_em_segundo_plano(self):
+        """Testa que o log é compactado no snapshot ao passar do limite"""
+        self.repository._armazenamento.limite_compactacao = 200
+        for i in range(5):
+            self.repository.criar(Contato(nome=f"Contato {i}", telefone=str(i)))
+        self.repository._armazenamento.aguardar_compactacao()
+        
+        with open(self.repository.file_path, encoding='utf-8') as file:
+            assert len(json.load(file)) >= 2
+        assert not os.path.exists(self.repository.file_path + '.log.compactando')
+        assert len(self._novo_repositorio().listar_todos()) == 5
+        assert len(self.repository.listar_todos()) == 5
+    
+    def test_retoma_compactacao_interrompida(self):
+        """Testa que um log rotacionado deixado por um processo encerrado não bloqueia a compactação"""
+        self.repository._armazenamento.limite_compactacao = 200
+        self.repository.criar(Contato(nome="Antes", telefone="0"))
+        # Simula um processo encerrado logo após rotacionar o log
+        os.replace(self.repository.file_path + '.log', self.repository.file_path + '.log.compactando')
+        
+        for i in range(5):
+            self.repository.criar(Contato(nome=f"Contato {i}", telefone=str(i)))
+        self.repository._armazenamento.aguardar_compactacao()
+        
+        assert not os.path.exists(self.repository.file_path + '.log.compactando')
+        with open(self.repository.file_path, encoding='utf-8') as file:
+            assert "Antes" in [registro['nome'] for registro in json.load(file)]
+        assert [c.nome for c in self._novo_repositorio().listar_todos()][:2] == ["Antes", "Contato 0"]
+        assert len(self.repository.listar_todos()) == 6
+    
+    def test_iterar_aplica_log(self):
+        """Testa que a leitura incremental do snapshot aplica o log como a carga completa"""
+        self.repository._armazenamento.limite_compactacao = 150
+        contatos = [self.repository.criar(Contato(nome=f"Contato {i}", telefone=str(i))) for i in range(4)]
+        self.repository._armazenamento.aguardar_compactacao()
+        contatos[1].nome = "Alterado"
+        self.repository.atualizar(contatos[1])
+        self.repository.excluir(contatos[2].id)
+        self.repository.criar(Contato(nome="Novo", telefone="9"))
+        
+        armazenamento = self._novo_repositorio()._armazenamento
+        
+        assert list(armazenamento.iterar()) == armazenamento.carregar()
+        assert [r['nome'] for r in armazenamento.iterar()] == ["Contato 0", "Alterado", "Contato 3", "Novo"]
+    
+    def test_armazenamento_desconhecido(self):
+        """Testa que um mecanismo inválido é rejeitado"""
+        with pytest.raises(ValueError):
+            with patch('repositories.contato_repository.Logger.get_instance'):
+                ContatoRepository(self.temp_dir, armazenamento='xml')
+
+
+@pytest.mark.unit
+class TestLeitorJson:
+    """Testes unitários para a leitura incremental de arrays JSON"""
+    
+    def test_elementos_maiores_que_o_bloco(self):
+        """Testa que elementos divididos entre blocos são lidos inteiros"""
+        registros = [{'id': i, 'nome': f"Contato {i} ç", 'tags': [i, {'x': None}]} for i in range(50)]
+        arquivo = io.StringIO(json.dumps(registros, indent=4, ensure_ascii=False))
+        
+        assert list(ler_registros(arquivo, tamanho_bloco=7)) == registros
+    
+    def test_arquivo_vazio(self):
+        """Testa que arquivos vazios e arrays vazios não produzem elementos"""
+        assert list(ler_registros(io.StringIO(''))) == []
+        assert list(ler_registros(io.StringIO(' [ ] '))) == []
+    
+    @pytest.mark.parametrize('conteudo', ['{"id": 1}', '[{"id": 1},', '[{"id": 1} {"id"'])
+    def test_conteudo_invalido(self, conteudo):
+        """Testa que conteúdos que não são arrays completos são rejeitados"""
+        with pytest.raises(ValueError):
+            list(ler_registros(io.StringIO(conteudo), tamanho_bloco=4))
+
+
+@pytest.mark.unit
+class TestFormatos:
+    """Testes unitários para os formatos dos arquivos de dados"""
+    
+    def setup_method(self):
+        """Configuração para cada teste"""
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def _novo_repositorio(self, **kwargs):
+        """Simula a reinicialização da aplicação com o formato informado"""
+        with patch('repositories.contato_repository.Logger.get_instance'):
+            return ContatoRepository(self.temp_dir, **kwargs)
+    
+    @pytest.mark.parametrize('armazenamento', ['json', 'log'])
+    @pytest.mark.parametrize('formato,compressao,arquivo', [
+        ('compacto', None, 'contatos.json'),
+        ('ndjson', None, 'contatos.jsonl'),
+        ('json', 'zlib', 'contatos.json.gz'),
+        ('ndjson', 'lzma', 'contatos.jsonl.xz')
+    ])
+    def test_escritas_persistem(self, armazenamento, formato, compressao, arquivo):
+        """Testa que cada formato relê o que gravou, inclusive pela leitura incremental"""
+        repository = self._novo_repositorio(armazenamento=armazenamento, formato=formato, compressao=compressao)
+        ana = repository.criar(Contato(nome="Ana Ç", telefone="1", categoria_id=1))
+        repository.criar(Contato(nome="Bia", telefone="2"))
+        ana.email = "ana@email.com"
+        repository.atualizar(ana)
+        
+        novo = self._novo_repositorio(armazenamento=armazenamento, formato=formato, compressao=compressao)
+        
+        assert novo.file_path == os.path.join(self.temp_dir, arquivo)
+        assert [c.to_dict() for c in novo.listar_todos()] == [c.to_dict() for c in repository.listar_todos()]
+        assert list(novo.iterar_registros()) == list(repository.iterar_registros())
+        assert novo.buscar_por_id(ana.id).email == "ana@email.com"
+    
+    def test_compacto_sem_espacos(self):
+        """Testa que o formato compacto grava o JSON sem indentação"""
+        repository = self._novo_repositorio(formato='compacto')
+        repository.criar(Contato(nome="Ana", telefone="1"))
+        
+        with open(repository.file_path, encoding='utf-8') as file:
+            assert file.read() == '[{"id":1,"nome":"Ana","telefone":"1","email":null,"categoria_id":null}]'
+    
+    def test_migracao_do_json(self):
+        """Testa que um contatos.json existente é convertido para o formato configurado"""
+        original = self._novo_repositorio()
+        original.criar(Contato(nome="Ana", telefone="1"))
+        original.criar(Contato(nome="Bia", telefone="2", categoria_id=3))
+        
+        migrado = self._novo_repositorio(formato='ndjson', compressao='zlib')
+        
+        assert [c.to_dict() for c in migrado.listar_todos()] == [c.to_dict() for c in original.listar_todos()]
+        assert os.path.exists(original.file_path)
+        assert migrado.criar(Contato(nome="Carla", telefone="3")).id == 3
+    
+    def test_formato_desconhecido(self):
+        """Testa que formatos e compressões inválidos são rejeitados"""
+        with pytest.raises(ValueError):
+            self._novo_repositorio(formato='xml')
+        with pytest.raises(ValueError):
+            self._novo_repositorio(compressao='bz2')
+
+
+@pytest.mark.unit
+class TestTabelaColunar:
+    """Testes unitários para a tabela colunar de contatos"""
+    
+    def setup_method(self):
+        """Configuração para cada teste"""
+        self.tabela = TabelaColunar()
+        for registro in [
+            {'id': 1, 'nome': 'Mariana Souza', 'telefone': '(11) 9999-0000', 'email': 'm@x.com', 'categoria_id': 1},
+            {'id': 2, 'nome': 'Ana Maria', 'telefone': '2', 'email': None, 'categoria_id': 2},
+            {'id': 3, 'nome': 'Pedro', 'telefone': '3', 'email': 'p@x.com', 'categoria_id': None}
+        ]:
+            self.tabela.adicionar(registro)
+    
+    def test_selecionar_por_colunas(self):
+        """Testa seleção por trecho do nome, categoria e valores exatos"""
+        assert self.tabela.ids_selecionados(self.tabela.selecionar({'nome': 'MARI'})) == [1, 2]
+        assert self.tabela.ids_selecionados(self.tabela.selecionar({'nome': 'mari', 'categoria_id': 2})) == [2]
+        assert self.tabela.ids_selecionados(self.tabela.selecionar({'categoria_id': None})) == [3]
+        assert self.tabela.ids_selecionados(self.tabela.selecionar({'telefone': '+55 11 9999 0000'})) == [1]
+        assert self.tabela.ids_selecionados(self.tabela.selecionar({'email': 'x.com'})) == []
+    
+    def test_contar_por_categoria(self):
+        """Testa agrupamento por categoria sobre as linhas selecionadas"""
+        assert self.tabela.contar_por_categoria() == {1: 1, 2: 1, None: 1}
+        assert self.tabela.contar_por_categoria(self.tabela.selecionar({'nome': 'a'})) == {1: 1, 2: 1}
+    
+    def test_remocao_e_compactacao(self):
+        """Testa que linhas removidas somem das consultas e são compactadas"""
+        self.tabela.remover({'id': 1})
+        self.tabela.remover({'id': 2})
+        self.tabela.adicionar({'id': 4, 'nome': 'Mariana', 'categoria_id': 1})
+        
+        assert len(self.tabela) == 2
+        assert list(self.tabela.ids) == [3, 4]
+        assert self.tabela.ids_selecionados(self.tabela.selecionar({'nome': 'mari'})) == [4]
+        assert self.tabela.contar_por_categoria() == {None: 1, 1: 1}
+    
+    def test_categorias_e_ids_sem_valores_reservados(self):
+        """Testa categorias 0 e -1 e IDs acima de 32 bits"""
+        self.tabela.adicionar({'id': 2 ** 40, 'nome': 'Zero', 'categoria_id': 0})
+        self.tabela.adicionar({'id': 5, 'nome': 'Negativa', 'categoria_id': -1})
+        self.tabela.remover({'id': 2})
+        
+        assert self.tabela.contar_por_categoria() == {1: 1, None: 1, 0: 1, -1: 1}
+        assert self.tabela.ids_selecionados(self.tabela.selecionar({'categoria_id': 0})) == [2 ** 40]
+        assert self.tabela.ids_selecionados(self.tabela.selecionar({'categoria_id': None})) == [3]
+        assert self.tabela.ids_selecionados(self.tabela.selecionar({'categoria_id': -1})) == [5]
+        assert self.tabela.completa
+    
+    def test_registros_fora_da_tabela(self):
+        """Testa que IDs e categorias não representáveis ficam fora da tabela"""
+        self.tabela.adicionar({'id': 2 ** 63, 'nome': 'Grande'})
+        self.tabela.adicionar({'id': 4, 'nome': 'Texto', 'categoria_id': '2'})
+        
+        assert not self.tabela.completa and self.tabela.fora == 2
+        assert len(self.tabela) == 3 and len(self.tabela.ids) == 3
+        assert self.tabela.contar_por_categoria() == {1: 1, 2: 1, None: 1}
+        
+        self.tabela.remover({'id': 2 ** 63})
+        self.tabela.remover({'id': 4})
+        assert self.tabela.completa
+
+@pytest.mark.unit
+class TestMmapContatoRepository:
+    """Testes unitários para o repositório de contatos lido por mmap"""
+    
+    def setup_method(self):
+        """Configuração para cada teste"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.repository = self._novo_repositorio()
+    
+    def _novo_repositorio(self, **kwargs):
+        """Simula a reinicialização da aplicação"""
+        with patch('repositories.mmap_contato_repository.Logger.get_instance'):
+            return MmapContatoRepository(self.temp_dir, **kwargs)
+    
+    def test_escritas_persistem_entre_instancias(self):
+        """Testa que o índice de deslocamentos é reconstruído a partir do arquivo"""
+        ana = self.repository.criar(Contato(nome="Ana", telefone="1"))
+        bia = self.repository.criar(Contato(nome="Bia", telefone="2"))
+        ana.nome = "Ana Maria"
+        self.repository.atualizar(ana)
+        self.repository.excluir(bia.id)
+        
+        contatos = self._novo_repositorio().listar_todos()
+        
+        assert [(c.id, c.nome) for c in contatos] == [(ana.id, "Ana Maria")]
+        assert self.repository.excluir(bia.id) is False
+        assert self.repository.atualizar(Contato(id=99, nome="X", telefone="1")) is False
+    
+    def test_emails_unicos_na_escrita(self):
+        """Testa a recusa de emails duplicados, inclusive dentro do mesmo lote"""
+        ana = self.repository.criar(Contato(nome="Ana", telefone="1", email="ana@x.com"))
+        
+        resultados = self.repository.executar_lote([
+            ('atualizar', Contato(id=ana.id, nome="Ana", telefone="1", email="nova@x.com")),
+            ('criar', Contato(nome="Bia", telefone="2", email="ANA@x.com")),
+            ('criar', Contato(nome="Carla", telefone="3", email="nova@x.com"))
+        ], emails_unicos=True)
+        
+        assert resultados[0] is True and resultados[1].nome == "Bia" and resultados[2] is None
+        assert self.repository.criar(Contato(nome="Davi", telefone="4", email="ana@x.com"), emails_unicos=True) is None
+        assert [c.nome for c in self._novo_repositorio().listar_todos()] == ["Ana", "Bia"]
+    
+    def test_iterar_registros(self):
+        """Testa a exportação registro a registro"""
+        self.repository.criar(Contato(nome="Ana", telefone="1", categoria_id=1))
+        bia = self.repository.criar(Contato(nome="Bia", telefone="2"))
+        self.repository.criar(Contato(nome="Carla", telefone="3", categoria_id=1))
+        self.repository.excluir(bia.id)
+        
+        assert [r['nome'] for r in self.repository.iterar_registros()] == ["Ana", "Carla"]
+        assert [r['nome'] for r in self.repository.iterar_registros({'nome': 'carl'})] == ["Carla"]
+    
+    def test_migra_contatos_json(self):
+        """Testa a migração transparente do arquivo JSON existente"""
+        temp_dir = tempfile.mkdtemp()
+        with open(os.path.join(temp_dir, 'contatos.json'), 'w', encoding='utf-8') as file:
+            json.dump([{'id': 7, 'nome': 'João', 'telefone': '1', 'email': None, 'categoria_id': 2}], file)
+        
+        with patch('repositories.mmap_contato_repository.Logger.get_instance'):
+            repositorio = MmapContatoRepository(temp_dir)
+        
+        assert repositorio.buscar_por_id(7).nome == 'João'
+        assert repositorio.criar(Contato(nome="Novo", telefone="2")).id == 8
+    
+    def test_migra_pelo_armazenamento_configurado(self):
+        """Testa a migração de um arquivo comprimido com operações pendentes no log"""
+        temp_dir = tempfile.mkdtemp()
+        with patch('repositories.contato_repository.Logger.get_instance'):
+            origem = ContatoRepository(temp_dir, armazenamento='log', formato='ndjson', compressao='lzma')
+        ana = origem.criar(Contato(nome="Ana", telefone="1"))
+        bia = origem.criar(Contato(nome="Bia", telefone="2"))
+        origem.excluir(ana.id)
+        assert os.path.exists(origem._armazenamento.log_path)
+        
+        with patch('repositories.mmap_contato_repository.Logger.get_instance'):
+            repositorio = MmapContatoRepository(temp_dir, armazenamento='log', formato='ndjson', compressao='lzma')
+        
+        assert [(c.id, c.nome) for c in repositorio.listar_todos()] == [(bia.id, "Bia")]
+    
+    def test_cache_limitado_e_copias(self):
+        """Testa o limite do cache LRU e que o contato em cache não é exposto"""
+        repositorio = self._novo_repositorio(tamanho_cache=2)
+        ids = [repositorio.criar(Contato(nome=f"C{i}", telefone="1")).id for i in range(4)]
+        for id in ids:
+            repositorio.buscar_por_id(id)
+        
+        contato = repositorio.buscar_por_id(ids[-1])
+        contato.nome = "Alterado"
+        
+        assert list(repositorio._contatos) == [ids[2], ids[3]]
+        assert repositorio.buscar_por_id(ids[-1]).nome == "C3"
+    
+    def test_compactacao(self, monkeypatch):
+        """Testa que linhas obsoletas são descartadas ao passar do limite"""
+        monkeypatch.setattr(mmap_contato_repository, 'MINIMO_COMPACTACAO', 0)
+        contato = self.repository.criar(Contato(nome="Ana", telefone="1"))
+        outro = self.repository.criar(Contato(nome="Bia", telefone="2"))
+        for i in range(5):
+            contato.telefone = str(i)
+            self.repository.atualizar(contato)
+        
+        with open(self.repository.file_path, 'rb') as file:
+            assert len(file.read().splitlines()) <= 4
+        assert self.repository.buscar_por_id(contato.id).telefone == "4"
+        assert [c.nome for c in self._novo_repositorio().listar_todos()] == ["Ana", "Bia"]
+        assert self.repository.buscar_por_id(outro.id).nome == "Bia"
+    
+    def test_linha_truncada_e_ignorada(self):
+        """Testa que uma escrita interrompida não corrompe as seguintes"""
+        self.repository.criar(Contato(nome="Ana", telefone="1"))
+        with open(self.repository.file_path, 'ab') as file:
+            file.write(b'{"id": 50, "nome"')
+        
+        repositorio = self._novo_repositorio()
+        repositorio.criar(Contato(nome="Bia", telefone="2"))
+        
+        assert [c.nome for c in self._novo_repositorio().listar_todos()] == ["Ana", "Bia"]
+    
+    def test_consultas_equivalentes_ao_backend_json(self):
+        """Testa que as buscas por varredura dão o mesmo resultado do backend JSON"""
+        with patch('repositories.contato_repository.Logger.get_instance'):
+            json_repo = ContatoRepository(tempfile.mkdtemp())
+        for nome, telefone, email, categoria_id in [
+            ("Ana Silva", "(11) 99999-0000", "ana@exemplo.com", 1),
+            ("João Silva", "2", "joao@exemplo.com", 2),
+            ("Mariana", "3", None, None),
+            ("Silvana Souza", "4", "ana@exemplo.com", 1)
+        ]:
+            for repositorio in (self.repository, json_repo):
+                repositorio.criar(Contato(nome=nome, telefone=telefone, email=email, categoria_id=categoria_id))
+        
+        def ids(contatos):
+            return [c.id for c in contatos]
+        
+        for repositorio in (self.repository, json_repo):
+            assert ids(repositorio.buscar_por_nome("silva")) == [1, 2, 4]
+            assert ids(repositorio.filtrar({'nome': 'ana', 'categoria_id': 1})) == [1, 4]
+            assert ids(repositorio.buscar_por_telefone("+55 11 99999 0000")) == [1]
+            assert ids(repositorio.buscar_por_email("ANA@exemplo.com")) == [1, 4]
+            assert ids(repositorio.buscar_por_categoria(None)) == [3]
+            assert ids(repositorio.autocompletar("ma")) == [3]
+            assert ids(repositorio.buscar_aproximado("jaão")) == [2]
+            assert ids(repositorio.buscar_aproximado("silvna", 1, {'categoria_id': 2})) == [2]
+            assert ids(repositorio.buscar_aproximado("silvna", 2, {'email': 'ana@exemplo.com'})) == [1, 4]
+            assert repositorio.contar_por_categoria() == {1: 2, 2: 1, None: 1}
+        
+        assert [(c.id, round(p, 6)) for c, p in self.repository.pesquisar_texto(["silva", "ana"])] == \
+            [(c.id, round(p, 6)) for c, p in json_repo.pesquisar_texto(["silva", "ana"])]
+        assert self.repository.listar_pagina(2, 2)[0][0].id == json_repo.listar_pagina(2, 2)[0][0].id
+        assert ids(self.repository.filtrar_pagina({'nome': 'silva'}, 1, 1)[0]) == [2]
+        assert self.repository.filtrar_pagina({'nome': 'silva'}, 1, 1)[1] == 2
\ No newline at end of file
@@ -2,6 +2,8 @@ import pytest
 from unittest.mock import Mock, patch
 from services.contato_service import ContatoService
 from services.categoria_service import CategoriaService
+from services.busca_service import BuscaService
+from services.cache_busca import CacheBuscaNome
 from models.contato import Contato
 from models.categoria import Categoria
 
@@ -14,6 +16,7 @@ class TestContatoService:
         with patch('services.contato_service.Logger.get_instance'):
             self.service = ContatoService()
         self.service.repository = Mock()
+        self.service.repository.versoes_escrita.return_value = (1, 2)
     
     def test_listar_todos_contatos(self):
         """Testa listagem de todos os contatos"""
@@ -120,6 +123,178 @@ class TestContatoService:
         # Assert
         assert resultado is True
         self.service.repository.excluir.assert_called_once_with(1)
+    
+    def test_contar_por_categoria(self):
+        """Testa contagem de contatos por categoria"""
+        # Arrange
+        self.service.repository.contar_por_categoria.return_value = {1: 3, None: 1}
+        
+        # Act
+        resultado = self.service.contar_por_categoria()
+        
+        # Assert
+        assert resultado == {1: 3, None: 1}
+        self.service.repository.contar_por_categoria.assert_called_once()
+    
+    def test_criar_em_lote_ignora_itens_invalidos(self):
+        """Testa que itens inválidos não chegam ao repositório"""
+        # Arrange
+        self.service.repository.criar_em_lote.side_effect = lambda contatos, **_: [
+            Contato(id=i, nome=c.nome, telefone=c.telefone) for i, c in enumerate(contatos, 1)
+        ]
+        
+        # Act
+        resultado = self.service.criar_em_lote([
+            {'nome': 'João', 'telefone': '123'},
+            {'nome': 'Sem telefone'},
+            {'nome': 'Maria', 'telefone': '456'}
+        ])
+        
+        # Assert
+        assert [c.nome if c else None for c in resultado] == ['João', None, 'Maria']
+        contatos_passados = self.service.repository.criar_em_lote.call_args[0][0]
+        assert len(contatos_passados) == 2
+    
+    def test_atualizar_em_lote(self):
+        """Testa atualização em lote com item sem ID"""
+        # Arrange
+        self.service.repository.atualizar_em_lote.return_value = [True]
+        
+        # Act
+        resultado = self.service.atualizar_em_lote([
+            {'nome': 'Sem ID', 'telefone': '1'},
+            {'id': 1, 'nome': 'João', 'telefone': '123'}
+        ])
+        
+        # Assert
+        assert resultado == [False, True]
+        contato_passado = self.service.repository.atualizar_em_lote.call_args[0][0][0]
+        assert contato_passado.id == 1
+    
+    def test_email_duplicado_rejeitado(self):
+        """Testa que a política 'rejeitar' delega a verificação à escrita do repositório"""
+        self.service.politica_email = 'rejeitar'
+        self.service.repository.criar.return_value = None
+        
+        assert self.service.criar("Ana", "1", "BIA@exemplo.com") is None
+        assert self.service.repository.criar.call_args[1] == {'emails_unicos': True}
+        self.service.repository.buscar_por_email.assert_not_called()
+    
+    def test_email_duplicado_no_mesmo_lote(self):
+        """Testa que o lote inteiro segue para o repositório, que recusa os emails repetidos"""
+        self.service.politica_email = 'rejeitar'
+        self.service.repository.criar_em_lote.return_value = [Contato(id=1, nome="A", telefone="1"), None]
+        
+        resultado = self.service.criar_em_lote([
+            {'nome': 'A', 'telefone': '1', 'email': 'x@y.com'},
+            {'nome': 'B', 'telefone': '2', 'email': 'X@Y.com'}
+        ])
+        
+        assert resultado[1] is None
+        assert self.service.repository.criar_em_lote.call_args[1] == {'emails_unicos': True}
+    
+    def test_email_duplicado_avisado(self):
+        """Testa que a política 'avisar' grava o contato sem exigir email único"""
+        self.service.politica_email = 'avisar'
+        self.service.repository.buscar_por_email.return_value = [Contato(id=2, nome="Bia", telefone="2")]
+        self.service.repository.criar.return_value = Contato(id=3, nome="Ana", telefone="1")
+        
+        assert self.service.criar("Ana", "1", "bia@exemplo.com") is not None
+        assert self.service.repository.criar.call_args[1] == {'emails_unicos': False}
+        self.service.logger.warning.assert_called_once()
+    
+    def test_politica_email_desconhecida(self):
+        """Testa política de email inválida"""
+        with patch('services.contato_service.Logger.get_instance'), \
+                patch('services.contato_service.obter_contato_repository'):
+            with pytest.raises(ValueError):
+                ContatoService(politica_email='ignorar')
+    
+    def test_buscar_por_telefone_vazio(self):
+        """Testa que telefone vazio não consulta o repositório"""
+        assert self.service.buscar_por_telefone("") == []
+        self.service.repository.buscar_por_telefone.assert_not_called()
+    
+    def test_buscar_por_nome_refina_cache(self):
+        """Testa que uma busca que estende outra não consulta o repositório"""
+        self.service.repository.buscar_por_nome.return_value = [
+            Contato(id=1, nome="Ana", telefone="1"),
+            Contato(id=2, nome="Anabela", telefone="2")
+        ]
+        
+        assert len(self.service.buscar_por_nome("ana")) == 2
+        assert [c.id for c in self.service.buscar_por_nome("ANAB")] == [2]
+        self.service.repository.buscar_por_nome.assert_called_once_with("ana")
+    
+    def test_escrita_atualiza_cache(self):
+        """Testa que criar e excluir refletem nos resultados em cache"""
+        self.service.repository.versao.return_value = 1
+        self.service.repository.versoes_escrita.side_effect = [(1, 2), (2, 3)]
+        self.service.repository.buscar_por_nome.return_value = [Contato(id=1, nome="Ana", telefone="1")]
+        self.service.buscar_por_nome("ana")
+        
+        self.service.repository.criar.return_value = Contato(id=3, nome="Mariana", telefone="3")
+        self.service.criar("Mariana", "3")
+        self.service.repository.excluir.return_value = True
+        self.service.excluir(1)
+        self.service.repository.versao.return_value = 3
+        
+        assert [c.id for c in self.service.buscar_por_nome("ana")] == [3]
+        self.service.repository.buscar_por_nome.assert_called_once()
+    
+    def test_filtrar_ignora_filtros_vazios(self):
+        """Testa que apenas os filtros informados são repassados"""
+        self.service.repository.filtrar.return_value = []
+        
+        self.service.filtrar(nome="Ana", categoria_id=2, telefone="")
+        
+        self.service.repository.filtrar.assert_called_once_with({'nome': 'Ana', 'categoria_id': 2})
+    
+    def test_buscar_aproximado(self):
+        """Testa delegação da busca aproximada"""
+        self.service.repository.buscar_aproximado.return_value = []
+        
+        assert self.service.buscar_aproximado("joao", 5) == []
+        assert self.service.buscar_aproximado("") == []
+        self.service.repository.buscar_aproximado.assert_called_once_with("joao", 5, {})
+        
+        self.service.buscar_aproximado("joao", 5, categoria_id=2, telefone="")
+        self.service.repository.buscar_aproximado.assert_called_with("joao", 5, {'categoria_id': 2})
+    
+    def test_autocompletar_prefixo_vazio(self):
+        """Testa que prefixo vazio não consulta o repositório"""
+        assert self.service.autocompletar("") == []
+        self.service.repository.autocompletar.assert_not_called()
+    
+    def test_filtrar_pagina(self):
+        """Testa que a página filtrada é montada pelo repositório"""
+        self.service.repository.filtrar_pagina.return_value = ([], None)
+        
+        assert self.service.filtrar_pagina(2, 5, nome="Ana", telefone="") == ([], None)
+        self.service.repository.filtrar_pagina.assert_called_once_with({'nome': 'Ana'}, 2, 5)
+        
+        self.service.filtrar_pagina(2)
+        self.service.repository.listar_pagina.assert_called_once_with(2, None)
+    
+    def test_executar_lote_misto(self):
+        """Testa lote misto com uma única chamada ao repositório"""
+        # Arrange
+        contato_criado = Contato(id=7, nome="Novo", telefone="1")
+        self.service.repository.executar_lote.return_value = [contato_criado, True]
+        
+        # Act
+        resultado = self.service.executar_lote([
+            {'op': 'criar', 'dados': {'nome': 'Novo', 'telefone': '1'}},
+            {'op': 'atualizar', 'dados': {'nome': 'Sem ID', 'telefone': '2'}},
+            {'op': 'excluir', 'id': 3}
+        ])
+        
+        # Assert
+        assert resultado == [contato_criado, False, True]
+        self.service.repository.executar_lote.assert_called_once()
+        operacoes = self.service.repository.executar_lote.call_args[0][0]
+        assert [op for op, _ in operacoes] == ['criar', 'excluir']
+        assert operacoes[1][1] == 3
 
 @pytest.mark.unit
 class TestCategoriaService:
@@ -209,4 +384,99 @@ class TestCategoriaService:
         
         # Assert
         assert resultado == categoria_mock
-        self.service.repository.buscar_por_id.assert_called_once_with(5)
\ No newline at end of file
+        self.service.repository.buscar_por_id.assert_called_once_with(5)
+
+@pytest.mark.unit
+class TestCacheBuscaNome:
+    """Testes unitários para o cache de buscas por nome"""
+    
+    def setup_method(self):
+        """Configuração para cada teste"""
+        self.versao = 1
+        self.cache = CacheBuscaNome(lambda: self.versao, capacidade=2)
+        self.consultar = Mock(return_value=[Contato(id=1, nome="João Silva", telefone="1")])
+    
+    def test_alteracao_externa_descarta_cache(self):
+        """Testa que uma nova versão dos dados força nova consulta"""
+        self.cache.buscar("joao", self.consultar)
+        self.cache.buscar("joao", self.consultar)
+        assert self.consultar.call_count == 1
+        
+        self.versao = 2
+        self.cache.buscar("joao", self.consultar)
+        assert self.consultar.call_count == 2
+    
+    def test_resultados_sao_copias(self):
+        """Testa que alterar um contato retornado não afeta o cache nem outras consultas"""
+        contato = self.cache.buscar("joao", self.consultar)[0]
+        contato.nome = "Alterado"
+        
+        for termo in ("joao", "joao s"):
+            resultado = self.cache.buscar(termo, self.consultar)
+            assert [c.nome for c in resultado] == ["João Silva"]
+            assert resultado[0] is not contato
+        assert self.consultar.call_count == 1
+    
+    def test_capacidade_lru(self):
+        """Testa que o termo usado há mais tempo é descartado"""
+        self.cache.buscar("silva", self.consultar)
+        self.cache.buscar("ana", self.consultar)
+        self.cache.buscar("silva", self.consultar)
+        self.cache.buscar("pedro", self.consultar)
+        
+        assert self.consultar.call_count == 3
+        self.cache.buscar("silva", self.consultar)
+        assert self.consultar.call_count == 3
+    
+    def test_registrar_alteracao_de_nome(self):
+        """Testa que um contato renomeado sai das entradas que não atende mais"""
+        self.cache.buscar("joao", self.consultar)
+        
+        self.cache.registrar(Contato(id=1, nome="Pedro", telefone="1"), (1, 2))
+        self.versao = 2
+        
+        assert self.cache.buscar("joao", self.consultar) == []
+        assert self.consultar.call_count == 1
+    
+    def test_escrita_externa_antes_do_registro_descarta_cache(self):
+        """Testa que outra escrita entre a busca e a do serviço força nova consulta"""
+        self.cache.buscar("joao", self.consultar)
+        
+        # A escrita do serviço partiu da versão 2, gravada por outro processo
+        self.cache.remover(2, (2, 3))
+        self.versao = 3
+        
+        self.cache.buscar("joao", self.consultar)
+        assert self.consultar.call_count == 2
+        self.cache.buscar("joao", self.consultar)
+        assert self.consultar.call_count == 2
+
+@pytest.mark.unit
+class TestBuscaService:
+    """Testes unitários para BuscaService"""
+    
+    def setup_method(self):
+        """Configuração para cada teste"""
+        with patch('services.busca_service.Logger.get_instance'), \
+                patch('services.busca_service.obter_contato_repository'), \
+                patch('services.busca_service.obter_categoria_repository'):
+            self.service = BuscaService()
+        self.service.contato_repository = Mock()
+        self.service.categoria_repository = Mock()
+    
+    def test_pesquisar_combina_categorias(self):
+        """Testa que a relevância das categorias é repassada com peso"""
+        self.service.categoria_repository.pontuar_texto.return_value = {3: 2.0}
+        self.service.contato_repository.pesquisar_texto.return_value = []
+        
+        self.service.pesquisar("João Trabalho", 5)
+        
+        self.service.categoria_repository.pontuar_texto.assert_called_once_with(['joao', 'trabalho'])
+        self.service.contato_repository.pesquisar_texto.assert_called_once_with(
+            ['joao', 'trabalho'], {3: 2.0 * BuscaService.PESO_CATEGORIA}, 5
+        )
+    
+    def test_pesquisar_vazio(self):
+        """Testa consulta sem termos"""
+        assert self.service.pesquisar(" - ") == []
+        self.service.contato_repository.pesquisar_texto.assert_not_called()
\ No newline at end of file
@@ -0,0 +1,392 @@
+import pytest
+import os
+import tempfile
+import threading
+from unittest.mock import patch
+from repositories.sqlite_contato_repository import SqliteContatoRepository
+from repositories.sqlite_categoria_repository import SqliteCategoriaRepository
+from repositories.contato_repository import ContatoRepository
+from repositories.categoria_repository import CategoriaRepository
+from repositories.mmap_contato_repository import MmapContatoRepository
+from repositories.fabrica import (
+    criar_contato_repository, criar_categoria_repository, obter_contato_repository, obter_categoria_repository
+)
+from services.busca_service import BuscaService
+from services.categoria_service import CategoriaService
+from services.contato_service import ContatoService
+from models.contato import Contato
+from models.categoria import Categoria
+
+@pytest.mark.unit
+class TestSqliteContatoRepository:
+    """Testes unitários para SqliteContatoRepository"""
+    
+    def setup_method(self):
+        """Configuração para cada teste"""
+        self.temp_dir = tempfile.mkdtemp()
+        with patch('repositories.sqlite_contato_repository.Logger.get_instance'):
+            self.repository = SqliteContatoRepository(self.temp_dir)
+    
+    def test_modo_wal(self):
+        """Testa que o banco opera em modo WAL"""
+        modo = self.repository._conexao.obter().execute("PRAGMA journal_mode").fetchone()[0]
+        assert modo == 'wal'
+    
+    def test_criar_e_buscar_por_id(self):
+        """Testa criação e busca por ID"""
+        criado = self.repository.criar(Contato(nome="João", telefone="123", categoria_id=1))
+        
+        encontrado = self.repository.buscar_por_id(criado.id)
+        
+        assert criado.id == 1
+        assert encontrado.nome == "João"
+        assert encontrado.categoria_id == 1
+        assert self.repository.buscar_por_id(999) is None
+    
+    def test_buscar_por_nome_case_insensitive(self):
+        """Testa busca parcial sem diferenciar maiúsculas, inclusive acentuadas"""
+        self.repository.criar(Contato(nome="ÉRICA Souza", telefone="1"))
+        self.repository.criar(Contato(nome="Pedro", telefone="2"))
+        
+        resultados = self.repository.buscar_por_nome("érica")
+        
+        assert [c.nome for c in resultados] == ["ÉRICA Souza"]
+    
+    def test_buscar_e_contar_por_categoria(self):
+        """Testa filtro e contagem por categoria"""
+        self.repository.criar(Contato(nome="A", telefone="1", categoria_id=1))
+        self.repository.criar(Contato(nome="B", telefone="2", categoria_id=1))
+        self.repository.criar(Contato(nome="C", telefone="3"))
+        
+        assert len(self.repository.buscar_por_categoria(1)) == 2
+        assert [c.nome for c in self.repository.buscar_por_categoria(None)] == ["C"]
+        assert self.repository.contar_por_categoria() == {1: 2, None: 1}
+        assert self.repository.contar_por_categoria({'nome': 'b'}) == {1: 1}
+    
+    def test_iterar_registros(self):
+        """Testa a exportação registro a registro com filtros"""
+        self.repository.criar(Contato(nome="Ana", telefone="1", categoria_id=1))
+        self.repository.criar(Contato(nome="Bia", telefone="2"))
+        
+        assert [r['nome'] for r in self.repository.iterar_registros()] == ["Ana", "Bia"]
+        assert list(self.repository.iterar_registros({'categoria_id': None})) == [
+            {'id': 2, 'nome': "Bia", 'telefone': "2", 'email': None, 'categoria_id': None}
+        ]
+    
+    def test_autocompletar(self):
+        """Testa sugestões por prefixo"""
+        self.repository.criar(Contato(nome="Érica", telefone="1"))
+        self.repository.criar(Contato(nome="eduardo", telefone="2"))
+        self.repository.criar(Contato(nome="Ana", telefone="3"))
+        
+        assert [c.nome for c in self.repository.autocompletar("ÉR")] == ["Érica"]
+        assert [c.nome for c in self.repository.autocompletar("e")] == ["eduardo", "Érica"]
+    
+    def test_buscar_por_nome_sem_acentos(self):
+        """Testa busca por nome ignorando acentos"""
+        self.repository.criar(Contato(nome="João Conceição", telefone="1"))
+        
+        assert [c.nome for c in self.repository.buscar_por_nome("CONCEICAO")] == ["João Conceição"]
+    
+    def test_buscar_por_telefone(self):
+        """Testa busca por telefone em formatos diferentes"""
+        self.repository.criar(Contato(nome="Ana", telefone="(11) 99999-9999"))
+        
+        assert [c.nome for c in self.repository.buscar_por_telefone("+5511999999999")] == ["Ana"]
+        assert self.repository.buscar_por_telefone("-") == []
+    
+    def test_buscar_por_email(self):
+        """Testa busca exata por email sem diferenciar maiúsculas"""
+        self.repository.criar(Contato(nome="Ana", telefone="1", email="Ana@Exemplo.com"))
+        
+        assert [c.nome for c in self.repository.buscar_por_email("ana@exemplo.com")] == ["Ana"]
+        assert self.repository.buscar_por_email("") == []
+    
+    def test_emails_unicos_na_escrita(self):
+        """Testa a recusa de emails duplicados dentro da transação"""
+        ana = self.repository.criar(Contato(nome="Ana", telefone="1", email="ana@x.com"))
+        
+        assert self.repository.criar(Contato(nome="Bia", telefone="2", email="ANA@x.com"), emails_unicos=True) is None
+        assert self.repository.atualizar(ana, emails_unicos=True) is True
+        resultados = self.repository.executar_lote([
+            ('criar', Contato(nome="Carla", telefone="3", email="c@x.com")),
+            ('criar', Contato(nome="Davi", telefone="4", email="C@x.com"))
+        ], emails_unicos=True)
+        
+        assert resultados[0].nome == "Carla" and resultados[1] is None
+        assert [c.nome for c in self.repository.listar_todos()] == ["Ana", "Carla"]
+    
+    def test_filtrar(self):
+        """Testa filtros combinados em uma única consulta"""
+        self.repository.criar(Contato(nome="Ana Souza", telefone="1", categoria_id=1))
+        self.repository.criar(Contato(nome="Ana Lima", telefone="2", categoria_id=2))
+        
+        assert [c.nome for c in self.repository.filtrar({'nome': 'ana', 'categoria_id': 2})] == ["Ana Lima"]
+        assert len(self.repository.filtrar({})) == 2
+    
+    def test_busca_por_trecho_usa_indice_de_trigramas(self):
+        """Testa que a busca por trecho do nome não percorre a tabela inteira"""
+        ana = self.repository.criar(Contato(nome='Ana "Nina" Souza', telefone="1"))
+        self.repository.criar(Contato(nome="Pedro", telefone="2"))
+        
+        where, parametros = self.repository._condicoes({'nome': 'souza'})
+        plano = [
+            linha['detail'] for linha in self.repository._conexao.obter().execute(
+                f"EXPLAIN QUERY PLAN SELECT id FROM contatos {where}ORDER BY id", parametros
+            )
+        ]
+        
+        assert any('contatos_trigramas VIRTUAL TABLE INDEX' in detalhe for detalhe in plano)
+        assert not any(detalhe.startswith('SCAN contatos') and 'trigramas' not in detalhe for detalhe in plano)
+        assert [c.id for c in self.repository.buscar_por_nome('"nina" s')] == [ana.id]
+        
+        ana.nome = "Ana Lima"
+        self.repository.atualizar(ana)
+        assert self.repository.buscar_por_nome("souza") == []
+        assert [c.id for c in self.repository.buscar_por_nome("a")] == [ana.id]
+    
+    def test_pesquisar_texto(self):
+        """Testa busca textual pelo índice FTS5, mantido após atualizações"""
+        ana = self.repository.criar(Contato(nome="Ana Conceição", telefone="(11) 99999-9999"))
+        bia = self.repository.criar(Contato(nome="Bia", telefone="2", categoria_id=5))
+        
+        assert [c.id for c, _ in self.repository.pesquisar_texto(["conceicao"])] == [ana.id]
+        assert [c.id for c, _ in self.repository.pesquisar_texto(["11999999999"])] == [ana.id]
+        assert [c.id for c, _ in self.repository.pesquisar_texto(["x"], {5: 1.0})] == [bia.id]
+        
+        ana.nome = "Ana Lima"
+        self.repository.atualizar(ana)
+        assert self.repository.pesquisar_texto(["conceicao"]) == []
+    
+    def test_buscar_aproximado(self):
+        """Testa busca aproximada ordenada por semelhança"""
+        self.repository.criar(Contato(nome="Concepção", telefone="1"))
+        self.repository.criar(Contato(nome="Conceição", telefone="2"))
+        self.repository.criar(Contato(nome="Pedro", telefone="3"))
+        
+        resultados = self.repository.buscar_aproximado("conseicao")
+        
+        assert [c.nome for c in resultados] == ["Conceição", "Concepção"]
+        assert [c.nome for c in self.repository.buscar_aproximado("pdro")] == ["Pedro"]
+        assert 'contatos_trigramas' in self.repository._candidatos_aproximados("conseicao", 2)[0]
+        
+        # Os filtros restringem as consultas dos termos exatos e dos candidatos
+        self.repository.criar(Contato(nome="Pedro Alves", telefone="4", categoria_id=1))
+        assert [c.nome for c in self.repository.buscar_aproximado("pedro", 1, {'categoria_id': 1})] == ["Pedro Alves"]
+        assert [c.nome for c in self.repository.buscar_aproximado("conseicao", 1, {'telefone': '1'})] == ["Concepção"]
+    
+    def test_migra_banco_sem_chave_de_busca(self):
+        """Testa que bancos antigos recebem a coluna nome_busca preenchida"""
+        caminho = self.repository.db_path
+        conexao = self.repository._conexao.obter()
+        conexao.executescript("""
+            DROP INDEX idx_contatos_nome_busca;
+            DROP TABLE contatos_trigramas;
+            DROP TRIGGER contatos_trigramas_inserir;
+            DROP TRIGGER contatos_trigramas_excluir;
+            DROP TRIGGER contatos_trigramas_atualizar;
+            ALTER TABLE contatos DROP COLUMN nome_busca;
+            INSERT INTO contatos (nome, telefone) VALUES ('Conceição', '1');
+        """)
+        
+        with patch('repositories.sqlite_contato_repository.Logger.get_instance'):
+            repositorio = SqliteContatoRepository(self.temp_dir)
+        
+        assert repositorio.db_path == caminho
+        assert [c.nome for c in repositorio.buscar_por_nome("conceicao")] == ["Conceição"]
+    
+    def test_versao_muda_a_cada_escrita(self):
+        """Testa o contador de alterações mantido pelos gatilhos"""
+        inicial = self.repository.versao()
+        contato = self.repository.criar(Contato(nome="Ana", telefone="1"))
+        assert self.repository.versoes_escrita() == (inicial, inicial + 1)
+        self.repository.excluir(contato.id)
+        
+        assert self.repository.versao() == inicial + 2
+        assert self.repository.versoes_escrita() == (inicial + 1, inicial + 2)
+    
+    def test_listar_pagina(self):
+        """Testa paginação por cursor"""
+        for i in range(3):
+            self.repository.criar(Contato(nome=f"C{i}", telefone="1"))
+        
+        pagina, proximo = self.repository.listar_pagina(2)
+        assert [c.id for c in pagina] == [1, 2]
+        assert proximo == 2
+        assert self.repository.listar_pagina(2, proximo)[0][0].id == 3
+        assert self.repository.listar_pagina(2, proximo)[1] is None
+    
+    def test_filtrar_pagina(self):
+        """Testa paginação por cursor de um resultado filtrado"""
+        for i in range(5):
+            self.repository.criar(Contato(nome=f"Ana {i}" if i % 2 else f"Bia {i}", telefone="1"))
+        
+        pagina, proximo = self.repository.filtrar_pagina({'nome': 'ana'}, 1)
+        assert [c.id for c in pagina] == [2]
+        assert proximo == 2
+        assert self.repository.filtrar_pagina({'nome': 'ana'}, 1, proximo) == (self.repository.filtrar({'nome': 'ana'})[1:], None)
+    
+    def test_listar_visoes(self):
+        """Testa listagem por visões somente leitura"""
+        self.repository.criar(Contato(nome="Ana", telefone="1", categoria_id=2))
+        
+        visoes = self.repository.listar_visoes()
+        
+        assert [v.to_dict() for v in visoes] == [c.to_dict() for c in self.repository.listar_todos()]
+        assert visoes[0].categoria_id == 2
+    
+    def test_atualizar_e_excluir(self):
+        """Testa atualização e exclusão"""
+        contato = self.repository.criar(Contato(nome="Ana", telefone="123"))
+        contato.nome = "Ana Silva"
+        
+        assert self.repository.atualizar(contato) is True
+        assert self.repository.buscar_por_id(contato.id).nome == "Ana Silva"
+        assert self.repository.excluir(contato.id) is True
+        assert self.repository.excluir(contato.id) is False
+        assert self.repository.atualizar(contato) is False
+    
+    def test_operacoes_em_lote(self):
+        """Testa criação, atualização e exclusão em lote"""
+        criados = self.repository.criar_em_lote([
+            Contato(nome="A", telefone="1"),
+            Contato(nome="B", telefone="2")
+        ])
+        criados[0].nome = "A2"
+        
+        assert [c.id for c in criados] == [1, 2]
+        assert self.repository.atualizar_em_lote([criados[0], Contato(id=9, nome="X", telefone="9")]) == [True, False]
+        assert self.repository.excluir_em_lote([2, 9]) == [True, False]
+        assert [c.nome for c in self.repository.listar_todos()] == ["A2"]
+    
+    def test_importa_backend_json_uma_vez(self):
+        """Testa a importação dos dados JSON na criação do banco, incluindo o log pendente"""
+        temp_dir = tempfile.mkdtemp()
+        with patch('repositories.contato_repository.Logger.get_instance'), \
+                patch('repositories.categoria_repository.Logger.get_instance'):
+            categoria = CategoriaRepository(temp_dir).criar(Categoria(nome="Família"))
+            contatos = ContatoRepository(temp_dir, armazenamento='log')
+            ana = contatos.criar(Contato(nome="Ana", telefone="1", email="ana@x.com", categoria_id=categoria.id))
+            bia = contatos.criar(Contato(nome="Bia", telefone="2"))
+            contatos.excluir(ana.id)
+        
+        with patch('repositories.sqlite_contato_repository.Logger.get_instance'), \
+                patch('repositories.sqlite_categoria_repository.Logger.get_instance'):
+            repositorio = SqliteContatoRepository(temp_dir, armazenamento='log')
+            categorias = SqliteCategoriaRepository(temp_dir, armazenamento='log')
+        
+        assert [(c.id, c.nome) for c in repositorio.listar_todos()] == [(bia.id, "Bia")]
+        assert [c.nome for c in categorias.listar_todas()] == ["Família"]
+        assert repositorio.buscar_por_telefone("2")[0].id == bia.id
+        carla = repositorio.criar(Contato(nome="Carla", telefone="3"))
+        assert carla.id == bia.id + 1
+        
+        # Reinicializações seguintes não importam de novo, mesmo com o banco vazio
+        repositorio.excluir_em_lote([bia.id, carla.id])
+        categorias.excluir(categoria.id)
+        with patch('repositories.sqlite_contato_repository.Logger.get_instance'):
+            repositorio = SqliteContatoRepository(temp_dir, armazenamento='log')
+        assert repositorio.listar_todos() == []
+    
+    def test_conexao_por_thread(self):
+        """Testa que cada thread usa sua própria conexão"""
+        conexoes = []
+        thread = threading.Thread(target=lambda: conexoes.append(self.repository._conexao.obter()))
+        thread.start()
+        thread.join()
+        
+        assert conexoes[0] is not self.repository._conexao.obter()
+        assert self.repository._conexao.obter() is self.repository._conexao.obter()
+
+@pytest.mark.unit
+class TestSqliteCategoriaRepository:
+    """Testes unitários para SqliteCategoriaRepository"""
+    
+    def setup_method(self):
+        """Configuração para cada teste"""
+        self.temp_dir = tempfile.mkdtemp()
+        with patch('repositories.sqlite_categoria_repository.Logger.get_instance'):
+            self.repository = SqliteCategoriaRepository(self.temp_dir)
+    
+    def test_crud_categoria(self):
+        """Testa o ciclo completo de uma categoria"""
+        categoria = self.repository.criar(Categoria(nome="Trabalho", descricao="Profissionais"))
+        categoria.descricao = "Contatos profissionais"
+        
+        assert self.repository.atualizar(categoria) is True
+        assert [c.descricao for c in self.repository.listar_todas()] == ["Contatos profissionais"]
+        assert self.repository.excluir(categoria.id) is True
+        assert self.repository.buscar_por_id(categoria.id) is None
+    
+    def test_registro_por_id(self):
+        """Testa categorias indexadas por ID para resolver contatos"""
+        categoria = self.repository.criar(Categoria(nome="Família"))
+        
+        registro = self.repository.registro_por_id()
+        
+        assert Contato(categoria_id=categoria.id).categoria_em(registro).nome == "Família"
+        assert Contato().categoria_em(registro) is None
+    
+    def test_pontuar_texto(self):
+        """Testa relevância das categorias pelo índice FTS5"""
+        categoria = self.repository.criar(Categoria(nome="Família", descricao="Parentes"))
+        self.repository.criar(Categoria(nome="Trabalho"))
+        
+        assert list(self.repository.pontuar_texto(["familia"])) == [categoria.id]
+        assert self.repository.pontuar_texto([]) == {}
+
+@pytest.mark.unit
+class TestFabricaRepositorios:
+    """Testes unitários para a escolha de backend por configuração"""
+    
+    def test_backend_padrao_json(self, monkeypatch, temp_data_dir):
+        """Testa que o backend JSON é o padrão"""
+        monkeypatch.delenv('AGENDA_BACKEND', raising=False)
+        monkeypatch.setenv('AGENDA_DATA_PATH', temp_data_dir)
+        
+        assert isinstance(criar_contato_repository(), ContatoRepository)
+    
+    def test_backend_sqlite(self, monkeypatch, temp_data_dir):
+        """Testa a seleção do backend SQLite"""
+        monkeypatch.setenv('AGENDA_BACKEND', 'sqlite')
+        monkeypatch.setenv('AGENDA_DATA_PATH', temp_data_dir)
+        
+        assert isinstance(criar_contato_repository(), SqliteContatoRepository)
+        assert isinstance(criar_categoria_repository(), SqliteCategoriaRepository)
+    
+    def test_backend_mmap(self, monkeypatch, temp_data_dir):
+        """Testa a seleção do backend mmap, com categorias em JSON"""
+        monkeypatch.setenv('AGENDA_BACKEND', 'mmap')
+        monkeypatch.setenv('AGENDA_DATA_PATH', temp_data_dir)
+        monkeypatch.setenv('AGENDA_CACHE_CONTATOS', '10')
+        
+        repositorio = criar_contato_repository()
+        assert isinstance(repositorio, MmapContatoRepository)
+        assert repositorio.tamanho_cache == 10
+        assert isinstance(criar_categoria_repository(), CategoriaRepository)
+    
+    def test_formato_configurado(self, monkeypatch, temp_data_dir):
+        """Testa a escolha do formato dos arquivos do backend JSON"""
+        monkeypatch.setenv('AGENDA_DATA_PATH', temp_data_dir)
+        monkeypatch.setenv('AGENDA_FORMATO', 'ndjson')
+        monkeypatch.setenv('AGENDA_COMPRESSAO', 'lzma')
+        
+        assert criar_contato_repository().file_path == os.path.join(temp_data_dir, 'contatos.jsonl.xz')
+        assert criar_categoria_repository().file_path == os.path.join(temp_data_dir, 'categorias.jsonl.xz')
+    
+    def test_servicos_compartilham_repositorios(self, monkeypatch, temp_data_dir):
+        """Testa que os serviços usam uma única instância de cada repositório"""
+        monkeypatch.setenv('AGENDA_DATA_PATH', temp_data_dir)
+        
+        busca = BuscaService()
+        
+        assert busca.contato_repository is ContatoService().repository is obter_contato_repository()
+        assert busca.categoria_repository is CategoriaService().repository is obter_categoria_repository()
+        assert obter_contato_repository() is not criar_contato_repository()
+    
+    def test_backend_desconhecido(self, monkeypatch):
+        """Testa que um backend inválido é rejeitado"""
+        monkeypatch.setenv('AGENDA_BACKEND', 'mongodb')
+        
+        with pytest.raises(ValueError):
+            criar_contato_repository()